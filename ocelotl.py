@@ -5,6 +5,10 @@ Herramienta profesional para detectar credenciales, API keys y secretos expuesto
 
 Usage:
     python ocelotl.py <path> [options]
+    python ocelotl.py serve [--socket PATH | --port PORT] [options]
+    python ocelotl.py query <database> [filters]
+    python ocelotl.py merge -o merged.json <shard reports...>
+    python ocelotl.py batch <manifest> [-d DIR] [--workers N]
 
 Examples:
     python ocelotl.py /path/to/project
@@ -12,11 +16,21 @@ Examples:
     python ocelotl.py /path/to/project --exclude-dirs node_modules,vendor --min-confidence HIGH
 """
 
+import os
 import sys
 import argparse
 from pathlib import Path
 
-from ocelotl import OcelotlScanner, ReportGenerator
+from ocelotl import OcelotlScanner, ReportGenerator, SarifWriter
+from ocelotl.baseline import Baseline, BaselineError
+from ocelotl.checkpoint import Checkpoint, CheckpointError
+from ocelotl.compressed import MAX_DECOMPRESSION_RATIO
+from ocelotl.databases import DEFAULT_MAX_BYTES, DEFAULT_MAX_ROWS
+from ocelotl.known_secrets import KnownSecrets, KnownSecretsError
+from ocelotl.cache import FileResultCache
+from ocelotl.metrics import write_textfile
+from ocelotl.sharding import parse_shard
+from ocelotl.store import FindingsStore, CONFIDENCE_LEVELS
 from ocelotl.utils import Colors, show_banner, show_help
 
 
@@ -57,6 +71,30 @@ For detailed help: python ocelotl.py --help-full
         help='Generate HTML report (default: ocelotl_report.html)'
     )
     
+    parser.add_argument(
+        '--sarif',
+        metavar='FILE',
+        help='Write findings as SARIF 2.1.0 while scanning (for code scanning dashboards)'
+    )
+    
+    parser.add_argument(
+        '--db',
+        metavar='FILE',
+        help='Store findings in a SQLite database (query it with: ocelotl.py query FILE)'
+    )
+    
+    parser.add_argument(
+        '--metrics',
+        metavar='FILE',
+        help='Write scan performance metrics in OpenMetrics text format (node_exporter textfile collector)'
+    )
+    
+    parser.add_argument(
+        '--html-compress',
+        action='store_true',
+        help='Embed findings in the HTML report compressed (smaller file for large scans)'
+    )
+    
     # Opciones de escaneo
     parser.add_argument(
         '-v', '--verbose',
@@ -77,6 +115,143 @@ For detailed help: python ocelotl.py --help-full
         help='Minimum confidence level to report (default: LOW)'
     )
     
+    parser.add_argument(
+        '--entropy',
+        action='store_true',
+        help='Also report generic high-entropy strings (custom tokens without a known format)'
+    )
+    
+    parser.add_argument(
+        '--known-secrets',
+        metavar='PREFIX',
+        help='Escalate to CRITICAL secrets found in this known-leaked corpus (see: build-known-secrets)'
+    )
+    
+    parser.add_argument(
+        '--no-dedup',
+        action='store_true',
+        help='Scan every file even if its content is identical to another one'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Scan file contents with N threads, largest files first (huge files are split into chunks)'
+    )
+    
+    parser.add_argument(
+        '--no-decompress',
+        action='store_true',
+        help='Do not scan the contents of .gz, .bz2 and .xz files'
+    )
+    
+    parser.add_argument(
+        '--max-decompression-ratio',
+        type=int,
+        default=MAX_DECOMPRESSION_RATIO,
+        metavar='N',
+        help=f'Stop decompressing a file past N times its compressed size (default: {MAX_DECOMPRESSION_RATIO})'
+    )
+    
+    parser.add_argument(
+        '--no-sqlite',
+        action='store_true',
+        help='Do not scan the contents of SQLite databases (.db, .sqlite, .sqlite3)'
+    )
+    
+    parser.add_argument(
+        '--sqlite-max-rows',
+        type=int,
+        default=DEFAULT_MAX_ROWS,
+        metavar='N',
+        help=f'Rows read from each SQLite database (default: {DEFAULT_MAX_ROWS})'
+    )
+    
+    parser.add_argument(
+        '--sqlite-max-mb',
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        metavar='MB',
+        help=f'Text read from each SQLite database in MB (default: {DEFAULT_MAX_BYTES // (1024 * 1024)})'
+    )
+    
+    parser.add_argument(
+        '--fail-fast',
+        choices=['VERY_LOW', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'],
+        metavar='LEVEL',
+        help='Stop at the first finding at or above LEVEL (riskiest files are scanned first)'
+    )
+    
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        metavar='SECONDS',
+        help='Stop scanning after SECONDS and report partial results (riskiest files first)'
+    )
+    
+    parser.add_argument(
+        '--shard',
+        metavar='I/N',
+        help='Scan only the I-th of N deterministic, size-balanced slices of the tree'
+    )
+    
+    # Baseline
+    parser.add_argument(
+        '--baseline',
+        metavar='FILE',
+        help='Only report findings that are not in this baseline file'
+    )
+    
+    parser.add_argument(
+        '--update-baseline',
+        action='store_true',
+        help='Write every finding of this scan to the --baseline file'
+    )
+    
+    # Checkpoints
+    parser.add_argument(
+        '--checkpoint',
+        metavar='FILE',
+        help='Periodically save scan progress and findings to FILE (removed when the scan completes)'
+    )
+    
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=float,
+        default=Checkpoint.DEFAULT_INTERVAL,
+        metavar='SECONDS',
+        help=f'Seconds between checkpoint writes (default: {Checkpoint.DEFAULT_INTERVAL:g})'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue the scan saved in the --checkpoint file, skipping completed work'
+    )
+    
+    # Modo watch
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and rescan files as they are created or modified'
+    )
+    
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=0.5,
+        metavar='SECONDS',
+        help='Quiet period before rescanning changed files in watch mode (default: 0.5)'
+    )
+    
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='Use directory polling instead of inotify in watch mode'
+    )
+    
     # Opciones de exclusión
     parser.add_argument(
         '--exclude-dirs',
@@ -100,8 +275,310 @@ For detailed help: python ocelotl.py --help-full
     return parser.parse_args()
 
 
+def run_watch(scanner, args, colors):
+    """Modo watch: reescanea de forma incremental los archivos que cambian"""
+    from ocelotl.watcher import create_watcher, watch
+    
+    watcher = create_watcher(scanner.base_path, scanner.exclude_dirs, polling=args.poll)
+    backend = 'polling' if args.poll or type(watcher).__name__ == 'PollingWatcher' else 'inotify'
+    print(f"{colors.CYAN}Watching {scanner.base_path} ({backend}). Press Ctrl+C to stop.{colors.RESET}")
+    
+    def on_change(findings, changed):
+        print(f"{colors.BLUE}[~] {len(changed)} file(s) changed, {len(findings)} finding(s){colors.RESET}")
+        if args.output:
+            ReportGenerator(scanner.results, colors).generate_json_report(args.output)
+    
+    try:
+        watch(scanner, watcher, debounce=args.debounce, on_change=on_change)
+    except KeyboardInterrupt:
+        print(f"\n{colors.YELLOW}Watch stopped{colors.RESET}")
+    finally:
+        watcher.close()
+    
+    return 0
+
+
+def run_serve(argv):
+    """Subcomando serve: daemon de escaneo con estado caliente"""
+    parser = argparse.ArgumentParser(
+        prog='ocelotl.py serve',
+        description='Run a long-lived scan daemon on localhost HTTP or a Unix socket'
+    )
+    parser.add_argument('--socket', metavar='PATH', help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--host', default='127.0.0.1', help='Listen host (localhost only, default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Listen port (default: 8765)')
+    parser.add_argument('--workers', type=int, default=2, help='Concurrent scan workers (default: 2)')
+    parser.add_argument('--queue-size', type=int, default=64, help='Maximum queued requests (default: 64)')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Default per-request timeout in seconds')
+    parser.add_argument(
+        '--min-confidence',
+        choices=['VERY_LOW', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'],
+        default='LOW',
+        help='Default minimum confidence level (default: LOW)'
+    )
+    parser.add_argument('--exclude-dirs', metavar='DIRS', help='Comma-separated directories to exclude')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Log every request')
+    parser.add_argument('--no-color', action='store_true', help='Disable colored output')
+    args = parser.parse_args(argv)
+    
+    from ocelotl.server import ScanService, create_server
+    
+    colors = Colors(use_colors=not args.no_color)
+    exclude_dirs = None
+    if args.exclude_dirs:
+        exclude_dirs = set(d.strip() for d in args.exclude_dirs.split(','))
+    
+    service = ScanService(
+        workers=args.workers,
+        queue_size=args.queue_size,
+        default_timeout=args.timeout,
+        min_confidence=args.min_confidence,
+        exclude_dirs=exclude_dirs
+    )
+    
+    try:
+        server = create_server(service, args.host, args.port, args.socket, args.verbose)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"{colors.RED}Error: {e}{colors.RESET}")
+        return 1
+    
+    service.start()
+    address = args.socket or f"http://{args.host}:{args.port}"
+    print(f"{colors.GREEN}✓ Ocelotl daemon listening on {address}{colors.RESET}")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{colors.YELLOW}Shutting down daemon{colors.RESET}")
+    finally:
+        server.server_close()
+        service.stop()
+        if args.socket:
+            Path(args.socket).unlink(missing_ok=True)
+    
+    return 0
+
+
+def run_query(argv):
+    """Subcomando query: consulta hallazgos guardados con --db"""
+    parser = argparse.ArgumentParser(
+        prog='ocelotl.py query',
+        description='Query findings stored in an Ocelotl SQLite database'
+    )
+    parser.add_argument('database', help='SQLite database written with --db')
+    parser.add_argument('--scans', action='store_true', help='List recent scans instead of findings')
+    parser.add_argument('--scan', type=int, metavar='ID', help='Only findings of this scan')
+    parser.add_argument('--latest', action='store_true', help='Only findings of the most recent scan')
+    parser.add_argument('--rule', help='Only findings of this rule (e.g. api_keys)')
+    parser.add_argument('--min-confidence', choices=CONFIDENCE_LEVELS[::-1], help='Minimum confidence level')
+    parser.add_argument('--path', help='Path substring or glob (e.g. "src/*.py")')
+    parser.add_argument('--fingerprint', help='Exact finding fingerprint')
+    parser.add_argument('--secret', help='Secret value to locate in any file (matched by hash)')
+    parser.add_argument('--since', metavar='DATE', help='Only scans started on or after DATE (ISO 8601)')
+    parser.add_argument('--new', action='store_true', help='Only findings not seen in any earlier scan')
+    parser.add_argument('--limit', type=int, default=100, help='Maximum rows (default: 100, 0 = no limit)')
+    parser.add_argument('--json', action='store_true', help='Print JSON lines')
+    parser.add_argument('--no-color', action='store_true', help='Disable colored output')
+    args = parser.parse_args(argv)
+    
+    import json
+    
+    colors = Colors(use_colors=not args.no_color)
+    if not Path(args.database).exists():
+        print(f"{colors.RED}Error: Database '{args.database}' does not exist{colors.RESET}")
+        return 1
+    
+    with FindingsStore(args.database) as store:
+        if args.scans:
+            for scan in store.list_scans(args.limit or 20):
+                if args.json:
+                    print(json.dumps(scan, ensure_ascii=False))
+                else:
+                    print(
+                        f"#{scan['id']}  {scan['started_at']}  {scan['base_path']}  "
+                        f"files={scan['files_scanned']} findings={scan['findings']}"
+                    )
+            return 0
+        
+        scan_id = args.scan
+        if args.latest:
+            scans = store.list_scans(1)
+            if not scans:
+                return 0
+            scan_id = scans[0]['id']
+        
+        rows = store.query(
+            scan_id=scan_id,
+            rule=args.rule,
+            min_confidence=args.min_confidence,
+            path=args.path,
+            fingerprint=args.fingerprint,
+            secret=args.secret,
+            since=args.since,
+            new_only=args.new,
+            limit=args.limit or None
+        )
+        for row in rows:
+            if args.json:
+                print(json.dumps(row, ensure_ascii=False))
+            else:
+                location = f"{row['path']}:{row['line']}" if row['line'] else row['path']
+                print(
+                    f"#{row['scan_id']}  {colors.YELLOW}{row['confidence'] or '-':<8}{colors.RESET} "
+                    f"{row['rule']:<18} {location}  {row['fingerprint'][:16]}"
+                )
+    
+    return 0
+
+
+def run_merge(argv):
+    """Subcomando merge: fusiona los reportes JSON de varios shards"""
+    parser = argparse.ArgumentParser(
+        prog='ocelotl.py merge',
+        description='Merge JSON reports produced by --shard runs into one report'
+    )
+    parser.add_argument('reports', nargs='+', help='Shard JSON reports')
+    parser.add_argument('-o', '--output', metavar='FILE', required=True, help='Merged JSON report')
+    parser.add_argument('--no-color', action='store_true', help='Disable colored output')
+    args = parser.parse_args(argv)
+    
+    from ocelotl.sharding import merge_reports, missing_shards
+    
+    colors = Colors(use_colors=not args.no_color)
+    try:
+        merged = merge_reports(args.reports, args.output)
+    except (OSError, ValueError) as e:
+        print(f"{colors.RED}Error: {e}{colors.RESET}")
+        return 1
+    
+    summary = merged['summary']
+    for problem in missing_shards(summary.get('shards', [])):
+        print(f"{colors.YELLOW}Warning: {problem}{colors.RESET}")
+    
+    print(
+        f"{colors.GREEN}✓ Merged {len(args.reports)} reports into {args.output}: "
+        f"{summary.get('files_scanned', 0)} files, "
+        f"{merged['statistics']['total_findings']} findings{colors.RESET}"
+    )
+    return 0
+
+
+def run_batch_command(argv):
+    """Subcomando batch: escanea los repositorios de un manifiesto"""
+    parser = argparse.ArgumentParser(
+        prog='ocelotl.py batch',
+        description='Scan every repository listed in a manifest with one shared worker pool'
+    )
+    parser.add_argument('manifest', help='File with one repository path per line (# for comments)')
+    parser.add_argument('-d', '--output-dir', metavar='DIR', default='ocelotl_reports',
+                        help='Directory for per-repository reports and summary.json (default: ocelotl_reports)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4,
+                        help='Shared worker threads (default: CPU count)')
+    parser.add_argument(
+        '--min-confidence',
+        choices=['VERY_LOW', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'],
+        default='LOW',
+        help='Minimum confidence level to report (default: LOW)'
+    )
+    parser.add_argument('--exclude-dirs', metavar='DIRS', help='Comma-separated directories to exclude')
+    parser.add_argument('--exclude-ext', metavar='EXTS', help='Comma-separated extensions to exclude')
+    parser.add_argument('--no-dedup', action='store_true', help='Scan identical files separately')
+    parser.add_argument('--no-color', action='store_true', help='Disable colored output')
+    args = parser.parse_args(argv)
+    
+    from ocelotl.batch import run_batch
+    
+    colors = Colors(use_colors=not args.no_color)
+    exclude_dirs = None
+    if args.exclude_dirs:
+        exclude_dirs = set(d.strip() for d in args.exclude_dirs.split(','))
+    exclude_extensions = None
+    if args.exclude_ext:
+        exclude_extensions = set(e.strip() for e in args.exclude_ext.split(','))
+    
+    try:
+        summary = run_batch(
+            args.manifest,
+            args.output_dir,
+            workers=args.workers,
+            min_confidence=args.min_confidence,
+            exclude_dirs=exclude_dirs,
+            exclude_extensions=exclude_extensions,
+            deduplicate=not args.no_dedup,
+            colors=colors
+        )
+    except OSError as e:
+        print(f"{colors.RED}Error: {e}{colors.RESET}")
+        return 1
+    except KeyboardInterrupt:
+        print(f"\n{colors.YELLOW}Batch interrupted by user{colors.RESET}")
+        return 130
+    
+    for repo in summary['repositories']:
+        if 'error' in repo:
+            print(f"{colors.RED}✖ {repo['root']}: {repo['error']}{colors.RESET}")
+    
+    statistics = summary['statistics']
+    totals = summary['totals']
+    print(
+        f"{colors.GREEN}✓ Scanned {sum(1 for repo in summary['repositories'] if 'error' not in repo)} repositories, "
+        f"{totals.get('files_scanned', 0)} files, {statistics['total_findings']} findings "
+        f"(reports in {args.output_dir}){colors.RESET}"
+    )
+    high = statistics['by_confidence']['CRITICAL'] + statistics['by_confidence']['HIGH']
+    return 2 if high else 0
+
+
+def run_build_known_secrets(argv):
+    """Subcomando build-known-secrets: compila el corpus de secretos filtrados"""
+    from ocelotl.known_secrets import ALGORITHMS, DEFAULT_FP_RATE, build_known_secrets
+    
+    parser = argparse.ArgumentParser(
+        prog='ocelotl.py build-known-secrets',
+        description='Compile a plain list of leaked-secret hashes into a Bloom filter and a sorted hash file'
+    )
+    parser.add_argument('hash_list', help='File with one hex hash per line (HASH or HASH:count)')
+    parser.add_argument('-o', '--output', metavar='PREFIX', required=True,
+                        help='Output prefix (writes PREFIX.bloom and PREFIX.hashes)')
+    parser.add_argument('--algorithm', choices=sorted(ALGORITHMS), default='sha1',
+                        help='Hash algorithm of the list (default: sha1)')
+    parser.add_argument('--fp-rate', type=float, default=DEFAULT_FP_RATE,
+                        help=f'Target false positive rate of the filter (default: {DEFAULT_FP_RATE:g})')
+    parser.add_argument('--no-color', action='store_true', help='Disable colored output')
+    args = parser.parse_args(argv)
+    
+    colors = Colors(use_colors=not args.no_color)
+    try:
+        built = build_known_secrets(args.hash_list, args.output, args.algorithm, args.fp_rate)
+    except (OSError, KnownSecretsError) as e:
+        print(f"{colors.RED}Error: {e}{colors.RESET}")
+        return 1
+    
+    if built['skipped']:
+        print(f"{colors.YELLOW}Warning: {built['skipped']} invalid lines skipped{colors.RESET}")
+    print(
+        f"{colors.GREEN}✓ {built['entries']} known secrets compiled into {built['bloom_file']} "
+        f"({built['bits'] // 8} bytes, {built['hash_functions']} hash functions) "
+        f"and {built['hashes_file']}{colors.RESET}"
+    )
+    return 0
+
+
+# Subcomandos disponibles: python ocelotl.py <subcomando> [opciones]
+SUBCOMMANDS = {
+    'serve': run_serve,
+    'query': run_query,
+    'merge': run_merge,
+    'batch': run_batch_command,
+    'build-known-secrets': run_build_known_secrets,
+}
+
+
 def main():
     """Función principal"""
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        return SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+    
     args = parse_arguments()
     
     # Inicializar colores
@@ -135,6 +612,56 @@ def main():
     if args.exclude_ext:
         exclude_extensions = set(e.strip() for e in args.exclude_ext.split(','))
     
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            print(f"{colors.RED}Error: {e}{colors.RESET}")
+            return 1
+    
+    # Cargar baseline (al actualizarlo se reportan todos los hallazgos)
+    baseline = None
+    if args.update_baseline and not args.baseline:
+        print(f"{colors.RED}Error: --update-baseline requires --baseline FILE{colors.RESET}")
+        return 1
+    if args.baseline and not args.update_baseline:
+        if not Path(args.baseline).exists():
+            print(f"{colors.RED}Error: Baseline '{args.baseline}' does not exist{colors.RESET}")
+            print(f"Create it with: python ocelotl.py {args.path} --baseline {args.baseline} --update-baseline")
+            return 1
+        try:
+            baseline = Baseline.load(args.baseline, args.path)
+        except BaselineError as e:
+            print(f"{colors.RED}Error: {e}{colors.RESET}")
+            return 1
+    
+    # Corpus de secretos filtrados conocidos (mapeado en memoria)
+    known_secrets = None
+    if args.known_secrets:
+        try:
+            known_secrets = KnownSecrets(args.known_secrets)
+        except KnownSecretsError as e:
+            print(f"{colors.RED}Error: {e}{colors.RESET}")
+            return 1
+    
+    # Checkpoint: reanudar si se pide y existe, si no empezar de cero
+    checkpoint = None
+    if args.resume and not args.checkpoint:
+        print(f"{colors.RED}Error: --resume requires --checkpoint FILE{colors.RESET}")
+        return 1
+    if args.checkpoint:
+        if args.resume and Path(args.checkpoint).exists():
+            try:
+                checkpoint = Checkpoint.load(args.checkpoint, args.path, args.checkpoint_interval, shard)
+            except CheckpointError as e:
+                print(f"{colors.RED}Error: {e}{colors.RESET}")
+                return 1
+        else:
+            if args.resume:
+                print(f"{colors.YELLOW}Checkpoint '{args.checkpoint}' not found, starting a new scan{colors.RESET}")
+            checkpoint = Checkpoint(args.checkpoint, args.path, args.checkpoint_interval, shard)
+    
     try:
         # Crear scanner
         scanner = OcelotlScanner(
@@ -143,11 +670,68 @@ def main():
             use_colors=not args.no_color,
             exclude_dirs=exclude_dirs,
             exclude_extensions=exclude_extensions,
-            min_confidence=args.min_confidence
+            min_confidence=args.min_confidence,
+            deduplicate=not args.no_dedup,
+            file_cache=FileResultCache() if args.watch else None,
+            baseline=baseline,
+            shard=shard,
+            checkpoint=checkpoint,
+            prioritize=bool(args.fail_fast or args.time_budget),
+            fail_fast=args.fail_fast,
+            time_budget=args.time_budget,
+            entropy=args.entropy,
+            known_secrets=known_secrets,
+            workers=args.workers,
+            decompress=not args.no_decompress,
+            max_decompression_ratio=args.max_decompression_ratio,
+            scan_databases=not args.no_sqlite,
+            max_database_rows=args.sqlite_max_rows,
+            max_database_bytes=args.sqlite_max_mb * 1024 * 1024
         )
         
-        # Ejecutar escaneo
-        results = scanner.scan()
+        # Ejecutar escaneo (el SARIF se escribe a medida que llegan hallazgos)
+        sarif_writer = None
+        if args.sarif:
+            sarif_writer = SarifWriter(args.sarif, scanner.pattern_manager.get_rule_metadata(), args.path)
+            sarif_writer.open()
+            scanner.add_listener(sarif_writer.add_result)
+        
+        # Los hallazgos se insertan por lotes en una transacción por escaneo
+        store = None
+        if args.db:
+            store = FindingsStore(args.db)
+            store.begin_scan(
+                args.path,
+                scanner.pattern_manager.get_rule_metadata(),
+                scanner.results['stats']['start_time']
+            )
+            scanner.add_listener(store.add_finding)
+        
+        try:
+            results = scanner.scan()
+        except BaseException:
+            if store is not None:
+                store.abort_scan()
+                store.close()
+            raise
+        finally:
+            if sarif_writer is not None:
+                sarif_writer.set_stats(scanner.results['stats'])
+                sarif_writer.close()
+        
+        if sarif_writer is not None:
+            print(f"{colors.GREEN}✓ SARIF report saved to: {args.sarif}{colors.RESET}")
+        
+        if store is not None:
+            store.finish_scan(results['stats'])
+            store.close()
+            print(f"{colors.GREEN}✓ Findings stored in: {args.db}{colors.RESET}")
+        
+        # Guardar baseline con los hallazgos actuales
+        if args.update_baseline:
+            new_baseline = Baseline.from_results(results, args.path)
+            new_baseline.save(args.baseline)
+            print(f"{colors.GREEN}✓ Baseline with {len(new_baseline)} findings saved to: {args.baseline}{colors.RESET}")
         
         # Generar reportes
         reporter = ReportGenerator(results, colors)
@@ -157,7 +741,9 @@ def main():
         
         # Guardar reporte JSON
         if args.output:
-            if reporter.generate_json_report(args.output):
+            with scanner.metrics.time('report'):
+                saved = reporter.generate_json_report(args.output)
+            if saved:
                 print(f"{colors.GREEN}✓ JSON report saved to: {args.output}{colors.RESET}")
             else:
                 print(f"{colors.RED}✖ Failed to save JSON report{colors.RESET}")
@@ -165,11 +751,33 @@ def main():
         # Generar reporte HTML
         if args.html:
             html_file = 'ocelotl_report.html'
-            if reporter.generate_html_report(html_file):
+            with scanner.metrics.time('report'):
+                saved = reporter.generate_html_report(html_file, compress=args.html_compress)
+            if saved:
                 print(f"{colors.GREEN}✓ HTML report saved to: {html_file}{colors.RESET}")
             else:
                 print(f"{colors.RED}✖ Failed to save HTML report{colors.RESET}")
         
+        # Exportar métricas (incluyen el tiempo de generación de reportes)
+        if args.metrics:
+            try:
+                write_textfile(args.metrics, scanner.metrics.to_dict(results['stats']), results['stats'])
+                print(f"{colors.GREEN}✓ Metrics saved to: {args.metrics}{colors.RESET}")
+            except OSError as e:
+                print(f"{colors.RED}✖ Failed to save metrics: {e}{colors.RESET}")
+        
+        # Modo watch: continuar con reescaneos incrementales
+        if args.watch:
+            return run_watch(scanner, args, colors)
+        
+        # Escaneo detenido antes de terminar
+        stopped_early = results['stats'].get('stopped_early')
+        if stopped_early == 'fail_fast':
+            print(f"\n{colors.RED}{colors.BOLD}✖ Fail-fast: found a finding at or above {args.fail_fast}, scan stopped{colors.RESET}\n")
+            return 2
+        if stopped_early == 'time_budget':
+            print(f"\n{colors.YELLOW}⚠ Time budget of {args.time_budget:g}s exhausted: results are partial{colors.RESET}")
+        
         # Mensaje final
         critical_count = sum(
             1 for item in (results['admin_credentials'] + results['passwords'] + results['api_keys'])
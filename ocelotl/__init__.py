@@ -10,17 +10,20 @@ __version__ = '3.0.0'
 __author__ = 'EduSec'
 
 from .scanner import OcelotlScanner
+from .findings import Finding
 from .patterns import PatternManager
 from .validators import SecretValidator, CredentialStrengthAnalyzer
-from .reporters import ReportGenerator
+from .reporters import ReportGenerator, SarifWriter
 from .utils import Colors, Logger, Spinner, FileHelper
 
 __all__ = [
     'OcelotlScanner',
+    'Finding',
     'PatternManager',
     'SecretValidator',
     'CredentialStrengthAnalyzer',
     'ReportGenerator',
+    'SarifWriter',
     'Colors',
     'Logger',
     'Spinner',
@@ -0,0 +1,155 @@
+"""
+Ocelotl v3.0 - Baseline
+Conjunto de hallazgos ya triados que no se vuelven a reportar
+"""
+
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Set
+
+from .fingerprints import finding_digest
+
+
+class BaselineError(Exception):
+    """Archivo de baseline inválido o ilegible"""
+
+
+class Baseline:
+    """
+    Baseline de fingerprints con sal.
+    
+    Formato del archivo (binario, little-endian):
+        magic 'OCBL' | versión (1 byte) | sal (16 bytes) | número de entradas (uint32)
+        | digests de 16 bytes ordenados
+    
+    En memoria los digests se guardan en un frozenset para comprobar cada
+    hallazgo en O(1). El archivo no contiene rutas ni secretos en claro.
+    """
+    
+    MAGIC = b'OCBL'
+    VERSION = 1
+    SALT_SIZE = 16
+    DIGEST_SIZE = 16
+    _HEADER = struct.Struct('<4sB16sI')
+    
+    def __init__(self, digests: Iterable[bytes] = (), salt: Optional[bytes] = None, base_path: str = '.'):
+        """
+        Inicializa el baseline
+        
+        Args:
+            digests: Digests de los hallazgos aceptados
+            salt: Sal de los digests (aleatoria si no se indica)
+            base_path: Ruta base del escaneo (las rutas se relativizan a ella)
+        """
+        self.salt = salt if salt is not None else os.urandom(self.SALT_SIZE)
+        self.base_path = Path(base_path)
+        self.entries = frozenset(digests)
+        self._seen: Set[bytes] = set()
+    
+    @classmethod
+    def load(cls, baseline_file: str, base_path: str = '.') -> 'Baseline':
+        """
+        Carga un baseline desde disco
+        
+        Args:
+            baseline_file: Ruta del archivo
+            base_path: Ruta base del escaneo
+        
+        Returns:
+            Baseline cargado
+        
+        Raises:
+            BaselineError: Si el archivo no tiene el formato esperado
+        """
+        try:
+            data = Path(baseline_file).read_bytes()
+        except OSError as e:
+            raise BaselineError(f"Cannot read baseline '{baseline_file}': {e}")
+        
+        if len(data) < cls._HEADER.size:
+            raise BaselineError(f"Invalid baseline file '{baseline_file}'")
+        magic, version, salt, count = cls._HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise BaselineError(f"Invalid baseline file '{baseline_file}'")
+        
+        body = data[cls._HEADER.size:]
+        if len(body) != count * cls.DIGEST_SIZE:
+            raise BaselineError(f"Truncated baseline file '{baseline_file}'")
+        
+        size = cls.DIGEST_SIZE
+        digests = (body[offset:offset + size] for offset in range(0, len(body), size))
+        return cls(digests, salt, base_path)
+    
+    @classmethod
+    def from_results(cls, results: Dict[str, Any], base_path: str = '.') -> 'Baseline':
+        """
+        Crea un baseline con todos los hallazgos de un escaneo
+        
+        Args:
+            results: Resultados de OcelotlScanner.scan()
+            base_path: Ruta base del escaneo
+        
+        Returns:
+            Baseline nuevo con sal aleatoria
+        """
+        from .scanner import FINDING_CATEGORIES
+        
+        baseline = cls(base_path=base_path)
+        baseline.entries = frozenset(
+            baseline.digest(finding)
+            for category in FINDING_CATEGORIES
+            for finding in results.get(category, [])
+        )
+        return baseline
+    
+    def save(self, baseline_file: str):
+        """
+        Guarda el baseline de forma atómica
+        
+        Args:
+            baseline_file: Ruta del archivo
+        """
+        target = Path(baseline_file)
+        header = self._HEADER.pack(self.MAGIC, self.VERSION, self.salt, len(self.entries))
+        fd, tmp_name = tempfile.mkstemp(dir=str(target.parent), prefix='.ocelotl-baseline-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(b''.join(sorted(self.entries)))
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    
+    def digest(self, finding: Dict[str, Any]) -> bytes:
+        """Digest con sal de un hallazgo"""
+        return finding_digest(finding, self.base_path, self.salt, self.DIGEST_SIZE)
+    
+    def __contains__(self, finding: Dict[str, Any]) -> bool:
+        """Comprueba si un hallazgo está en el baseline sin marcarlo como visto"""
+        return self.digest(finding) in self.entries
+    
+    def contains(self, finding: Dict[str, Any]) -> bool:
+        """
+        Comprueba si un hallazgo ya está en el baseline y lo marca como visto
+        
+        Args:
+            finding: Hallazgo a comprobar
+        
+        Returns:
+            bool: True si debe suprimirse
+        """
+        key = self.digest(finding)
+        if key in self.entries:
+            self._seen.add(key)
+            return True
+        return False
+    
+    def fixed_count(self) -> int:
+        """Entradas del baseline que no aparecieron en el escaneo (ya corregidas)"""
+        return len(self.entries) - len(self._seen)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,311 @@
+"""
+Ocelotl v3.0 - Modo Batch
+Escaneo de muchos repositorios con un único pool de hilos y un único
+conjunto de patrones compilados
+"""
+
+import hashlib
+import json
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+from .patterns import PatternManager
+from .reporters import ReportGenerator, empty_statistics, merge_statistics, report_statistics
+from .scanner import OcelotlScanner
+from .utils import Colors, FileHelper
+from .validators import SecretValidator
+
+
+def read_manifest(manifest_file: str) -> List[str]:
+    """
+    Lee un manifiesto de repositorios: una ruta por línea; las líneas vacías
+    y las que empiezan por '#' se ignoran
+    
+    Args:
+        manifest_file: Ruta del manifiesto
+    
+    Returns:
+        Lista de rutas raíz, sin duplicados y en orden
+    """
+    roots: List[str] = []
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            root = line.strip()
+            if root and not root.startswith('#') and root not in roots:
+                roots.append(root)
+    return roots
+
+
+def report_name(root: str) -> str:
+    """
+    Nombre de archivo del reporte de un repositorio: nombre legible más un
+    hash corto de la ruta para que dos repos con el mismo nombre no choquen
+    
+    Args:
+        root: Ruta raíz del repositorio
+    
+    Returns:
+        str: Nombre del reporte (sin directorio)
+    """
+    resolved = str(Path(root).resolve())
+    label = re.sub(r'[^A-Za-z0-9._-]+', '_', Path(resolved).name or 'root')
+    digest = hashlib.blake2b(resolved.encode('utf-8', errors='surrogateescape'), digest_size=4).hexdigest()
+    return f"{label}-{digest}.json"
+
+
+class _RepoState:
+    """Progreso de un repositorio dentro del batch"""
+    
+    def __init__(self, root: str, scanner: OcelotlScanner):
+        self.root = root
+        self.scanner = scanner
+        self.pending = 0
+        self.walk_done = False
+        self.finished = False
+
+
+class BatchScanner:
+    """
+    Escanea una lista de repositorios compartiendo pool, patrones y cachés.
+    
+    La planificación es global: un hilo recorre a la vez una ventana de
+    repositorios y reparte sus archivos en round-robin a una cola acotada que
+    consumen todos los workers, de modo que el pool sigue lleno mientras
+    termina la cola de un repositorio grande. Cada repositorio se cierra (y se
+    entrega su resultado) en cuanto se procesa su último archivo.
+    """
+    
+    def __init__(
+        self,
+        roots: List[str],
+        workers: int = 4,
+        min_confidence: str = 'LOW',
+        exclude_dirs: Optional[set] = None,
+        exclude_extensions: Optional[set] = None,
+        deduplicate: bool = True,
+        window: Optional[int] = None
+    ):
+        """
+        Inicializa el batch
+        
+        Args:
+            roots: Rutas raíz de los repositorios
+            workers: Hilos del pool compartido
+            min_confidence: Nivel mínimo de confianza para reportar
+            exclude_dirs: Directorios a excluir
+            exclude_extensions: Extensiones a excluir
+            deduplicate: Deduplicar archivos idénticos dentro de cada repositorio
+            window: Repositorios recorridos a la vez (por defecto 2 por worker)
+        """
+        self.roots = roots
+        self.workers = max(1, workers)
+        self.min_confidence = min_confidence
+        self.exclude_dirs = exclude_dirs
+        self.exclude_extensions = exclude_extensions
+        self.deduplicate = deduplicate
+        self.window = window or self.workers * 2
+        
+        self.pattern_manager = PatternManager()
+        self.validator = SecretValidator()
+        self._lock = threading.Lock()
+    
+    def _new_scanner(self, root: str) -> OcelotlScanner:
+        """Scanner silencioso que reutiliza los patrones y el validador compartidos"""
+        return OcelotlScanner(
+            base_path=root,
+            use_colors=False,
+            exclude_dirs=self.exclude_dirs,
+            exclude_extensions=self.exclude_extensions,
+            min_confidence=self.min_confidence,
+            deduplicate=self.deduplicate,
+            silent=True,
+            pattern_manager=self.pattern_manager,
+            validator=self.validator
+        )
+    
+    def _iter_tasks(
+        self,
+        roots: List[str],
+        on_walk_done: Callable[[_RepoState], None]
+    ) -> Iterator[Tuple[_RepoState, Path]]:
+        """
+        Genera (repositorio, archivo) intercalando los repositorios de la ventana
+        
+        Args:
+            roots: Rutas raíz a recorrer
+            on_walk_done: Llamado cuando se terminó de recorrer un repositorio
+        """
+        upcoming = iter(roots)
+        active: List[Tuple[_RepoState, Iterator[Path]]] = []
+        
+        while True:
+            while len(active) < self.window:
+                root = next(upcoming, None)
+                if root is None:
+                    break
+                scanner = self._new_scanner(root)
+                active.append((_RepoState(root, scanner), scanner._walk_files()))
+            if not active:
+                return
+            
+            for entry in list(active):
+                state, files = entry
+                file_path = next(files, None)
+                while file_path is not None and FileHelper.should_skip_path(file_path, state.scanner.exclude_dirs):
+                    file_path = next(files, None)
+                if file_path is None:
+                    active.remove(entry)
+                    on_walk_done(state)
+                    continue
+                with self._lock:
+                    state.pending += 1
+                yield state, file_path
+    
+    def run(self, on_repo_done: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Ejecuta el batch
+        
+        Args:
+            on_repo_done: Callback con (raíz, resultados) al terminar cada repositorio,
+                desde el hilo que procesó su último archivo
+        
+        Returns:
+            Dict con el resumen agregado ('repositories', 'totals', 'statistics')
+        """
+        summary: Dict[str, Any] = {'repositories': [], 'totals': {}, 'statistics': empty_statistics()}
+        tasks: 'queue.Queue[Optional[Tuple[_RepoState, Path]]]' = queue.Queue(maxsize=self.workers * 64)
+        
+        def finish(state: _RepoState):
+            with self._lock:
+                if state.finished or not state.walk_done or state.pending:
+                    return
+                state.finished = True
+            
+            results = state.scanner.finalize()
+            with self._lock:
+                self._add_to_summary(summary, state.root, results)
+            if on_repo_done is not None:
+                on_repo_done(state.root, results)
+            state.scanner = None
+        
+        def walk_done(state: _RepoState):
+            state.walk_done = True
+            finish(state)
+        
+        def worker():
+            while True:
+                task = tasks.get()
+                if task is None:
+                    return
+                state, file_path = task
+                try:
+                    state.scanner.scan_path(file_path)
+                finally:
+                    with self._lock:
+                        state.pending -= 1
+                    finish(state)
+        
+        missing = [root for root in self.roots if not Path(root).exists()]
+        for root in missing:
+            summary['repositories'].append({'root': root, 'error': 'Path does not exist'})
+        
+        existing = [root for root in self.roots if root not in missing]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='ocelotl-batch') as pool:
+            futures = [pool.submit(worker) for _ in range(self.workers)]
+            try:
+                for task in self._iter_tasks(existing, walk_done):
+                    tasks.put(task)
+            finally:
+                for _ in futures:
+                    tasks.put(None)
+            for future in futures:
+                future.result()
+        
+        summary['validation_cache'] = self.validator.get_cache_stats()
+        return summary
+    
+    @staticmethod
+    def _add_to_summary(summary: Dict[str, Any], root: str, results: Dict[str, Any]):
+        """Agrega los resultados de un repositorio al resumen del batch"""
+        stats = results['stats']
+        repo_statistics = report_statistics(results)
+        merge_statistics(summary['statistics'], repo_statistics)
+        
+        summary['repositories'].append({
+            'root': root,
+            'files_scanned': stats.get('files_scanned', 0),
+            'matches_found': stats.get('matches_found', 0),
+            'errors': stats.get('errors', 0),
+            'total_findings': repo_statistics['total_findings'],
+            'by_confidence': repo_statistics['by_confidence']
+        })
+        
+        totals = summary['totals']
+        for key, value in stats.items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                totals[key] = totals.get(key, 0) + value
+
+
+def run_batch(
+    manifest_file: str,
+    output_dir: str,
+    workers: int = 4,
+    min_confidence: str = 'LOW',
+    exclude_dirs: Optional[set] = None,
+    exclude_extensions: Optional[set] = None,
+    deduplicate: bool = True,
+    colors: Optional[Colors] = None
+) -> Dict[str, Any]:
+    """
+    Escanea los repositorios de un manifiesto y escribe un reporte JSON por
+    repositorio más 'summary.json' con el agregado
+    
+    Args:
+        manifest_file: Manifiesto con una ruta raíz por línea
+        output_dir: Directorio de los reportes
+        workers: Hilos del pool compartido
+        min_confidence: Nivel mínimo de confianza para reportar
+        exclude_dirs: Directorios a excluir
+        exclude_extensions: Extensiones a excluir
+        deduplicate: Deduplicar archivos idénticos dentro de cada repositorio
+        colors: Colores para los reportes
+    
+    Returns:
+        Dict con el resumen agregado
+    """
+    colors = colors or Colors(False)
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    
+    batch = BatchScanner(
+        read_manifest(manifest_file),
+        workers=workers,
+        min_confidence=min_confidence,
+        exclude_dirs=exclude_dirs,
+        exclude_extensions=exclude_extensions,
+        deduplicate=deduplicate
+    )
+    reports: Dict[str, str] = {}
+    
+    def write_report(root: str, results: Dict[str, Any]):
+        report_file = out / report_name(root)
+        ReportGenerator(results, colors).generate_json_report(str(report_file))
+        reports[root] = report_file.name
+    
+    summary = batch.run(on_repo_done=write_report)
+    for repo in summary['repositories']:
+        if repo['root'] in reports:
+            repo['report'] = reports[repo['root']]
+    
+    # Orden del manifiesto (los repositorios terminan en orden arbitrario)
+    order = {root: index for index, root in enumerate(batch.roots)}
+    summary['repositories'].sort(key=lambda repo: order.get(repo['root'], len(order)))
+    
+    with open(out / 'summary.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    
+    return summary
@@ -0,0 +1,158 @@
+"""
+Ocelotl v3.0 - Cachés
+Estructuras de memoización compartibles entre hilos
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class LRUCache:
+    """Caché LRU acotada y thread-safe con estadísticas de aciertos"""
+    
+    def __init__(self, maxsize: int = 65536):
+        """
+        Inicializa la caché
+        
+        Args:
+            maxsize: Número máximo de entradas (0 desactiva la caché)
+        """
+        self.maxsize = max(0, maxsize)
+        self._data: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Retorna el valor cacheado o lo calcula y lo almacena
+        
+        Args:
+            key: Clave de la entrada
+            compute: Función sin argumentos que calcula el valor
+        
+        Returns:
+            Valor asociado a la clave
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        
+        # Calcular fuera del lock: las funciones cacheadas son puras
+        value = compute()
+        
+        if self.maxsize:
+            with self._lock:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        
+        return value
+    
+    def clear(self):
+        """Vacía la caché y reinicia las estadísticas"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de uso de la caché
+        
+        Returns:
+            Dict con aciertos, fallos, tamaño y tasa de aciertos
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class FileResultCache:
+    """
+    Caché de matches validados por archivo, invalidada por mtime y tamaño.
+    Permite que escaneos sucesivos (daemon, modo watch) solo analicen
+    los archivos que cambiaron.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _signature(file_stat: os.stat_result) -> tuple:
+        """Firma que identifica una versión concreta de un archivo"""
+        return (file_stat.st_mtime_ns, file_stat.st_size)
+    
+    def get(self, file_path, file_stat: os.stat_result) -> Optional[List[Dict[str, Any]]]:
+        """
+        Obtiene los matches de un archivo si no cambió desde que se guardaron
+        
+        Args:
+            file_path: Ruta al archivo
+            file_stat: Resultado de stat() actual del archivo
+        
+        Returns:
+            Lista de matches validados o None si no hay entrada vigente
+        """
+        key = str(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self._signature(file_stat):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+    
+    def put(self, file_path, file_stat: os.stat_result, matches: List[Dict[str, Any]]):
+        """
+        Guarda los matches validados de un archivo
+        
+        Args:
+            file_path: Ruta al archivo
+            file_stat: Resultado de stat() usado al escanear
+            matches: Matches validados del archivo
+        """
+        with self._lock:
+            self._entries[str(file_path)] = (self._signature(file_stat), matches)
+    
+    def invalidate(self, file_path):
+        """Elimina la entrada de un archivo"""
+        with self._lock:
+            self._entries.pop(str(file_path), None)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de uso de la caché
+        
+        Returns:
+            Dict con aciertos, fallos y número de archivos cacheados
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'files': len(self._entries),
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,198 @@
+"""
+Ocelotl v3.0 - Checkpoints
+Estado persistente de un escaneo para poder reanudarlo tras una interrupción
+"""
+
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Set, Tuple
+
+
+class CheckpointError(Exception):
+    """Archivo de checkpoint inválido o de otro escaneo"""
+
+
+class Checkpoint:
+    """
+    Checkpoint de un escaneo en curso.
+    
+    El scanner recorre el árbol en orden determinista (entradas ordenadas por
+    nombre, en profundidad), así que basta con recordar qué entradas de cada
+    directorio abierto ya se procesaron: al terminar un directorio sus entradas
+    se sustituyen por el propio directorio en su padre. El estado ocupa
+    memoria proporcional a la profundidad del recorrido, no al tamaño del árbol.
+    
+    Formato del archivo (JSON):
+        version | base_path | shard | phase ('sensitive' o 'contents')
+        | completed (directorio relativo -> nombres terminados) | results | saved_at
+    """
+    
+    VERSION = 1
+    DEFAULT_INTERVAL = 30.0
+    PHASES = ('sensitive', 'contents')
+    
+    def __init__(
+        self,
+        checkpoint_file: str,
+        base_path: str,
+        interval: float = DEFAULT_INTERVAL,
+        shard: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Inicializa un checkpoint vacío
+        
+        Args:
+            checkpoint_file: Ruta del archivo de checkpoint
+            base_path: Ruta base del escaneo
+            interval: Segundos mínimos entre escrituras periódicas
+            shard: (i, N) si el escaneo es un shard
+        """
+        self.checkpoint_file = Path(checkpoint_file)
+        self.base_path = str(Path(base_path).resolve())
+        self.interval = interval
+        self.shard = list(shard) if shard is not None else None
+        self.phase = self.PHASES[0]
+        self.completed: Dict[str, Set[str]] = {}
+        self.results: Optional[Dict[str, Any]] = None
+        self.saved_at: Optional[str] = None
+        self._last_save = time.monotonic()
+    
+    @classmethod
+    def load(
+        cls,
+        checkpoint_file: str,
+        base_path: str,
+        interval: float = DEFAULT_INTERVAL,
+        shard: Optional[Tuple[int, int]] = None
+    ) -> 'Checkpoint':
+        """
+        Carga un checkpoint para reanudar el escaneo
+        
+        Args:
+            checkpoint_file: Ruta del archivo de checkpoint
+            base_path: Ruta base del escaneo (debe coincidir con la guardada)
+            interval: Segundos mínimos entre escrituras periódicas
+            shard: (i, N) si el escaneo es un shard (debe coincidir)
+        
+        Returns:
+            Checkpoint con el progreso y los resultados guardados
+        
+        Raises:
+            CheckpointError: Si el archivo no es válido o es de otro escaneo
+        """
+        try:
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CheckpointError(f"Cannot read checkpoint '{checkpoint_file}': {e}")
+        
+        if not isinstance(data, dict) or data.get('version') != cls.VERSION or data.get('phase') not in cls.PHASES:
+            raise CheckpointError(f"Invalid checkpoint file '{checkpoint_file}'")
+        
+        checkpoint = cls(checkpoint_file, base_path, interval, shard)
+        if data.get('base_path') != checkpoint.base_path:
+            raise CheckpointError(
+                f"Checkpoint '{checkpoint_file}' belongs to a scan of '{data.get('base_path')}'"
+            )
+        if data.get('shard') != checkpoint.shard:
+            raise CheckpointError(f"Checkpoint '{checkpoint_file}' belongs to a different shard")
+        
+        checkpoint.phase = data['phase']
+        checkpoint.completed = {directory: set(names) for directory, names in data.get('completed', {}).items()}
+        checkpoint.results = data.get('results')
+        checkpoint.saved_at = data.get('saved_at')
+        return checkpoint
+    
+    @staticmethod
+    def _split(rel_path: str) -> Tuple[str, str]:
+        """Separa una ruta relativa POSIX en (directorio padre, nombre)"""
+        parent, _, name = rel_path.rpartition('/')
+        return parent, name
+    
+    def is_done(self, rel_path: str) -> bool:
+        """
+        Indica si un archivo o directorio ya se procesó en la fase actual
+        
+        Args:
+            rel_path: Ruta relativa (POSIX) a la ruta base
+        """
+        parent, name = self._split(rel_path)
+        return name in self.completed.get(parent, ())
+    
+    def mark_done(self, rel_path: str):
+        """
+        Marca un archivo como procesado
+        
+        Args:
+            rel_path: Ruta relativa (POSIX) a la ruta base
+        """
+        parent, name = self._split(rel_path)
+        self.completed.setdefault(parent, set()).add(name)
+    
+    def complete_dir(self, rel_dir: str):
+        """
+        Marca un directorio como terminado y olvida el detalle de sus entradas
+        
+        Args:
+            rel_dir: Ruta relativa (POSIX) del directorio ('' para la raíz)
+        """
+        self.completed.pop(rel_dir, None)
+        if rel_dir:
+            self.mark_done(rel_dir)
+    
+    def start_phase(self, phase: str):
+        """Pasa a una nueva fase del escaneo con el recorrido desde el principio"""
+        self.phase = phase
+        self.completed.clear()
+    
+    def maybe_save(self, results: Dict[str, Any]) -> bool:
+        """
+        Guarda el checkpoint si pasó el intervalo desde la última escritura
+        
+        Args:
+            results: Resultados acumulados del scanner
+        
+        Returns:
+            bool: True si se escribió el archivo
+        """
+        if time.monotonic() - self._last_save < self.interval:
+            return False
+        self.save(results)
+        return True
+    
+    def save(self, results: Dict[str, Any]):
+        """
+        Escribe el checkpoint de forma atómica
+        
+        Args:
+            results: Resultados acumulados del scanner
+        """
+        self.saved_at = datetime.now().isoformat()
+        data = {
+            'version': self.VERSION,
+            'base_path': self.base_path,
+            'shard': self.shard,
+            'phase': self.phase,
+            'completed': {directory: sorted(names) for directory, names in self.completed.items()},
+            'results': results,
+            'saved_at': self.saved_at
+        }
+        
+        target = self.checkpoint_file
+        fd, tmp_name = tempfile.mkstemp(dir=str(target.parent), prefix='.ocelotl-checkpoint-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'), default=str)
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._last_save = time.monotonic()
+    
+    def remove(self):
+        """Elimina el archivo de checkpoint (el escaneo terminó)"""
+        self.checkpoint_file.unlink(missing_ok=True)
@@ -0,0 +1,179 @@
+"""
+Ocelotl v3.0 - Comentarios
+Pre-pasada léxica por archivo que calcula los rangos de comentarios
+"""
+
+import bisect
+import os
+import re
+from typing import List, Optional
+
+
+# Literales de string: se recorren para que '#' o '//' dentro de ellos no
+# abran un comentario
+_DOUBLE_QUOTED = r'"(?:\\.|[^"\\\n])*"'
+_SINGLE_QUOTED = r"'(?:\\.|[^'\\\n])*'"
+_BACKTICK = r'`(?:\\.|[^`\\])*`'
+_TRIPLE_QUOTED = r'"""[\s\S]*?(?:"""|\Z)|\'\'\'[\s\S]*?(?:\'\'\'|\Z)'
+
+_C_LINE = r'//[^\n]*'
+_C_BLOCK = r'/\*[\s\S]*?(?:\*/|\Z)'
+_HASH_AFTER_SPACE = r'(?:^|(?<=[ \t]))#[^\n]*'
+
+# Cada lenguaje es un único regex: los grupos 'comment' son comentarios
+# (líneas, bloques, docstrings) y los grupos 'string' se saltan
+LANGUAGE_LEXERS = {
+    'python': (
+        rf'(?P<comment>^[ \t]*(?:{_TRIPLE_QUOTED})|#[^\n]*)'
+        rf'|(?P<string>{_TRIPLE_QUOTED}|{_DOUBLE_QUOTED}|{_SINGLE_QUOTED})'
+    ),
+    'c': (
+        rf'(?P<comment>{_C_LINE}|{_C_BLOCK})'
+        rf'|(?P<string>{_DOUBLE_QUOTED}|{_SINGLE_QUOTED}|{_BACKTICK})'
+    ),
+    'php': (
+        rf'(?P<comment>{_C_LINE}|{_C_BLOCK}|#(?!\[)[^\n]*|<!--[\s\S]*?(?:-->|\Z))'
+        rf'|(?P<string>{_DOUBLE_QUOTED}|{_SINGLE_QUOTED})'
+    ),
+    'shell': (
+        rf'(?P<comment>{_HASH_AFTER_SPACE})'
+        rf'|(?P<string>{_DOUBLE_QUOTED}|\'[^\'\n]*\')'
+    ),
+    'powershell': (
+        rf'(?P<comment><#[\s\S]*?(?:#>|\Z)|{_HASH_AFTER_SPACE})'
+        rf'|(?P<string>{_DOUBLE_QUOTED}|\'[^\'\n]*\')'
+    ),
+    'sql': (
+        rf'(?P<comment>--[^\n]*|{_C_BLOCK})'
+        rf'|(?P<string>\'(?:\'\'|[^\'])*\'|{_DOUBLE_QUOTED})'
+    ),
+    'markup': r'(?P<comment><!--[\s\S]*?(?:-->|\Z)|<%--[\s\S]*?(?:--%>|\Z))',
+    'ini': r'(?P<comment>^[ \t]*[#;][^\n]*)',
+    'yaml': (
+        rf'(?P<comment>{_HASH_AFTER_SPACE})'
+        rf'|(?P<string>{_DOUBLE_QUOTED}|\'(?:\'\'|[^\'\n])*\')'
+    ),
+    # Claves y certificados: no tienen comentarios ('-----BEGIN' no es SQL)
+    'plain': None,
+}
+
+LANGUAGE_EXTENSIONS = {
+    'python': {'.py', '.pyw', '.pyi'},
+    'c': {
+        '.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs', '.java', '.cs', '.c', '.cpp',
+        '.h', '.hpp', '.go', '.rs', '.kt', '.scala', '.swift'
+    },
+    'php': {'.php', '.phtml', '.inc'},
+    'shell': {'.sh', '.bash', '.zsh', '.rb', '.pl', '.pm'},
+    'powershell': {'.ps1', '.psm1'},
+    'sql': {'.sql'},
+    'markup': {
+        '.html', '.htm', '.xhtml', '.xml', '.config', '.csproj', '.plist', '.svg',
+        '.jsp', '.jspx', '.asp', '.aspx'
+    },
+    'ini': {'.ini', '.cfg', '.conf', '.properties', '.env'},
+    'yaml': {'.yaml', '.yml', '.toml'},
+    'plain': {'.pem', '.crt', '.cer', '.key'},
+}
+
+LANGUAGE_FILENAMES = {
+    'dockerfile': 'shell',
+    'makefile': 'shell',
+    '.bashrc': 'shell',
+    '.profile': 'shell',
+    '.npmrc': 'ini',
+    '.pypirc': 'ini',
+}
+
+_COMPILED_LEXERS = {
+    language: re.compile(lexer, re.MULTILINE) if lexer is not None else None
+    for language, lexer in LANGUAGE_LEXERS.items()
+}
+_EXTENSION_LANGUAGES = {
+    extension: language
+    for language, extensions in LANGUAGE_EXTENSIONS.items()
+    for extension in extensions
+}
+
+
+def detect_language(filename: str) -> Optional[str]:
+    """
+    Determina la sintaxis de comentarios de un archivo
+    
+    Args:
+        filename: Nombre del archivo
+    
+    Returns:
+        Clave de LANGUAGE_LEXERS o None si no se reconoce
+    """
+    name = filename.lower()
+    if name in LANGUAGE_FILENAMES:
+        return LANGUAGE_FILENAMES[name]
+    if name.startswith('.env'):
+        return 'ini'
+    return _EXTENSION_LANGUAGES.get(os.path.splitext(name)[1])
+
+
+class CommentSpans:
+    """Rangos [inicio, fin) de comentarios de un archivo, ordenados y disjuntos"""
+    
+    __slots__ = ('starts', 'ends')
+    
+    def __init__(self, starts: List[int], ends: List[int]):
+        self.starts = starts
+        self.ends = ends
+    
+    def contains(self, offset: int) -> bool:
+        """
+        Indica si un offset del contenido cae dentro de un comentario (bisect)
+        
+        Args:
+            offset: Posición en el contenido
+        
+        Returns:
+            bool: True si está en un comentario
+        """
+        index = bisect.bisect_right(self.starts, offset) - 1
+        return index >= 0 and offset < self.ends[index]
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+def comment_spans(content: str, language: str) -> CommentSpans:
+    """
+    Calcula los comentarios de un contenido en una sola pasada léxica
+    
+    Args:
+        content: Contenido completo del archivo
+        language: Clave de LANGUAGE_LEXERS
+    
+    Returns:
+        CommentSpans del contenido
+    """
+    starts: List[int] = []
+    ends: List[int] = []
+    lexer = _COMPILED_LEXERS[language]
+    if lexer is not None:
+        for token in lexer.finditer(content):
+            if token.lastgroup == 'comment':
+                starts.append(token.start())
+                ends.append(token.end())
+    return CommentSpans(starts, ends)
+
+
+def file_comment_spans(filename: str, content: str) -> Optional[CommentSpans]:
+    """
+    Comentarios de un archivo según su lenguaje
+    
+    Args:
+        filename: Nombre del archivo
+        content: Contenido completo del archivo
+    
+    Returns:
+        CommentSpans o None si el lenguaje no se reconoce
+    """
+    language = detect_language(filename)
+    if language is None:
+        return None
+    return comment_spans(content, language)
@@ -0,0 +1,95 @@
+"""
+Ocelotl v3.0 - Archivos Comprimidos
+Descompresión en streaming de logs y dumps (gzip, bz2, xz) con límite de ratio
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import zlib
+from typing import BinaryIO, Iterator, Optional
+
+
+class DecompressionLimitError(Exception):
+    """El contenido descomprimido supera el límite de ratio (posible bomba de descompresión)"""
+
+
+# Formatos por extensión y cómo abrir cada uno sobre un archivo ya abierto
+COMPRESSED_FORMATS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+    '.lzma': 'xz',
+}
+_OPENERS = {
+    'gzip': lambda source: gzip.GzipFile(fileobj=source, mode='rb'),
+    'bz2': lambda source: bz2.BZ2File(source, 'rb'),
+    'xz': lambda source: lzma.LZMAFile(source, 'rb'),
+}
+
+# Errores de un flujo truncado o corrupto (p. ej. un .gz que aún se está escribiendo)
+DECOMPRESSION_ERRORS = (OSError, EOFError, lzma.LZMAError, zlib.error)
+
+# Ratio máximo descomprimido/comprimido; por debajo de MIN_DECOMPRESSED_ALLOWANCE
+# no se aplica (los archivos pequeños y repetitivos comprimen mucho)
+MAX_DECOMPRESSION_RATIO = 100
+MIN_DECOMPRESSED_ALLOWANCE = 16 * 1024 * 1024
+
+# Tamaño máximo de una línea en memoria: las líneas más largas se entregan por partes
+MAX_LINE_LENGTH = 1024 * 1024
+
+
+def compressed_format(filename: str) -> Optional[str]:
+    """
+    Determina si un archivo está comprimido en un formato soportado
+    
+    Args:
+        filename: Nombre del archivo
+    
+    Returns:
+        Formato ('gzip', 'bz2', 'xz') o None
+    """
+    return COMPRESSED_FORMATS.get(os.path.splitext(filename)[1].lower())
+
+
+def inner_name(filename: str) -> str:
+    """Nombre del contenido descomprimido ('app.log.gz' -> 'app.log')"""
+    return os.path.splitext(filename)[0]
+
+
+def iter_decompressed_lines(
+    source: BinaryIO,
+    file_format: str,
+    compressed_size: int,
+    max_ratio: int = MAX_DECOMPRESSION_RATIO
+) -> Iterator[bytes]:
+    """
+    Descomprime un flujo y entrega sus líneas sin cargarlo entero en memoria
+    
+    Args:
+        source: Archivo comprimido abierto en modo binario
+        file_format: Formato devuelto por compressed_format()
+        compressed_size: Tamaño comprimido (base del límite de ratio)
+        max_ratio: Ratio máximo descomprimido/comprimido
+    
+    Yields:
+        Líneas en bytes (con su salto de línea); las de más de MAX_LINE_LENGTH
+        se entregan en varias partes
+    
+    Raises:
+        DecompressionLimitError: Si el contenido supera el límite de ratio
+    """
+    limit = max(compressed_size * max_ratio, MIN_DECOMPRESSED_ALLOWANCE)
+    total = 0
+    with _OPENERS[file_format](source) as stream:
+        while True:
+            raw = stream.readline(MAX_LINE_LENGTH)
+            if not raw:
+                return
+            total += len(raw)
+            if total > limit:
+                raise DecompressionLimitError(
+                    f"decompressed size exceeds {max_ratio}x the compressed size"
+                )
+            yield raw
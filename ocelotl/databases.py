@@ -0,0 +1,203 @@
+"""
+Ocelotl v3.0 - Bases de Datos
+Lectura en modo solo lectura del contenido de bases de datos SQLite
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .structured import classify_key
+
+
+class DatabaseCell(NamedTuple):
+    """Valor de texto de una celda de una tabla"""
+    table: str
+    column: str
+    rowid: Optional[int]    # rowid de la fila (posición 1-based en tablas WITHOUT ROWID)
+    value: str
+
+
+# Extensiones que se abren como SQLite si el archivo tiene la cabecera
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+SQLITE_HEADER = b'SQLite format 3\x00'
+
+# Columnas con afinidad de texto o blob (o sin tipo declarado)
+TEXT_AFFINITY = re.compile(r'CHAR|CLOB|TEXT|BLOB|JSON', re.IGNORECASE)
+
+# Límites por base de datos para que una base enorme no detenga el escaneo
+DEFAULT_MAX_ROWS = 100_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Caracteres leídos de cada valor (substr en la consulta: la memoria queda acotada)
+MAX_VALUE_LENGTH = 1024 * 1024
+
+# Filas por lote (los patrones se aplican una vez por lote)
+BATCH_ROWS = 500
+
+
+def is_sqlite_database(file_path: Path) -> bool:
+    """
+    Verifica si un archivo es una base de datos SQLite por su cabecera
+    
+    Args:
+        file_path: Ruta al archivo
+    
+    Returns:
+        bool: True si empieza por la cabecera 'SQLite format 3'
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+def _quote(identifier: str) -> str:
+    """Cita un identificador SQL"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SqliteReader:
+    """
+    Lee por lotes los valores de texto de una base SQLite sin modificarla:
+    conexión 'mode=ro', 'immutable' y 'query_only', solo tablas normales (ni
+    vistas ni tablas virtuales). Las tablas con columnas de nombre sensible se leen
+    primero, para que los límites de filas y bytes no las dejen fuera.
+    """
+    
+    def __init__(
+        self,
+        file_path: Path,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        batch_rows: int = BATCH_ROWS
+    ):
+        """
+        Inicializa el lector
+        
+        Args:
+            file_path: Ruta a la base de datos
+            max_rows: Filas máximas a leer de toda la base
+            max_bytes: Caracteres máximos a leer de toda la base
+            batch_rows: Filas por lote
+        """
+        self.file_path = Path(file_path)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self.bytes = 0
+        self.limited = False
+        # Categoría de clave sensible de cada columna leída ('users.password' -> 'passwords')
+        self.categories: Dict[Tuple[str, str], Optional[str]] = {}
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre la base en modo solo lectura. Con 'mode=ro' solo, una base en
+        modo WAL crea igualmente '-shm' y '-wal' junto al archivo; 'immutable'
+        evita crearlos (y cualquier bloqueo), a costa de no ver lo que un
+        proceso escritor tenga aún sin volcar en su WAL
+        """
+        uri = self.file_path.resolve().as_uri() + '?mode=ro&immutable=1'
+        connection = sqlite3.connect(uri, uri=True, timeout=1.0)
+        connection.execute('PRAGMA query_only = ON')
+        connection.text_factory = lambda raw: raw.decode('utf-8', errors='ignore')
+        return connection
+    
+    def _tables(self, connection: sqlite3.Connection) -> List[Tuple[str, List[str]]]:
+        """
+        Tablas y sus columnas de texto, las que tienen columnas sensibles primero
+        
+        Returns:
+            Lista de (tabla, columnas de texto)
+        """
+        names = [
+            row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL%' ORDER BY name"
+            )
+        ]
+        tables = []
+        for name in names:
+            columns = [
+                column for _, column, declared, *_ in connection.execute(f'PRAGMA table_info({_quote(name)})')
+                if not declared or TEXT_AFFINITY.search(declared)
+            ]
+            if columns:
+                tables.append((name, columns))
+                for column in columns:
+                    self.categories[(name, column)] = classify_key(f"{name}.{column}")
+        
+        def sensitive(table: Tuple[str, List[str]]) -> bool:
+            return any(self.categories[(table[0], column)] for column in table[1])
+        
+        return sorted(tables, key=lambda table: not sensitive(table))
+    
+    def iter_batches(self) -> Iterator[List[DatabaseCell]]:
+        """
+        Recorre las tablas por lotes de filas hasta agotar la base o los límites
+        (en ese caso limited queda en True)
+        
+        Yields:
+            Lista de celdas con valor de texto no vacío de cada lote
+        
+        Raises:
+            sqlite3.Error: Si la base no se puede abrir o leer
+        """
+        connection = self._connect()
+        try:
+            for table, columns in self._tables(connection):
+                yield from self._iter_table(connection, table, columns)
+                if self.limited:
+                    return
+        finally:
+            connection.close()
+    
+    def _iter_table(
+        self,
+        connection: sqlite3.Connection,
+        table: str,
+        columns: List[str]
+    ) -> Iterator[List[DatabaseCell]]:
+        """Lotes de celdas de una tabla"""
+        selected = ', '.join(f'substr({_quote(column)}, 1, {MAX_VALUE_LENGTH})' for column in columns)
+        try:
+            cursor = connection.execute(f'SELECT rowid, {selected} FROM {_quote(table)}')
+            has_rowid = True
+        except sqlite3.OperationalError:
+            # Tabla WITHOUT ROWID: se numera por posición
+            cursor = connection.execute(f'SELECT NULL, {selected} FROM {_quote(table)}')
+            has_rowid = False
+        
+        position = 0
+        while True:
+            if self.rows >= self.max_rows:
+                self.limited = True
+                return
+            rows = cursor.fetchmany(min(self.batch_rows, self.max_rows - self.rows))
+            if not rows:
+                return
+            
+            batch = []
+            for row in rows:
+                position += 1
+                self.rows += 1
+                rowid = row[0] if has_rowid else position
+                for column, value in zip(columns, row[1:]):
+                    if isinstance(value, bytes):
+                        # Blobs: solo si parecen texto (mismo criterio que FileHelper.is_binary)
+                        if b'\0' in value[:8192]:
+                            continue
+                        value = value.decode('utf-8', errors='ignore')
+                    if not isinstance(value, str) or not value:
+                        continue
+                    self.bytes += len(value)
+                    batch.append(DatabaseCell(table, column, rowid, value))
+            
+            if batch:
+                yield batch
+            if self.bytes >= self.max_bytes:
+                self.limited = True
+                return
@@ -0,0 +1,162 @@
+"""
+Ocelotl v3.0 - Detector de Entropía
+Detección genérica de tokens aleatorios (claves sin formato conocido)
+"""
+
+import math
+import re
+from typing import Iterator, Tuple
+
+
+# Tablas precalculadas para la entropía de Shannon:
+#   H = log2(n) - (1/n) * sum(c * log2(c))  sobre los conteos c del histograma
+ENTROPY_TABLE_SIZE = 4096
+_LOG2 = [0.0] + [math.log2(n) for n in range(1, ENTROPY_TABLE_SIZE + 1)]
+_C_LOG_C = [0.0] + [c * math.log2(c) for c in range(1, ENTROPY_TABLE_SIZE + 1)]
+
+HEX_CHARS = frozenset('0123456789abcdefABCDEF')
+
+
+def shannon_entropy(text: str) -> float:
+    """
+    Entropía de Shannon de un texto usando las tablas de logaritmos
+    
+    Args:
+        text: Texto a analizar
+    
+    Returns:
+        float: Entropía en bits por carácter
+    """
+    length = len(text)
+    if not length:
+        return 0.0
+    if length > ENTROPY_TABLE_SIZE:
+        total = sum(count * math.log2(count) for count in map(text.count, set(text)))
+        return max(0.0, math.log2(length) - total / length)
+    
+    c_log_c = _C_LOG_C
+    total = sum(c_log_c[count] for count in map(text.count, set(text)))
+    return max(0.0, _LOG2[length] - total / length)
+
+
+class EntropyMatch:
+    """Candidato de alta entropía con la interfaz de re.Match que usa el scanner"""
+    
+    __slots__ = ('token', 'start_offset', 'end_offset', 'entropy')
+    
+    def __init__(self, token: str, start: int, end: int, entropy: float):
+        self.token = token
+        self.start_offset = start
+        self.end_offset = end
+        self.entropy = entropy
+    
+    def group(self) -> str:
+        return self.token
+    
+    def groups(self) -> Tuple[str]:
+        return (self.token,)
+    
+    def start(self) -> int:
+        return self.start_offset
+    
+    def end(self) -> int:
+        return self.end_offset
+    
+    def span(self) -> Tuple[int, int]:
+        return (self.start_offset, self.end_offset)
+
+
+class EntropyDetector:
+    """
+    Detector de cadenas de alta entropía.
+    
+    Una sola expresión tokeniza en una pasada los strings entre comillas y los
+    valores de asignaciones (`KEY=valor`, `key: valor`) con alfabeto de token
+    (base64/base64url/hex). Cada candidato pasa por filtros baratos antes de
+    calcular su entropía:
+    
+    - el número de caracteres distintos acota la entropía (H <= log2(distintos))
+    - el alfabeto decide el umbral: hex (máximo 4 bits) o base64 (máximo 6 bits)
+    
+    Expone `finditer` como un patrón compilado, así el scanner lo aplica junto
+    a los regex y sus candidatos siguen el pipeline normal de validación.
+    """
+    
+    MIN_LENGTH = 20
+    MAX_LENGTH = 200
+    BASE64_THRESHOLD = 4.5
+    HEX_THRESHOLD = 3.0
+    
+    # Prefijos de valores aleatorios que no son secretos (integridad de paquetes)
+    IGNORED_PREFIXES = ('sha1-', 'sha256-', 'sha384-', 'sha512-')
+    
+    def __init__(
+        self,
+        min_length: int = MIN_LENGTH,
+        base64_threshold: float = BASE64_THRESHOLD,
+        hex_threshold: float = HEX_THRESHOLD
+    ):
+        """
+        Inicializa el detector
+        
+        Args:
+            min_length: Longitud mínima de un candidato
+            base64_threshold: Entropía mínima para tokens base64
+            hex_threshold: Entropía mínima para tokens hexadecimales
+        """
+        self.min_length = min_length
+        self.base64_threshold = base64_threshold
+        self.hex_threshold = hex_threshold
+        
+        token = rf'[A-Za-z0-9+/=_\-.~]{{{min_length},{self.MAX_LENGTH}}}'
+        self.pattern = re.compile(
+            rf'["\'`]({token})["\'`]'
+            rf'|[=:][ \t]*({token})(?=[\s;,]|$)',
+            re.MULTILINE
+        )
+        
+        # Caracteres distintos necesarios para poder alcanzar cada umbral
+        self._min_distinct_base64 = math.ceil(2 ** base64_threshold)
+        self._min_distinct_hex = math.ceil(2 ** hex_threshold)
+    
+    def score(self, token: str) -> float:
+        """
+        Entropía de un candidato o 0.0 si no alcanza el umbral de su alfabeto
+        
+        Args:
+            token: Texto del candidato
+        
+        Returns:
+            float: Entropía del token (0.0 si se descarta)
+        """
+        distinct = set(token)
+        if distinct <= HEX_CHARS:
+            minimum, threshold = self._min_distinct_hex, self.hex_threshold
+        else:
+            minimum, threshold = self._min_distinct_base64, self.base64_threshold
+        
+        if len(distinct) < minimum or token.startswith(self.IGNORED_PREFIXES):
+            return 0.0
+        
+        length = len(token)
+        c_log_c = _C_LOG_C
+        entropy = _LOG2[length] - sum(c_log_c[count] for count in map(token.count, distinct)) / length
+        return entropy if entropy >= threshold else 0.0
+    
+    def finditer(self, text: str) -> Iterator[EntropyMatch]:
+        """
+        Busca cadenas de alta entropía en un texto
+        
+        Args:
+            text: Texto a analizar
+        
+        Yields:
+            EntropyMatch por cada candidato que supera el umbral
+        """
+        score = self.score
+        for match in self.pattern.finditer(text):
+            group = 1 if match.start(1) >= 0 else 2
+            token = match.group(group)
+            entropy = score(token)
+            if entropy:
+                yield EntropyMatch(token, match.start(group), match.end(group), entropy)
@@ -0,0 +1,41 @@
+"""
+Ocelotl v3.0 - Hallazgos
+Hallazgos tipados de la API de librería (iter_findings, scan_bytes)
+"""
+
+from typing import Dict, Any, NamedTuple, Optional
+
+
+class Finding(NamedTuple):
+    """Hallazgo validado, listo para consumir desde otra aplicación"""
+    category: str               # Categoría de resultados ('api_keys', 'credentials', 'sensitive_files', ...)
+    rule: str                   # Tipo de patrón que lo detectó ('high_entropy', 'db_credentials', ...)
+    file: str                   # Ruta (o nombre, en scan_bytes) del archivo
+    line: int                   # Línea del match (0 en archivos sensibles por nombre)
+    match: str                  # Texto detectado (patrón del nombre en archivos sensibles)
+    confidence: Optional[str]   # Nivel de confianza (None en archivos sensibles por nombre)
+    data: Dict[str, Any]        # Hallazgo completo, con el formato de los resultados de scan()
+    
+    @classmethod
+    def from_result(cls, category: str, data: Dict[str, Any]) -> 'Finding':
+        """
+        Crea un hallazgo tipado a partir de un hallazgo de los resultados
+        
+        Args:
+            category: Categoría de resultados
+            data: Hallazgo (match validado o archivo sensible)
+        
+        Returns:
+            Finding
+        """
+        if category == 'sensitive_files':
+            return cls(category, data['type'], data['file'], 0, data['pattern_matched'], None, data)
+        return cls(
+            category,
+            data['type'],
+            data['file'],
+            data['line'],
+            data['match'],
+            data['validation']['confidence'],
+            data
+        )
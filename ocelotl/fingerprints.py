@@ -0,0 +1,93 @@
+"""
+Ocelotl v3.0 - Fingerprints
+Identificadores estables de hallazgos entre escaneos
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+def extract_secret(finding: Dict[str, Any]) -> str:
+    """
+    Obtiene el valor secreto de un hallazgo: el último grupo capturado
+    no vacío o, si no hay grupos, el texto completo del match
+    
+    Args:
+        finding: Hallazgo con 'match' y 'full_match'
+    
+    Returns:
+        str: Valor secreto normalizado (sin comillas ni espacios exteriores)
+    """
+    groups = [group for group in (finding.get('full_match') or ()) if group]
+    secret = groups[-1] if groups else finding.get('match', '')
+    return secret.strip().strip('\'"').strip()
+
+
+def relative_path(file_path: str, base_path: Optional[Path] = None) -> str:
+    """
+    Normaliza una ruta para que no dependa de dónde se montó el árbol
+    
+    Args:
+        file_path: Ruta del hallazgo
+        base_path: Ruta base del escaneo
+    
+    Returns:
+        str: Ruta relativa en formato POSIX (o la original si no es relativa a la base)
+    """
+    path = Path(file_path)
+    if base_path is not None:
+        try:
+            return path.resolve().relative_to(Path(base_path).resolve()).as_posix()
+        except ValueError:
+            pass
+    return path.as_posix()
+
+
+def finding_digest(
+    finding: Dict[str, Any],
+    base_path: Optional[Path] = None,
+    salt: bytes = b'',
+    size: int = 32
+) -> bytes:
+    """
+    Calcula el digest de un hallazgo a partir de (regla, secreto, ruta).
+    No depende del número de línea, así que sobrevive a ediciones del archivo.
+    
+    Args:
+        finding: Hallazgo a identificar
+        base_path: Ruta base para relativizar la ruta del archivo
+        salt: Sal opcional para que los hashes no sean reversibles por diccionario
+        size: Bytes del digest a conservar (máximo 32)
+    
+    Returns:
+        bytes: Digest SHA-256 truncado a size bytes
+    """
+    rule = finding.get('type', '')
+    secret = extract_secret(finding) if rule != 'sensitive_file' else finding.get('pattern_matched', '')
+    path = relative_path(finding.get('file', ''), base_path)
+    
+    hasher = hashlib.sha256(salt)
+    for part in (rule, secret, path):
+        hasher.update(part.encode('utf-8', errors='surrogateescape'))
+        hasher.update(b'\0')
+    return hasher.digest()[:size]
+
+
+def finding_fingerprint(
+    finding: Dict[str, Any],
+    base_path: Optional[Path] = None,
+    salt: bytes = b''
+) -> str:
+    """
+    Fingerprint hexadecimal de un hallazgo (ver finding_digest)
+    
+    Args:
+        finding: Hallazgo a identificar
+        base_path: Ruta base para relativizar la ruta del archivo
+        salt: Sal opcional
+    
+    Returns:
+        str: Digest SHA-256 hexadecimal
+    """
+    return finding_digest(finding, base_path, salt).hex()
@@ -0,0 +1,316 @@
+"""
+Ocelotl v3.0 - Secretos Conocidos
+Consulta de secretos filtrados conocidos con un filtro de Bloom en disco
+"""
+
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, BinaryIO, Iterable, Iterator, List, Tuple
+
+
+class KnownSecretsError(Exception):
+    """Archivos de secretos conocidos inválidos o ilegibles"""
+
+
+# Algoritmos de hash admitidos en el corpus: id en el archivo y tamaño del digest
+ALGORITHMS = {
+    'sha1': (1, 20),
+    'sha256': (2, 32),
+}
+
+DEFAULT_FP_RATE = 0.001
+BUILD_CHUNK_SIZE = 1_000_000
+
+
+def _paths(prefix: str) -> Tuple[Path, Path]:
+    """Rutas (filtro de Bloom, hashes ordenados) de un prefijo"""
+    if prefix.endswith('.bloom'):
+        prefix = prefix[:-len('.bloom')]
+    return Path(prefix + '.bloom'), Path(prefix + '.hashes')
+
+
+def _bit_positions(digest: bytes, hash_count: int, bit_count: int) -> Iterator[int]:
+    """
+    Posiciones del filtro para un digest (doble hashing sobre el propio digest,
+    que ya es uniforme: no hace falta volver a hashear)
+    """
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:16], 'little') | 1
+    for i in range(hash_count):
+        yield (h1 + i * h2) % bit_count
+
+
+class KnownSecrets:
+    """
+    Corpus de secretos filtrados conocidos.
+    
+    Dos archivos generados por build_known_secrets():
+    
+    - PREFIJO.bloom: magic 'OCKB' | versión | algoritmo | k (funciones hash)
+      | m (bits, uint64) | entradas (uint64) | array de bits
+    - PREFIJO.hashes: magic 'OCKH' | versión | algoritmo | tamaño del digest
+      | entradas (uint64) | digests ordenados y sin repetir
+    
+    Ambos se abren con mmap: cada consulta lee k bits del filtro (O(1)) y solo
+    los positivos del filtro se confirman con búsqueda binaria en los hashes
+    ordenados, así que la memoria residente es la de las páginas tocadas.
+    """
+    
+    VERSION = 1
+    BLOOM_MAGIC = b'OCKB'
+    HASHES_MAGIC = b'OCKH'
+    _BLOOM_HEADER = struct.Struct('<4sBBHQQ')
+    _HASHES_HEADER = struct.Struct('<4sBBHQ')
+    
+    def __init__(self, prefix: str):
+        """
+        Abre los archivos de un corpus
+        
+        Args:
+            prefix: Prefijo de los archivos (con o sin la extensión '.bloom')
+        
+        Raises:
+            KnownSecretsError: Si faltan los archivos o no tienen el formato esperado
+        """
+        bloom_path, hashes_path = _paths(prefix)
+        self._files: List[BinaryIO] = []
+        try:
+            self._bloom = self._map(bloom_path)
+            self._hashes = self._map(hashes_path)
+        except (OSError, ValueError) as e:
+            self.close()
+            raise KnownSecretsError(f"Cannot open known secrets '{prefix}': {e}")
+        
+        try:
+            magic, version, algorithm_id, self.hash_count, self.bit_count, self.entries = (
+                self._BLOOM_HEADER.unpack_from(self._bloom)
+            )
+            if magic != self.BLOOM_MAGIC or version != self.VERSION or not self.bit_count:
+                raise KnownSecretsError(f"Invalid known secrets filter '{bloom_path}'")
+            
+            magic, version, hashes_algorithm, self.digest_size, count = (
+                self._HASHES_HEADER.unpack_from(self._hashes)
+            )
+            if magic != self.HASHES_MAGIC or version != self.VERSION or hashes_algorithm != algorithm_id:
+                raise KnownSecretsError(f"Invalid known secrets hashes '{hashes_path}'")
+            if len(self._hashes) - self._HASHES_HEADER.size != count * self.digest_size:
+                raise KnownSecretsError(f"Truncated known secrets hashes '{hashes_path}'")
+            if len(self._bloom) - self._BLOOM_HEADER.size < (self.bit_count + 7) // 8:
+                raise KnownSecretsError(f"Truncated known secrets filter '{bloom_path}'")
+        except (struct.error, KnownSecretsError) as e:
+            self.close()
+            if isinstance(e, KnownSecretsError):
+                raise
+            raise KnownSecretsError(f"Invalid known secrets '{prefix}': {e}")
+        
+        self.algorithm = next(name for name, (code, _) in ALGORITHMS.items() if code == algorithm_id)
+        self.hash_entries = count
+    
+    def _map(self, path: Path) -> mmap.mmap:
+        """Abre un archivo en modo lectura y lo mapea en memoria"""
+        f = open(path, 'rb')
+        self._files.append(f)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def digest(self, secret: str) -> bytes:
+        """Digest de un secreto con el algoritmo del corpus"""
+        return hashlib.new(self.algorithm, secret.encode('utf-8', errors='surrogateescape')).digest()
+    
+    def might_contain(self, digest: bytes) -> bool:
+        """Consulta el filtro de Bloom (sin falsos negativos)"""
+        bloom = self._bloom
+        offset = self._BLOOM_HEADER.size
+        for position in _bit_positions(digest, self.hash_count, self.bit_count):
+            if not bloom[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+    
+    def contains_digest(self, digest: bytes) -> bool:
+        """Confirma un digest con búsqueda binaria en los hashes ordenados"""
+        hashes = self._hashes
+        size = self.digest_size
+        base = self._HASHES_HEADER.size
+        low, high = 0, self.hash_entries
+        while low < high:
+            middle = (low + high) // 2
+            offset = base + middle * size
+            current = hashes[offset:offset + size]
+            if current < digest:
+                low = middle + 1
+            elif current > digest:
+                high = middle
+            else:
+                return True
+        return False
+    
+    def contains(self, secret: str) -> bool:
+        """
+        Comprueba si un secreto está en el corpus de filtraciones conocidas
+        
+        Args:
+            secret: Valor secreto en claro
+        
+        Returns:
+            bool: True si el secreto está confirmado en el corpus
+        """
+        if not secret:
+            return False
+        digest = self.digest(secret)
+        return self.might_contain(digest) and self.contains_digest(digest)
+    
+    def close(self):
+        """Libera los mapeos y cierra los archivos"""
+        for name in ('_bloom', '_hashes'):
+            mapping = self.__dict__.pop(name, None)
+            if mapping is not None:
+                mapping.close()
+        for f in self._files:
+            f.close()
+        self._files = []
+    
+    def __len__(self) -> int:
+        return self.hash_entries
+
+
+def bloom_parameters(entries: int, fp_rate: float = DEFAULT_FP_RATE) -> Tuple[int, int]:
+    """
+    Dimensiona un filtro de Bloom
+    
+    Args:
+        entries: Número de elementos esperados
+        fp_rate: Tasa de falsos positivos objetivo
+    
+    Returns:
+        Tupla (bits m, funciones hash k)
+    """
+    entries = max(entries, 1)
+    bits_per_entry = -math.log(fp_rate) / (math.log(2) ** 2)
+    bit_count = max(64, math.ceil(entries * bits_per_entry))
+    hash_count = max(1, round(bits_per_entry * math.log(2)))
+    return bit_count, hash_count
+
+
+def _parse_hash_list(lines: Iterable[str], digest_size: int, stats: Dict[str, int]) -> Iterator[bytes]:
+    """Digests de una lista de hashes en hex (uno por línea, admite 'HASH:contador')"""
+    hex_size = digest_size * 2
+    for line in lines:
+        value = line.split(':', 1)[0].strip()
+        if not value or value.startswith('#'):
+            continue
+        if len(value) != hex_size:
+            stats['skipped'] += 1
+            continue
+        try:
+            yield bytes.fromhex(value)
+        except ValueError:
+            stats['skipped'] += 1
+
+
+def _read_run(path: str, size: int) -> Iterator[bytes]:
+    """Digests de un tramo ordenado escrito en disco"""
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(size * 4096)
+            if not block:
+                return
+            for offset in range(0, len(block), size):
+                yield block[offset:offset + size]
+
+
+def build_known_secrets(
+    hash_list: str,
+    prefix: str,
+    algorithm: str = 'sha1',
+    fp_rate: float = DEFAULT_FP_RATE,
+    chunk_size: int = BUILD_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Compila un corpus de secretos conocidos desde una lista de hashes en texto.
+    Ordena por tramos en disco (la memoria no depende del tamaño de la lista),
+    fusiona los tramos eliminando repetidos y rellena el filtro en la misma pasada.
+    
+    Args:
+        hash_list: Archivo con un hash en hex por línea
+        prefix: Prefijo de salida (se escriben PREFIJO.bloom y PREFIJO.hashes)
+        algorithm: Algoritmo de los hashes ('sha1' o 'sha256')
+        fp_rate: Tasa de falsos positivos objetivo del filtro
+        chunk_size: Digests por tramo ordenado en memoria
+    
+    Returns:
+        Dict con entradas, líneas descartadas, bits y funciones hash del filtro
+    
+    Raises:
+        KnownSecretsError: Si el algoritmo o la tasa de falsos positivos no son válidos
+    """
+    if algorithm not in ALGORITHMS:
+        raise KnownSecretsError(f"Unsupported hash algorithm '{algorithm}'")
+    if not 0 < fp_rate < 1:
+        raise KnownSecretsError(f"Invalid false positive rate {fp_rate}")
+    
+    algorithm_id, digest_size = ALGORITHMS[algorithm]
+    bloom_path, hashes_path = _paths(prefix)
+    stats = {'skipped': 0}
+    
+    with tempfile.TemporaryDirectory(dir=str(bloom_path.parent), prefix='.ocelotl-known-') as work_dir:
+        # 1. Tramos ordenados en disco
+        runs: List[str] = []
+        total = 0
+        with open(hash_list, 'r', encoding='utf-8', errors='ignore') as f:
+            digests = _parse_hash_list(f, digest_size, stats)
+            while True:
+                chunk = sorted(set(d for _, d in zip(range(chunk_size), digests)))
+                if not chunk:
+                    break
+                run_path = os.path.join(work_dir, f"run-{len(runs)}")
+                with open(run_path, 'wb') as run:
+                    run.write(b''.join(chunk))
+                runs.append(run_path)
+                total += len(chunk)
+        
+        # 2. Fusión sin repetidos: hashes ordenados y filtro en una pasada
+        bit_count, hash_count = bloom_parameters(total, fp_rate)
+        bits = bytearray((bit_count + 7) // 8)
+        entries = 0
+        hashes_tmp = os.path.join(work_dir, 'hashes')
+        with open(hashes_tmp, 'wb') as out:
+            out.write(KnownSecrets._HASHES_HEADER.pack(
+                KnownSecrets.HASHES_MAGIC, KnownSecrets.VERSION, algorithm_id, digest_size, 0
+            ))
+            previous = None
+            for digest in heapq.merge(*(_read_run(path, digest_size) for path in runs)):
+                if digest == previous:
+                    continue
+                previous = digest
+                out.write(digest)
+                entries += 1
+                for position in _bit_positions(digest, hash_count, bit_count):
+                    bits[position >> 3] |= 1 << (position & 7)
+            out.seek(0)
+            out.write(KnownSecrets._HASHES_HEADER.pack(
+                KnownSecrets.HASHES_MAGIC, KnownSecrets.VERSION, algorithm_id, digest_size, entries
+            ))
+        
+        bloom_tmp = os.path.join(work_dir, 'bloom')
+        with open(bloom_tmp, 'wb') as out:
+            out.write(KnownSecrets._BLOOM_HEADER.pack(
+                KnownSecrets.BLOOM_MAGIC, KnownSecrets.VERSION, algorithm_id, hash_count, bit_count, entries
+            ))
+            out.write(bits)
+        
+        os.replace(hashes_tmp, hashes_path)
+        os.replace(bloom_tmp, bloom_path)
+    
+    return {
+        'entries': entries,
+        'skipped': stats['skipped'],
+        'bits': bit_count,
+        'hash_functions': hash_count,
+        'bloom_file': str(bloom_path),
+        'hashes_file': str(hashes_path),
+    }
@@ -0,0 +1,264 @@
+"""
+Ocelotl v3.0 - Métricas
+Tiempos por etapa, contadores de rendimiento y exportación OpenMetrics
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Etapas instrumentadas del escaneo
+STAGES = ['walk', 'read', 'match', 'validate', 'report']
+
+# Límites superiores (segundos) de los buckets de duración
+DURATION_BUCKETS = [0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Memoria residente máxima del proceso
+    
+    Returns:
+        int: Bytes (None si la plataforma no lo expone)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Histogram:
+    """Histograma acumulativo de duraciones"""
+    
+    def __init__(self, buckets: List[float] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        """Registra una observación"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def cumulative(self) -> List[int]:
+        """Cuentas acumuladas por bucket (la última corresponde a +Inf)"""
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+    
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [str(bound) for bound in self.buckets] + ['+Inf']
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'buckets': dict(zip(labels, self.cumulative()))
+        }
+
+
+class ScanMetrics:
+    """
+    Métricas de rendimiento de un escaneo: histogramas por etapa, bytes
+    leídos y motivos por los que se omitieron archivos. Thread-safe.
+    """
+    
+    def __init__(self):
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.bytes_scanned = 0
+        self.skipped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, stage: str, seconds: float):
+        """
+        Registra la duración de una etapa
+        
+        Args:
+            stage: Etapa (ver STAGES)
+            seconds: Duración en segundos
+        """
+        with self._lock:
+            self.stages[stage].observe(seconds)
+    
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Mide el bloque y lo registra en la etapa indicada"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+    
+    def add_bytes(self, nbytes: int):
+        """Suma bytes leídos y analizados"""
+        with self._lock:
+            self.bytes_scanned += nbytes
+    
+    def skip(self, reason: str):
+        """Cuenta un archivo omitido por el motivo indicado"""
+        with self._lock:
+            self.skipped[reason] = self.skipped.get(reason, 0) + 1
+    
+    def to_dict(self, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Exporta las métricas (incluidas en el reporte JSON)
+        
+        Args:
+            stats: Estadísticas del escaneo (results['stats']) para tasas y cachés
+        
+        Returns:
+            Dict serializable a JSON
+        """
+        stats = stats or {}
+        with self._lock:
+            data = {
+                'stages': {stage: histogram.to_dict() for stage, histogram in self.stages.items()},
+                'bytes_scanned': self.bytes_scanned,
+                'skipped': dict(self.skipped),
+            }
+        
+        duration = scan_duration(stats)
+        files = stats.get('files_scanned', 0)
+        data['duration_seconds'] = round(duration, 3) if duration is not None else None
+        data['files_per_second'] = round(files / duration, 2) if duration else None
+        data['bytes_per_second'] = round(data['bytes_scanned'] / duration, 2) if duration else None
+        data['cache_hit_rates'] = cache_hit_rates(stats)
+        data['peak_rss_bytes'] = peak_rss_bytes()
+        return data
+
+
+def scan_duration(stats: Dict[str, Any]) -> Optional[float]:
+    """Duración del escaneo en segundos a partir de start_time/end_time"""
+    from datetime import datetime
+    try:
+        start = datetime.fromisoformat(stats['start_time'])
+        end = datetime.fromisoformat(stats['end_time'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return max((end - start).total_seconds(), 0.0)
+
+
+def cache_hit_rates(stats: Dict[str, Any]) -> Dict[str, float]:
+    """Tasas de acierto de las cachés de validación y de archivos"""
+    rates = {}
+    for name, cache_stats in stats.get('validation_cache', {}).items():
+        rates[f'validation_{name}'] = cache_stats.get('hit_rate', 0.0)
+    
+    files = stats.get('files_scanned', 0)
+    if files:
+        rates['file_results'] = round(stats.get('file_cache_hits', 0) / files, 4)
+        rates['content_dedup'] = round(stats.get('duplicate_files', 0) / files, 4)
+    return rates
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def render_openmetrics(metrics: Dict[str, Any], stats: Dict[str, Any]) -> str:
+    """
+    Genera el texto OpenMetrics de un escaneo. Los valores de la última
+    ejecución se exportan como gauges, como es habitual en trabajos batch.
+    
+    Args:
+        metrics: Resultado de ScanMetrics.to_dict()
+        stats: Estadísticas del escaneo
+    
+    Returns:
+        str: Exposición en formato OpenMetrics (termina en '# EOF')
+    """
+    lines: List[str] = []
+    
+    def family(name: str, kind: str, help_text: str):
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"# HELP {name} {help_text}")
+    
+    def sample(name: str, value, labels: Optional[Dict[str, str]] = None):
+        if value is None:
+            return
+        label_text = ''
+        if labels:
+            label_text = '{' + ','.join(f'{key}="{_escape_label(str(val))}"' for key, val in labels.items()) + '}'
+        lines.append(f"{name}{label_text} {_format_value(value)}")
+    
+    family('ocelotl_stage_duration_seconds', 'histogram', 'Time spent per scan stage.')
+    for stage, histogram in metrics['stages'].items():
+        for bound, count in histogram['buckets'].items():
+            sample('ocelotl_stage_duration_seconds_bucket', count, {'stage': stage, 'le': bound})
+        sample('ocelotl_stage_duration_seconds_sum', histogram['sum'], {'stage': stage})
+        sample('ocelotl_stage_duration_seconds_count', histogram['count'], {'stage': stage})
+    
+    gauges = [
+        ('ocelotl_scan_duration_seconds', 'Wall-clock duration of the last scan.', metrics.get('duration_seconds')),
+        ('ocelotl_scan_files', 'Files scanned in the last scan.', stats.get('files_scanned', 0)),
+        ('ocelotl_scan_bytes', 'Bytes read and matched in the last scan.', metrics.get('bytes_scanned', 0)),
+        ('ocelotl_scan_files_per_second', 'Scan throughput in files per second.', metrics.get('files_per_second')),
+        ('ocelotl_scan_bytes_per_second', 'Scan throughput in bytes per second.', metrics.get('bytes_per_second')),
+        ('ocelotl_scan_findings', 'Findings reported in the last scan.', stats.get('matches_found', 0)),
+        ('ocelotl_scan_false_positives', 'Matches filtered as false positives.', stats.get('false_positives_filtered', 0)),
+        ('ocelotl_scan_errors', 'Files that failed to scan.', stats.get('errors', 0)),
+        ('ocelotl_peak_rss_bytes', 'Peak resident set size of the scan process.', metrics.get('peak_rss_bytes')),
+    ]
+    for name, help_text, value in gauges:
+        if value is None:
+            continue
+        family(name, 'gauge', help_text)
+        sample(name, value)
+    
+    family('ocelotl_cache_hit_ratio', 'gauge', 'Cache hit ratio by cache.')
+    for cache, rate in metrics.get('cache_hit_rates', {}).items():
+        sample('ocelotl_cache_hit_ratio', rate, {'cache': cache})
+    
+    family('ocelotl_files_skipped', 'gauge', 'Files not content-scanned, by reason.')
+    for reason, count in sorted(metrics.get('skipped', {}).items()):
+        sample('ocelotl_files_skipped', count, {'reason': reason})
+    
+    family('ocelotl_scan_last_run_timestamp_seconds', 'gauge', 'Unix time when the last scan finished.')
+    sample('ocelotl_scan_last_run_timestamp_seconds', round(time.time(), 3))
+    
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(output_file: str, metrics: Dict[str, Any], stats: Dict[str, Any]):
+    """
+    Escribe las métricas de forma atómica (renombrado), como requiere el
+    textfile collector de node_exporter
+    
+    Args:
+        output_file: Ruta del archivo .prom
+        metrics: Resultado de ScanMetrics.to_dict()
+        stats: Estadísticas del escaneo
+    """
+    target = Path(output_file)
+    fd, tmp_name = tempfile.mkstemp(dir=str(target.parent), prefix='.ocelotl-metrics-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(render_openmetrics(metrics, stats))
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
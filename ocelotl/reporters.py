@@ -1,21 +1,149 @@
 """
 Ocelotl v3.0 - Generadores de Reportes
-Sistema para generar reportes en JSON y HTML
+Sistema para generar reportes en JSON, HTML y SARIF
 """
 
 import json
-from datetime import datetime
+import zlib
+import base64
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List
-from .utils import Colors
+from typing import Dict, Any, List, Iterator, Optional
+from .utils import Colors, FileHelper
+from .fingerprints import finding_fingerprint, relative_path
+
+
+# Categorías mostradas en el reporte HTML, en orden
+HTML_CATEGORIES = [
+    ('admin_credentials', 'Admin Credentials'),
+    ('passwords', 'Passwords'),
+    ('api_keys', 'API Keys & Tokens'),
+    ('credentials', 'Database Credentials'),
+    ('private_keys', 'Private Keys'),
+    ('jwt_tokens', 'JWT Tokens'),
+    ('config_files', 'Config Patterns'),
+    ('sensitive_files', 'Sensitive Files')
+]
+
+CONFIDENCE_ORDER = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'VERY_LOW']
+
+
+# Categorías del reporte JSON, en orden
+JSON_CATEGORIES = [
+    'admin_credentials', 'passwords', 'credentials', 'api_keys',
+    'private_keys', 'jwt_tokens', 'config_files', 'sensitive_files'
+]
+
+# Categorías que se cuentan por nivel de confianza
+CONFIDENCE_CATEGORIES = ['admin_credentials', 'passwords', 'credentials', 'api_keys']
+
+
+def empty_statistics() -> Dict[str, Any]:
+    """Estadísticas de reporte vacías (ver record_statistics)"""
+    return {
+        'by_type': {category: 0 for category in JSON_CATEGORIES},
+        'by_confidence': {level: 0 for level in CONFIDENCE_ORDER},
+        'by_file': {},
+        'false_positives_filtered': 0,
+        'total_findings': 0
+    }
+
+
+def record_statistics(stats: Dict[str, Any], category: str, finding: Dict[str, Any], count: int = 1):
+    """
+    Suma (o resta, con count=-1) un hallazgo a unas estadísticas de reporte
+    
+    Args:
+        stats: Estadísticas creadas con empty_statistics()
+        category: Categoría de resultados
+        finding: Hallazgo
+        count: 1 al agregar el hallazgo, -1 al descartarlo
+    """
+    stats['by_type'][category] = stats['by_type'].get(category, 0) + count
+    stats['total_findings'] += count
+    
+    by_file = stats['by_file']
+    file_path = finding.get('file', '')
+    remaining = by_file.get(file_path, 0) + count
+    if remaining:
+        by_file[file_path] = remaining
+    else:
+        by_file.pop(file_path, None)
+    
+    if category in CONFIDENCE_CATEGORIES:
+        confidence = finding.get('validation', {}).get('confidence', 'VERY_LOW')
+        stats['by_confidence'][confidence] += count
+
+
+def count_statistics(stats: Dict[str, Any], category: str, items: List[Dict[str, Any]]):
+    """
+    Suma los hallazgos de una categoría a unas estadísticas de reporte.
+    Los falsos positivos no llegan a los resultados: su contador sale de
+    las estadísticas del scanner (ver report_statistics).
+    
+    Args:
+        stats: Estadísticas creadas con empty_statistics()
+        category: Categoría de resultados
+        items: Hallazgos de la categoría
+    """
+    stats['by_type'].setdefault(category, 0)
+    for item in items:
+        record_statistics(stats, category, item)
+    
+    
+def merge_statistics(total: Dict[str, Any], stats: Dict[str, Any]):
+    """
+    Acumula unas estadísticas de reporte en otras
+        
+    Args:
+        total: Estadísticas acumuladas (empty_statistics())
+        stats: Estadísticas a sumar
+    """
+    for key in ('by_type', 'by_confidence', 'by_file'):
+        counters = total[key]
+        for name, value in stats.get(key, {}).items():
+            counters[name] = counters.get(name, 0) + value
+    total['false_positives_filtered'] += stats.get('false_positives_filtered', 0)
+    total['total_findings'] += stats.get('total_findings', 0)
+
+
+def report_statistics(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Estadísticas de reporte de unos resultados: las que el scanner mantiene
+    de forma incremental o, si no están, recalculadas recorriendo los hallazgos
+    
+    Args:
+        results: Resultados de OcelotlScanner.scan()
+    
+    Returns:
+        Dict con by_type, by_confidence, by_file, false_positives_filtered y total_findings
+    """
+    statistics = results.get('statistics')
+    if statistics is not None:
+        return statistics
+    
+    statistics = empty_statistics()
+    for category in JSON_CATEGORIES:
+        count_statistics(statistics, category, results.get(category, []))
+    statistics['false_positives_filtered'] = results.get('stats', {}).get('false_positives_filtered', 0)
+    return statistics
+
+
+def _escape_script_json(text: str) -> str:
+    """Escapa JSON para incrustarlo de forma segura dentro de <script>"""
+    return text.replace('<', '\\u003c').replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
 
 
 class ReportGenerator:
     """Generador de reportes en múltiples formatos"""
     
+    # Filas de hallazgos por fragmento al escribir el HTML
+    HTML_ROWS_PER_CHUNK = 2000
+    
     def __init__(self, results: Dict[str, Any], colors: Colors):
         self.results = results
         self.colors = colors
+        self._statistics = None
     
     def generate_json_report(self, output_file: str) -> bool:
         """
@@ -38,17 +166,13 @@ class ReportGenerator:
                 },
                 'summary': self.results['stats'],
                 'findings': {
-                    'admin_credentials': self.results.get('admin_credentials', []),
-                    'passwords': self.results.get('passwords', []),
-                    'credentials': self.results.get('credentials', []),
-                    'api_keys': self.results.get('api_keys', []),
-                    'private_keys': self.results.get('private_keys', []),
-                    'jwt_tokens': self.results.get('jwt_tokens', []),
-                    'config_files': self.results.get('config_files', []),
-                    'sensitive_files': self.results.get('sensitive_files', [])
+                    category: self.results.get(category, [])
+                    for category in JSON_CATEGORIES
                 },
                 'statistics': self._generate_statistics()
             }
+            if 'metrics' in self.results:
+                report['metrics'] = self.results['metrics']
             
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump(report, f, indent=2, ensure_ascii=False)
@@ -58,21 +182,22 @@ class ReportGenerator:
             print(f"Error generating JSON report: {e}")
             return False
     
-    def generate_html_report(self, output_file: str = 'ocelotl_report.html') -> bool:
+    def generate_html_report(self, output_file: str = 'ocelotl_report.html', compress: bool = False) -> bool:
         """
-        Genera reporte en formato HTML interactivo
+        Genera reporte en formato HTML interactivo.
+        Se escribe por fragmentos para mantener acotado el uso de memoria.
         
         Args:
             output_file: Ruta del archivo de salida
+            compress: Comprimir los hallazgos incrustados (deflate + base64)
             
         Returns:
             bool: True si se generó exitosamente
         """
         try:
-            html_content = self._build_html()
-            
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+                for chunk in self._iter_html_chunks(compress):
+                    f.write(chunk)
             
             return True
         except Exception as e:
@@ -90,45 +215,31 @@ class ReportGenerator:
             return "Unknown"
     
     def _generate_statistics(self) -> Dict[str, Any]:
-        """Genera estadísticas del escaneo"""
-        stats = {
-            'by_type': {},
-            'by_confidence': {
-                'CRITICAL': 0,
-                'HIGH': 0,
-                'MEDIUM': 0,
-                'LOW': 0,
-                'VERY_LOW': 0
-            },
-            'false_positives_filtered': 0,
-            'total_findings': 0
-        }
-        
-        # Contar por tipo
-        for key in ['admin_credentials', 'passwords', 'credentials', 'api_keys', 
-                   'private_keys', 'jwt_tokens', 'config_files', 'sensitive_files']:
-            count = len(self.results.get(key, []))
-            stats['by_type'][key] = count
-            stats['total_findings'] += count
-        
-        # Contar por nivel de confianza
-        for key in ['admin_credentials', 'passwords', 'credentials', 'api_keys']:
-            for item in self.results.get(key, []):
-                validation = item.get('validation', {})
-                confidence = validation.get('confidence', 'VERY_LOW')
-                stats['by_confidence'][confidence] += 1
-                
-                if validation.get('is_likely_false_positive', False):
-                    stats['false_positives_filtered'] += 1
-        
-        return stats
+        """Estadísticas del escaneo (contadores del scanner en O(1), calculadas una sola vez si no los hay)"""
+        if self._statistics is None:
+            self._statistics = report_statistics(self.results)
+        return self._statistics
     
-    def _build_html(self) -> str:
-        """Construye el contenido HTML del reporte"""
+    def _build_html(self, compress: bool = False) -> str:
+        """Construye el contenido HTML del reporte completo en memoria"""
+        return ''.join(self._iter_html_chunks(compress))
+    
+    def _iter_html_chunks(self, compress: bool = False) -> Iterator[str]:
+        """
+        Genera el HTML del reporte por fragmentos, sin materializar el documento.
+        Los hallazgos se incrustan como filas JSON compactas que una tabla
+        virtualizada renderiza en el navegador.
+        
+        Args:
+            compress: Incrustar las filas comprimidas con deflate + base64
+            
+        Yields:
+            Fragmentos de HTML
+        """
         stats = self._generate_statistics()
         duration = self._calculate_duration()
         
-        html = f"""<!DOCTYPE html>
+        yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -220,58 +331,86 @@ class ReportGenerator:
             padding: 30px;
         }}
         
-        .finding-category {{
-            margin-bottom: 30px;
+        .toolbar {{
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
+            align-items: center;
+            margin-bottom: 15px;
+        }}
+        
+        .toolbar input, .toolbar select {{
+            padding: 8px 12px;
+            border: 1px solid #ced4da;
+            border-radius: 6px;
+            font-size: 0.95em;
+        }}
+        
+        .toolbar input {{
+            flex: 1;
+            min-width: 220px;
         }}
         
-        .category-header {{
+        .result-count {{
+            color: #6c757d;
+            font-size: 0.9em;
+        }}
+        
+        .findings-table {{
+            border: 1px solid #dee2e6;
+            border-radius: 8px;
+            overflow: hidden;
+        }}
+        
+        .table-row {{
+            display: grid;
+            grid-template-columns: 110px 170px minmax(200px, 2fr) minmax(150px, 2fr) minmax(150px, 3fr);
+            height: 30px;
+            line-height: 30px;
+            border-bottom: 1px solid #f1f3f5;
+            font-size: 0.85em;
+        }}
+        
+        .table-row > div {{
+            padding: 0 8px;
+            overflow: hidden;
+            white-space: nowrap;
+            text-overflow: ellipsis;
+        }}
+        
+        .table-head {{
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
-            padding: 15px 20px;
-            border-radius: 8px 8px 0 0;
-            font-size: 1.3em;
             font-weight: bold;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
+            cursor: pointer;
+            user-select: none;
         }}
         
-        .category-badge {{
-            background: rgba(255,255,255,0.2);
-            padding: 5px 15px;
-            border-radius: 20px;
-            font-size: 0.8em;
+        .table-viewport {{
+            height: 70vh;
+            overflow-y: auto;
+            position: relative;
         }}
         
-        .finding-item {{
-            background: #f8f9fa;
-            padding: 20px;
-            margin: 10px 0;
-            border-radius: 8px;
-            border-left: 4px solid #6c757d;
+        .table-spacer {{
+            position: relative;
         }}
         
-        .finding-item.critical {{ border-color: #dc3545; background: #fff5f5; }}
-        .finding-item.high {{ border-color: #fd7e14; background: #fff8f0; }}
-        .finding-item.medium {{ border-color: #ffc107; background: #fffbf0; }}
-        .finding-item.low {{ border-color: #17a2b8; background: #f0f9fc; }}
-        
-        .finding-header {{
-            display: flex;
-            justify-content: space-between;
-            margin-bottom: 10px;
-            align-items: center;
+        .table-rows {{
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            will-change: transform;
         }}
         
-        .finding-file {{
+        .mono {{
             font-family: 'Courier New', monospace;
-            color: #495057;
-            font-weight: bold;
         }}
         
         .confidence-badge {{
-            padding: 5px 12px;
-            border-radius: 15px;
+            padding: 2px 8px;
+            border-radius: 10px;
             font-size: 0.85em;
             font-weight: bold;
         }}
@@ -282,22 +421,6 @@ class ReportGenerator:
         .confidence-low {{ background: #17a2b8; color: white; }}
         .confidence-very-low {{ background: #6c757d; color: white; }}
         
-        .finding-details {{
-            font-family: 'Courier New', monospace;
-            background: white;
-            padding: 15px;
-            border-radius: 5px;
-            margin-top: 10px;
-            overflow-x: auto;
-            font-size: 0.9em;
-        }}
-        
-        .finding-context {{
-            color: #6c757d;
-            margin-top: 5px;
-            font-size: 0.9em;
-        }}
-        
         .footer {{
             background: #343a40;
             color: white;
@@ -312,13 +435,6 @@ class ReportGenerator:
             color: #6c757d;
         }}
         
-        .chart {{
-            margin: 20px 0;
-            padding: 20px;
-            background: white;
-            border-radius: 8px;
-        }}
-        
         @media print {{
             body {{
                 background: white;
@@ -370,7 +486,32 @@ class ReportGenerator:
         </div>
         
         <div class="findings-section">
-            {self._generate_findings_html()}
+            <div class="toolbar">
+                <input id="filter-text" type="search" placeholder="Filter by file, match or context...">
+                <select id="filter-category"><option value="">All categories</option></select>
+                <select id="filter-confidence">
+                    <option value="">Any confidence</option>
+                    <option value="0">CRITICAL</option>
+                    <option value="1">HIGH or above</option>
+                    <option value="2">MEDIUM or above</option>
+                    <option value="3">LOW or above</option>
+                </select>
+                <span id="result-count" class="result-count">Loading findings...</span>
+            </div>
+            <div class="findings-table">
+                <div class="table-row table-head" id="table-head">
+                    <div data-sort="confidence">Confidence</div>
+                    <div data-sort="category">Category</div>
+                    <div data-sort="file">File</div>
+                    <div data-sort="match">Match</div>
+                    <div data-sort="context">Context</div>
+                </div>
+                <div class="table-viewport" id="table-viewport">
+                    <div class="table-spacer" id="table-spacer">
+                        <div class="table-rows" id="table-rows"></div>
+                    </div>
+                </div>
+            </div>
         </div>
         
         <div class="footer">
@@ -380,80 +521,99 @@ class ReportGenerator:
             </p>
         </div>
     </div>
-</body>
-</html>"""
+"""
         
-        return html
+        yield from self._iter_html_data(compress)
+        yield f"<script>{_HTML_TABLE_SCRIPT}</script>\n</body>\n</html>"
     
-    def _generate_findings_html(self) -> str:
-        """Genera el HTML de los hallazgos"""
-        categories = {
-            'admin_credentials': ('Admin Credentials', '👤'),
-            'passwords': ('Passwords', '🔑'),
-            'api_keys': ('API Keys & Tokens', '🎫'),
-            'credentials': ('Database Credentials', '🗄️'),
-            'private_keys': ('Private Keys', '🔐'),
-            'jwt_tokens': ('JWT Tokens', '🎟️'),
-            'sensitive_files': ('Sensitive Files', '📄')
-        }
+    def _iter_html_rows(self) -> Iterator[str]:
+        """
+        Genera las filas de hallazgos serializadas: [categoría, confianza,
+        archivo, línea, match, contexto], con categorías, niveles y archivos
+        codificados como índices
         
-        html_parts = []
+        Yields:
+            Filas en JSON compacto
+        """
+        file_index: Dict[str, int] = {}
         
-        for category_key, (category_name, emoji) in categories.items():
-            findings = self.results.get(category_key, [])
-            
-            if not findings:
-                continue
-            
-            html_parts.append(f"""
-            <div class="finding-category">
-                <div class="category-header">
-                    <span>{emoji} {category_name}</span>
-                    <span class="category-badge">{len(findings)} found</span>
-                </div>
-            """)
-            
-            for finding in findings[:50]:  # Limitar a 50 por categoría
-                confidence = finding.get('validation', {}).get('confidence', 'VERY_LOW').lower().replace('_', '-')
-                confidence_display = finding.get('validation', {}).get('confidence', 'VERY_LOW')
-                
+        for category_index, (category_key, _) in enumerate(HTML_CATEGORIES):
+            for finding in self.results.get(category_key, []):
                 file_path = finding.get('file', 'Unknown')
-                line = finding.get('line', 0)
-                match = finding.get('match', '')
-                context = finding.get('context', '')
+                if file_path not in file_index:
+                    file_index[file_path] = len(file_index)
                 
-                # Sanitizar HTML
-                match = match.replace('<', '&lt;').replace('>', '&gt;')
-                context = context.replace('<', '&lt;').replace('>', '&gt;')
+                if category_key == 'sensitive_files':
+                    confidence = ''
+                    match = finding.get('size_formatted', '')
+                    context = f"Matched pattern: {finding.get('pattern_matched', '')}"
+                else:
+                    confidence = finding.get('validation', {}).get('confidence', 'VERY_LOW')
+                    match = finding.get('match', '')
+                    context = finding.get('context', '')
                 
-                html_parts.append(f"""
-                <div class="finding-item {confidence}">
-                    <div class="finding-header">
-                        <div class="finding-file">📁 {file_path}:{line}</div>
-                        <span class="confidence-badge confidence-{confidence}">{confidence_display}</span>
-                    </div>
-                    <div class="finding-details">
-                        {match[:200]}
-                    </div>
-                    <div class="finding-context">
-                        Context: {context[:300]}...
-                    </div>
-                </div>
-                """)
-            
-            if len(findings) > 50:
-                html_parts.append(f"""
-                <div class="no-findings">
-                    ... and {len(findings) - 50} more findings (check JSON report for complete list)
-                </div>
-                """)
-            
-            html_parts.append("</div>")
-        
-        if not html_parts:
-            return '<div class="no-findings"><h2>✅ No critical findings detected!</h2></div>'
+                row = [
+                    category_index,
+                    CONFIDENCE_ORDER.index(confidence) if confidence in CONFIDENCE_ORDER else len(CONFIDENCE_ORDER),
+                    file_index[file_path],
+                    finding.get('line', 0),
+                    match[:200],
+                    context[:300]
+                ]
+                yield json.dumps(row, ensure_ascii=False, separators=(',', ':'))
+        
+        self._html_files = list(file_index)
+    
+    def _iter_html_data(self, compress: bool) -> Iterator[str]:
+        """
+        Genera los bloques <script> de datos, escritos por lotes de filas
         
-        return ''.join(html_parts)
+        Args:
+            compress: Comprimir las filas con deflate + base64
+            
+        Yields:
+            Fragmentos de HTML
+        """
+        encoding = 'deflate-base64' if compress else 'json'
+        yield f'<script type="application/json" id="ocelotl-rows" data-encoding="{encoding}">'
+        
+        compressor = zlib.compressobj(6) if compress else None
+        pending = b''
+        
+        def encode(text: str) -> str:
+            nonlocal pending
+            if compressor is None:
+                return _escape_script_json(text)
+            pending += compressor.compress(text.encode('utf-8'))
+            usable = len(pending) - len(pending) % 3
+            block, pending = pending[:usable], pending[usable:]
+            return base64.b64encode(block).decode('ascii')
+        
+        batch = ['[']
+        first = True
+        for row in self._iter_html_rows():
+            batch.append(row if first else ',' + row)
+            first = False
+            if len(batch) >= self.HTML_ROWS_PER_CHUNK:
+                yield encode(''.join(batch))
+                batch = []
+        batch.append(']')
+        yield encode(''.join(batch))
+        
+        if compressor is not None:
+            pending += compressor.flush()
+            yield base64.b64encode(pending).decode('ascii')
+        
+        yield '</script>\n'
+        
+        meta = {
+            'categories': [label for _, label in HTML_CATEGORIES],
+            'confidences': CONFIDENCE_ORDER,
+            'files': self._html_files
+        }
+        yield '<script type="application/json" id="ocelotl-meta">'
+        yield _escape_script_json(json.dumps(meta, ensure_ascii=False, separators=(',', ':')))
+        yield '</script>\n'
     
     def print_summary(self):
         """Imprime resumen en consola"""
@@ -471,6 +631,20 @@ class ReportGenerator:
         print(f"{c.BLUE}[+] Total Matches:{c.RESET} {self.results['stats'].get('matches_found', 0)}")
         print(f"{c.BLUE}[+] Errors:{c.RESET} {self.results['stats'].get('errors', 0)}")
         
+        duplicate_files = self.results['stats'].get('duplicate_files', 0)
+        if duplicate_files:
+            saved = FileHelper.format_file_size(self.results['stats'].get('bytes_deduplicated', 0))
+            print(f"{c.BLUE}[+] Duplicate Files:{c.RESET} {duplicate_files} ({saved} not rescanned)")
+        
+        if 'known_leaked' in self.results['stats']:
+            print(f"{c.RED}[!] Known Leaked Secrets:{c.RESET} {self.results['stats']['known_leaked']}")
+        
+        if 'baseline_fixed' in self.results['stats']:
+            print(
+                f"{c.BLUE}[+] Baseline:{c.RESET} {self.results['stats'].get('baseline_suppressed', 0)} suppressed, "
+                f"{self.results['stats']['baseline_fixed']} fixed"
+            )
+        
         print(f"\n{c.YELLOW}{c.BOLD}FINDINGS BY CONFIDENCE:{c.RESET}")
         print(f"{c.RED}  [!] CRITICAL:{c.RESET} {stats['by_confidence']['CRITICAL']}")
         print(f"{c.MAGENTA}  [*] HIGH:{c.RESET}     {stats['by_confidence']['HIGH']}")
@@ -496,3 +670,296 @@ class ReportGenerator:
             print(f"{color_code}  {label}:{c.RESET} {count}")
         
         print(f"\n{c.CYAN}{'=' * 80}{c.RESET}\n")
+
+
+# Nivel SARIF según la confianza del hallazgo
+SARIF_LEVELS = {
+    'CRITICAL': 'error',
+    'HIGH': 'error',
+    'MEDIUM': 'warning',
+    'LOW': 'note',
+    'VERY_LOW': 'note'
+}
+
+
+class SarifWriter:
+    """
+    Escritor SARIF 2.1.0 incremental: cada hallazgo se serializa en cuanto
+    el scanner lo reporta, sin acumular el documento en memoria.
+    
+    Uso:
+        with SarifWriter('results.sarif', rules, base_path) as writer:
+            scanner.add_listener(writer.add_result)
+            scanner.scan()
+            writer.set_stats(scanner.results['stats'])
+    """
+    
+    SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+    
+    def __init__(self, output_file: str, rules: List[Dict[str, Any]], base_path: str = '.'):
+        """
+        Inicializa el escritor
+        
+        Args:
+            output_file: Ruta del archivo SARIF
+            rules: Metadatos de reglas (PatternManager.get_rule_metadata())
+            base_path: Ruta base del escaneo (raíz de las URIs relativas)
+        """
+        self.output_file = output_file
+        self.rules = rules
+        self.base_path = Path(base_path)
+        self.rule_index = {rule['id']: index for index, rule in enumerate(rules)}
+        self.results_written = 0
+        self.stats: Dict[str, Any] = {}
+        self.start_time_utc: Optional[str] = None
+        self._file = None
+    
+    def __enter__(self) -> 'SarifWriter':
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def open(self):
+        """Abre el archivo y escribe la cabecera con las reglas"""
+        driver = {
+            'name': 'Ocelotl',
+            'version': '3.0',
+            'informationUri': 'https://github.com/Kon3e/Ocelotl',
+            'rules': [
+                {
+                    'id': rule['id'],
+                    'shortDescription': {'text': rule['description']},
+                    'properties': {'patternCount': rule.get('pattern_count', 0)}
+                }
+                for rule in self.rules
+            ]
+        }
+        base_uri = self.base_path.resolve().as_uri()
+        if not base_uri.endswith('/'):
+            base_uri += '/'
+        
+        self.start_time_utc = _utc_timestamp()
+        self._file = open(self.output_file, 'w', encoding='utf-8')
+        self._file.write(f'{{"$schema":{json.dumps(self.SCHEMA)},"version":"2.1.0","runs":[{{')
+        self._file.write(f'"tool":{{"driver":{json.dumps(driver, ensure_ascii=False)}}},')
+        self._file.write(f'"originalUriBaseIds":{{"SRCROOT":{{"uri":{json.dumps(base_uri)}}}}},')
+        self._file.write('"results":[')
+    
+    def add_result(self, category: str, finding: Dict[str, Any]):
+        """
+        Escribe un hallazgo como resultado SARIF (compatible con add_listener)
+        
+        Args:
+            category: Categoría de resultados del hallazgo
+            finding: Hallazgo reportado por el scanner
+        """
+        if self._file is None:
+            return
+        
+        rule_id = finding.get('type', category)
+        confidence = finding.get('validation', {}).get('confidence')
+        uri = relative_path(finding.get('file', ''), self.base_path)
+        
+        location = {'artifactLocation': {'uri': uri, 'uriBaseId': 'SRCROOT'}}
+        if finding.get('line'):
+            location['region'] = {'startLine': finding['line']}
+        
+        result = {
+            'ruleId': rule_id,
+            'level': SARIF_LEVELS.get(confidence, 'warning'),
+            'message': {'text': self._message(rule_id, finding, confidence)},
+            'locations': [{'physicalLocation': location}],
+            'partialFingerprints': {
+                'ocelotlFingerprint/v1': finding_fingerprint(finding, self.base_path)
+            }
+        }
+        if rule_id in self.rule_index:
+            result['ruleIndex'] = self.rule_index[rule_id]
+        if confidence:
+            result['properties'] = {'confidence': confidence}
+        
+        if self.results_written:
+            self._file.write(',')
+        self._file.write(json.dumps(result, ensure_ascii=False, separators=(',', ':')))
+        self.results_written += 1
+    
+    def _message(self, rule_id: str, finding: Dict[str, Any], confidence: str) -> str:
+        """Texto del resultado; nunca incluye el valor secreto"""
+        description = self.rules[self.rule_index[rule_id]]['description'] if rule_id in self.rule_index else rule_id
+        if rule_id == 'sensitive_file':
+            return f"{description}: {Path(finding.get('file', '')).name}"
+        return f"{description} ({confidence or 'UNKNOWN'} confidence)"
+    
+    def set_stats(self, stats: Dict[str, Any]):
+        """Estadísticas del escaneo a incluir en la invocación"""
+        self.stats = stats
+    
+    def close(self):
+        """Escribe el pie con la invocación y cierra el archivo"""
+        if self._file is None:
+            return
+        
+        invocation = {
+            'executionSuccessful': True,
+            'properties': {
+                key: value for key, value in self.stats.items()
+                if isinstance(value, (int, float, str))
+            }
+        }
+        # stats['start_time'] es hora local sin zona: SARIF exige date-time UTC
+        invocation['startTimeUtc'] = self.start_time_utc
+        invocation['endTimeUtc'] = _utc_timestamp()
+        
+        self._file.write('],"invocations":[')
+        self._file.write(json.dumps(invocation, ensure_ascii=False, default=str))
+        self._file.write(']}]}\n')
+        self._file.close()
+        self._file = None
+
+
+def _utc_timestamp() -> str:
+    """Fecha y hora actual en UTC con formato date-time de SARIF ('...Z')"""
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+# Tabla virtualizada: solo se crean en el DOM las filas visibles
+_HTML_TABLE_SCRIPT = r"""
+(function () {
+    var ROW_HEIGHT = 30;
+    var OVERSCAN = 20;
+    var SORT_COLUMNS = {confidence: 1, category: 0, file: 2, match: 4, context: 5};
+    var rows = [], meta = null, view = [];
+    var sortKey = null, sortDir = 1;
+
+    var viewport = document.getElementById('table-viewport');
+    var spacer = document.getElementById('table-spacer');
+    var body = document.getElementById('table-rows');
+    var counter = document.getElementById('result-count');
+    var textFilter = document.getElementById('filter-text');
+    var categoryFilter = document.getElementById('filter-category');
+    var confidenceFilter = document.getElementById('filter-confidence');
+
+    function escapeHtml(value) {
+        return String(value).replace(/[&<>"']/g, function (c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+        });
+    }
+
+    async function loadRows() {
+        var element = document.getElementById('ocelotl-rows');
+        var text = element.textContent;
+        if (element.dataset.encoding === 'deflate-base64') {
+            var binary = atob(text.replace(/\s+/g, ''));
+            var bytes = new Uint8Array(binary.length);
+            for (var i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'));
+            text = await new Response(stream).text();
+        }
+        return JSON.parse(text);
+    }
+
+    function fileLabel(row) {
+        return meta.files[row[2]] + (row[3] ? ':' + row[3] : '');
+    }
+
+    function sortValue(row, key) {
+        if (key === 'file') {
+            return meta.files[row[2]];
+        }
+        return row[SORT_COLUMNS[key]];
+    }
+
+    function applyFilters() {
+        var query = textFilter.value.toLowerCase();
+        var category = categoryFilter.value === '' ? -1 : Number(categoryFilter.value);
+        var maxConfidence = confidenceFilter.value === '' ? Infinity : Number(confidenceFilter.value);
+        var result = [];
+
+        for (var i = 0; i < rows.length; i++) {
+            var row = rows[i];
+            if (category !== -1 && row[0] !== category) continue;
+            if (row[1] > maxConfidence) continue;
+            if (query && (meta.files[row[2]] + '\n' + row[4] + '\n' + row[5]).toLowerCase().indexOf(query) === -1) continue;
+            result.push(i);
+        }
+
+        if (sortKey) {
+            result.sort(function (a, b) {
+                var x = sortValue(rows[a], sortKey), y = sortValue(rows[b], sortKey);
+                if (x < y) return -sortDir;
+                if (x > y) return sortDir;
+                return sortKey === 'file' ? (rows[a][3] - rows[b][3]) * sortDir : a - b;
+            });
+        }
+
+        view = result;
+        spacer.style.height = (view.length * ROW_HEIGHT) + 'px';
+        counter.textContent = 'Showing ' + view.length.toLocaleString() + ' of ' + rows.length.toLocaleString() + ' findings';
+        render();
+    }
+
+    function render() {
+        var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+        var last = Math.min(view.length, first + Math.ceil(viewport.clientHeight / ROW_HEIGHT) + 2 * OVERSCAN);
+        var html = [];
+
+        for (var i = first; i < last; i++) {
+            var row = rows[view[i]];
+            var confidence = meta.confidences[row[1]] || '';
+            var badge = confidence
+                ? '<span class="confidence-badge confidence-' + confidence.toLowerCase().replace('_', '-') + '">' + confidence + '</span>'
+                : '';
+            var location = escapeHtml(fileLabel(row));
+            html.push(
+                '<div class="table-row">' +
+                '<div>' + badge + '</div>' +
+                '<div>' + escapeHtml(meta.categories[row[0]]) + '</div>' +
+                '<div class="mono" title="' + location + '">' + location + '</div>' +
+                '<div class="mono" title="' + escapeHtml(row[4]) + '">' + escapeHtml(row[4]) + '</div>' +
+                '<div title="' + escapeHtml(row[5]) + '">' + escapeHtml(row[5]) + '</div>' +
+                '</div>'
+            );
+        }
+
+        body.style.transform = 'translateY(' + (first * ROW_HEIGHT) + 'px)';
+        body.innerHTML = html.join('');
+    }
+
+    var pending = null;
+    function scheduleFilters() {
+        clearTimeout(pending);
+        pending = setTimeout(applyFilters, 150);
+    }
+
+    document.getElementById('table-head').addEventListener('click', function (event) {
+        var key = event.target.getAttribute('data-sort');
+        if (!key) return;
+        sortDir = sortKey === key ? -sortDir : 1;
+        sortKey = key;
+        applyFilters();
+    });
+    viewport.addEventListener('scroll', function () { window.requestAnimationFrame(render); });
+    textFilter.addEventListener('input', scheduleFilters);
+    categoryFilter.addEventListener('change', applyFilters);
+    confidenceFilter.addEventListener('change', applyFilters);
+
+    meta = JSON.parse(document.getElementById('ocelotl-meta').textContent);
+    meta.categories.forEach(function (label, index) {
+        var option = document.createElement('option');
+        option.value = index;
+        option.textContent = label;
+        categoryFilter.appendChild(option);
+    });
+
+    loadRows().then(function (loaded) {
+        rows = loaded;
+        applyFilters();
+    }).catch(function (error) {
+        counter.textContent = 'Could not load findings: ' + error;
+    });
+})();
+"""
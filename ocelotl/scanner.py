@@ -3,14 +3,69 @@ Ocelotl v3.0 - Scanner Principal
 Motor de escaneo optimizado con detección inteligente de secretos
 """
 
+import os
 import re
+import sqlite3
+import bisect
+import hashlib
+import io
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, BinaryIO, Iterable, Iterator, Optional, Tuple, Callable, Union
 
+from .baseline import Baseline
+from .cache import FileResultCache
+from .checkpoint import Checkpoint
+from .comments import detect_language, file_comment_spans
+from .compressed import (
+    DECOMPRESSION_ERRORS, MAX_DECOMPRESSION_RATIO, DecompressionLimitError,
+    compressed_format, inner_name, iter_decompressed_lines
+)
+from .databases import (
+    DEFAULT_MAX_BYTES, DEFAULT_MAX_ROWS, SQLITE_EXTENSIONS, DatabaseCell, SqliteReader, is_sqlite_database
+)
+from .entropy import EntropyDetector
+from .findings import Finding
+from .fingerprints import extract_secret
+from .known_secrets import KnownSecrets
+from .metrics import ScanMetrics
+from .scheduling import ChunkedFile, ScanTask, TaskLatencies, plan_tasks
+from .sharding import shard_of
+from .structured import SUPERSEDED_CATEGORIES, find_sensitive_entries, is_candidate_value, structured_format
 from .patterns import PatternManager
+from .reporters import count_statistics, empty_statistics, record_statistics
 from .validators import SecretValidator, CredentialStrengthAnalyzer
-from .utils import Logger, Spinner, FileHelper
+from .utils import Logger, Progress, FileHelper
+
+
+# Categorías de resultados que contienen hallazgos
+FINDING_CATEGORIES = [
+    'admin_credentials', 'passwords', 'credentials', 'api_keys',
+    'private_keys', 'jwt_tokens', 'config_files', 'sensitive_files'
+]
+
+
+def result_category(match_type: str) -> str:
+    """
+    Obtiene la categoría de resultados en la que se guarda un tipo de match
+    
+    Args:
+        match_type: Categoría de patrón del match
+        
+    Returns:
+        str: Clave de la lista de resultados
+    """
+    if match_type == 'db_credentials':
+        return 'credentials'
+    if match_type == 'high_entropy':
+        return 'api_keys'
+    if match_type in FINDING_CATEGORIES:
+        return match_type
+    return 'config_files'
 
 
 class OcelotlScanner:
@@ -19,6 +74,15 @@ class OcelotlScanner:
     # Tamaño máximo para lectura completa en memoria (10MB)
     MAX_FILE_SIZE_FULL_READ = 10 * 1024 * 1024
     
+    # Con varios workers, los archivos mayores se dividen en tramos de este tamaño
+    PARALLEL_CHUNK_SIZE = MAX_FILE_SIZE_FULL_READ
+    
+    # Tamaño de bloque para el hash de contenido
+    HASH_BLOCK_SIZE = 1024 * 1024
+    
+    # Caracteres del inicio del archivo que se examinan para detectar el shebang
+    SHEBANG_PEEK = 128
+    
     def __init__(
         self,
         base_path: str,
@@ -26,7 +90,27 @@ class OcelotlScanner:
         use_colors: bool = True,
         exclude_dirs: Optional[set] = None,
         exclude_extensions: Optional[set] = None,
-        min_confidence: str = 'LOW'
+        min_confidence: str = 'LOW',
+        deduplicate: bool = True,
+        silent: bool = False,
+        pattern_manager: Optional[PatternManager] = None,
+        validator: Optional[SecretValidator] = None,
+        file_cache: Optional[FileResultCache] = None,
+        cancel_event: Optional[threading.Event] = None,
+        baseline: Optional[Baseline] = None,
+        shard: Optional[Tuple[int, int]] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        prioritize: bool = False,
+        fail_fast: Optional[str] = None,
+        time_budget: Optional[float] = None,
+        entropy: bool = False,
+        known_secrets: Optional[KnownSecrets] = None,
+        workers: int = 1,
+        decompress: bool = True,
+        max_decompression_ratio: int = MAX_DECOMPRESSION_RATIO,
+        scan_databases: bool = True,
+        max_database_rows: int = DEFAULT_MAX_ROWS,
+        max_database_bytes: int = DEFAULT_MAX_BYTES
     ):
         """
         Inicializa el scanner
@@ -38,17 +122,57 @@ class OcelotlScanner:
             exclude_dirs: Directorios a excluir
             exclude_extensions: Extensiones a excluir
             min_confidence: Nivel mínimo de confianza para reportar
+            deduplicate: Analizar una sola vez los archivos con contenido idéntico
+            silent: No escribir nada en la consola
+            pattern_manager: PatternManager ya compilado a reutilizar
+            validator: SecretValidator (y sus cachés) a reutilizar
+            file_cache: Caché de resultados por archivo compartida entre escaneos
+            cancel_event: Evento que, al activarse, detiene el escaneo
+            baseline: Hallazgos ya triados que no se reportan
+            shard: (i, N) para escanear solo el i-ésimo de N shards deterministas
+            checkpoint: Checkpoint donde guardar el progreso (y desde el que reanudar)
+            prioritize: Escanear primero los archivos de mayor riesgo
+            fail_fast: Detener el escaneo en el primer hallazgo con esta confianza o mayor
+            time_budget: Segundos máximos de escaneo (los resultados quedan parciales)
+            entropy: Detectar también cadenas genéricas de alta entropía
+            known_secrets: Corpus de secretos filtrados conocidos (se escalan a CRITICAL)
+            workers: Hilos que escanean contenido (más de uno: planificación por tamaño)
+            decompress: Escanear el contenido de archivos .gz, .bz2 y .xz
+            max_decompression_ratio: Ratio descomprimido/comprimido a partir del
+                cual se deja de descomprimir un archivo
+            scan_databases: Escanear el contenido de bases de datos SQLite
+            max_database_rows: Filas máximas leídas de cada base de datos
+            max_database_bytes: Caracteres máximos leídos de cada base de datos
         """
         self.base_path = Path(base_path)
         self.verbose = verbose
         self.min_confidence = min_confidence
+        self.deduplicate = deduplicate
+        self.silent = silent
+        self.file_cache = file_cache
+        self.cancel_event = cancel_event
+        self.baseline = baseline
+        self.known_secrets = known_secrets
+        self.shard = shard
+        self.checkpoint = checkpoint
+        self.prioritize = prioritize
+        self.fail_fast = fail_fast
+        self.time_budget = time_budget
+        self.workers = max(1, workers)
+        self.decompress = decompress
+        self.max_decompression_ratio = max_decompression_ratio
+        self.scan_databases = scan_databases
+        self.max_database_rows = max_database_rows
+        self.max_database_bytes = max_database_bytes
+        self._deadline: Optional[float] = None
+        self._stop_reason: Optional[str] = None
         
         # Inicializar componentes
         from .utils import Colors
         self.colors = Colors(use_colors)
-        self.logger = Logger(verbose, self.colors)
-        self.pattern_manager = PatternManager()
-        self.validator = SecretValidator()
+        self.logger = Logger(verbose, self.colors, silent=silent)
+        self.pattern_manager = pattern_manager or PatternManager()
+        self.validator = validator or SecretValidator()
         self.strength_analyzer = CredentialStrengthAnalyzer()
         
         # Configurar exclusiones
@@ -64,6 +188,30 @@ class OcelotlScanner:
         self.target_extensions = self.pattern_manager.get_target_extensions()
         self.compiled_patterns = self.pattern_manager.get_compiled_patterns()
         self.sensitive_file_patterns = self.pattern_manager.get_sensitive_file_patterns()
+        self.category_priority = self.pattern_manager.get_category_priority()
+        
+        # Detector genérico de entropía (se aplica como un patrón más) y
+        # patrones por tipo de archivo con el detector ya incluido
+        self.entropy_detector = EntropyDetector() if entropy else None
+        self._routes: Dict[Tuple[str, bool], Dict[str, List[Any]]] = {}
+        
+        # Protege resultados, estadísticas e índices cuando varios hilos
+        # escanean archivos de este scanner (modo batch)
+        self._lock = threading.RLock()
+        
+        # Tiempos por etapa y contadores de rendimiento
+        self.metrics = ScanMetrics()
+        
+        # Progreso de la fase de contenido (contadores de archivos y bytes)
+        self._progress: Optional[Progress] = None
+        
+        # Consumidores notificados con cada hallazgo reportado
+        self.listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        
+        # Índice de contenido: tamaño -> hash -> matches validados
+        self._content_index: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+        # Primer archivo de cada tamaño (se hashea solo si aparece otro igual)
+        self._pending_by_size: Dict[int, Optional[Tuple[Path, List[Dict[str, Any]]]]] = {}
         
         # Resultados
         self.results = {
@@ -80,9 +228,37 @@ class OcelotlScanner:
                 'matches_found': 0,
                 'false_positives_filtered': 0,
                 'start_time': datetime.now().isoformat(),
-                'errors': 0
-            }
+                'errors': 0,
+                'duplicate_files': 0,
+                'bytes_deduplicated': 0,
+                'overlapping_matches_merged': 0,
+                'file_cache_hits': 0,
+                'baseline_suppressed': 0
+            },
+            # Contadores de reporte por tipo, confianza y archivo, mantenidos
+            # en _process_match para que los reportes los lean en O(1)
+            'statistics': empty_statistics()
         }
+        if shard is not None:
+            self.results['stats']['shard'] = f"{shard[0]}/{shard[1]}"
+        if known_secrets is not None:
+            self.results['stats']['known_leaked'] = 0
+        if decompress:
+            self.results['stats']['compressed_files'] = 0
+            self.results['stats']['decompression_limited'] = 0
+        if scan_databases:
+            self.results['stats']['databases_scanned'] = 0
+            self.results['stats']['databases_limited'] = 0
+    
+        # Reanudar: partir de los hallazgos y estadísticas guardados
+        if checkpoint is not None and checkpoint.results is not None:
+            for category in FINDING_CATEGORIES:
+                self.results[category] = checkpoint.results.get(category, [])
+            self.results['stats'].update(checkpoint.results.get('stats', {}))
+            statistics = self.results['statistics']
+            for category in FINDING_CATEGORIES:
+                count_statistics(statistics, category, self.results[category])
+            statistics['false_positives_filtered'] = self.results['stats']['false_positives_filtered']
     
     def scan(self) -> Dict[str, Any]:
         """
@@ -94,132 +270,956 @@ class OcelotlScanner:
         self.logger.info(f"Starting scan on: {self.base_path}")
         self.logger.info(f"Excluding directories: {', '.join(list(self.exclude_dirs)[:5])}...")
         
+        if self.time_budget is not None:
+            self._deadline = time.monotonic() + self.time_budget
+        
+        checkpoint = self.checkpoint
+        if checkpoint is not None and checkpoint.results is not None:
+            self._resume_from_checkpoint()
+        
         # Buscar archivos sensibles por nombre
-        self._scan_sensitive_files()
+        if checkpoint is None or checkpoint.phase == 'sensitive':
+            self._scan_sensitive_files()
+            if checkpoint is not None and not self._is_cancelled():
+                checkpoint.start_phase('contents')
+                checkpoint.save(self.results)
         
         # Escanear contenido de archivos
         self._scan_file_contents()
         
+        # Un escaneo cancelado deja el checkpoint para reanudarlo; uno completo lo borra
+        if checkpoint is not None:
+            if self._is_cancelled():
+                checkpoint.save(self.results)
+                self.logger.info(f"Checkpoint saved to: {checkpoint.checkpoint_file}")
+            else:
+                checkpoint.remove()
+        
         # Finalizar
-        self.results['stats']['end_time'] = datetime.now().isoformat()
+        self.finalize()
         self.logger.success("Scan completed!")
+        self.logger.flush()
+        
+        return self.results
+    
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Cierra las estadísticas del escaneo (hora de fin, cachés, baseline)
         
+        Returns:
+            Dict con resultados del escaneo
+        """
+        self.results['stats']['end_time'] = datetime.now().isoformat()
+        self.results['stats']['validation_cache'] = self.validator.get_cache_stats()
+        if self.baseline is not None:
+            self.results['stats']['baseline_fixed'] = self.baseline.fixed_count()
+        self.results['metrics'] = self.metrics.to_dict(self.results['stats'])
         return self.results
     
+    def iter_findings(self, cancel_event: Optional[threading.Event] = None) -> Iterator[Finding]:
+        """
+        API de librería: recorre el árbol y entrega cada hallazgo en cuanto su
+        archivo se valida. No escribe en la consola ni modifica los resultados,
+        las estadísticas, las métricas ni el baseline (lee con _read_matches),
+        así que el mismo scanner puede usarse en varias llamadas y desde varios
+        hilos a la vez.
+        
+        Args:
+            cancel_event: Evento que detiene el recorrido (se comprueba por archivo);
+                cerrar el generador también lo detiene
+        
+        Yields:
+            Finding por cada archivo sensible y cada match reportable
+        """
+        for file_path in self._walk_files():
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            
+            # Mismas exclusiones que _scan_sensitive_files y _skip_reason
+            if FileHelper.should_skip_path(file_path, self.exclude_dirs):
+                continue
+            
+            try:
+                pattern = self._match_sensitive_name(file_path.name)
+                if pattern is not None:
+                    file_info = self._sensitive_file_info(str(file_path), file_path.stat().st_size, pattern)
+                    if self.baseline is None or file_info not in self.baseline:
+                        yield Finding.from_result('sensitive_files', file_info)
+                
+                if self._skip_reason(file_path) is not None:
+                    continue
+                matches = self._read_matches(file_path, file_path.stat().st_size)
+            except (OSError, sqlite3.Error):
+                continue
+            
+            yield from self._iter_reportable(matches)
+    
+    def scan_bytes(
+        self,
+        name: str,
+        data: Union[bytes, str],
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[Finding]:
+        """
+        API de librería: analiza un contenido en memoria (blob, adjunto,
+        respuesta HTTP) como si fuera un archivo con ese nombre, sin efectos
+        secundarios (ver iter_findings)
+        
+        Args:
+            name: Nombre del contenido (decide el enrutado de patrones)
+            data: Contenido en bytes (UTF-8, o comprimido si el nombre termina en
+                .gz, .bz2 o .xz) o texto
+            cancel_event: Evento que, si ya está activo, evita el análisis
+        
+        Yields:
+            Finding por cada match reportable (y si el nombre es sensible)
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        
+        pattern = self._match_sensitive_name(Path(name).name)
+        if pattern is not None:
+            file_info = self._sensitive_file_info(name, len(data), pattern)
+            if self.baseline is None or file_info not in self.baseline:
+                yield Finding.from_result('sensitive_files', file_info)
+        
+        if isinstance(data, bytes) and self.decompress and compressed_format(Path(name).name):
+            matches = self._match_compressed(io.BytesIO(data), name, len(data))[0]
+            yield from self._iter_reportable(matches)
+            return
+        
+        if isinstance(data, bytes):
+            # Mismo criterio que FileHelper.is_binary
+            if b'\0' in data[:8192]:
+                return
+            data = data.decode('utf-8', errors='ignore')
+        
+        yield from self._iter_reportable(self._match_file_content(data, name))
+    
+    def _read_matches(self, file_path: Path, file_size: int) -> List[Dict[str, Any]]:
+        """
+        Núcleo de lectura de iter_findings: matches de un archivo según su
+        formato y tamaño, sin logs ni métricas
+        
+        Args:
+            file_path: Ruta al archivo
+            file_size: Tamaño del archivo en bytes
+        
+        Returns:
+            Lista de matches encontrados
+        
+        Raises:
+            OSError: Si el archivo no se puede leer
+            sqlite3.Error: Si una base de datos está dañada o no se puede leer
+        """
+        if self._is_compressed(file_path):
+            with open(file_path, 'rb') as f:
+                return self._match_compressed(f, str(file_path), file_size)[0]
+        if self._is_database(file_path):
+            return self._match_database(file_path)[0]
+        if file_size > self.MAX_FILE_SIZE_FULL_READ:
+            return self._scan_byte_range(file_path)[0]
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return self._match_file_content(f.read(), str(file_path))
+    
+    def _iter_reportable(self, matches: List[Dict[str, Any]]) -> Iterator[Finding]:
+        """
+        Colapsa, valida y filtra los matches de un archivo sin registrarlos
+        
+        Args:
+            matches: Matches del archivo
+        
+        Yields:
+            Finding por cada match que se reportaría
+        """
+        for match_data in self._collapse_overlaps(matches):
+            self._validate(match_data)
+            if self._evaluate_match(match_data) is not None:
+                continue
+            if self.baseline is not None and match_data in self.baseline:
+                continue
+            yield Finding.from_result(result_category(match_data['type']), match_data)
+    
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """
+        Registra un consumidor que recibe cada hallazgo en cuanto se reporta
+        
+        Args:
+            listener: Función llamada con (categoría de resultados, hallazgo)
+        """
+        self.listeners.append(listener)
+    
+    def _notify_listeners(self, category: str, finding: Dict[str, Any]):
+        """Entrega un hallazgo reportado a los consumidores registrados"""
+        for listener in self.listeners:
+            listener(category, finding)
+    
+    def _walk_files(self, on_dir_done: Optional[Callable[[str], None]] = None):
+        """
+        Recorre los archivos bajo la ruta base (o la propia ruta si es un archivo)
+        en orden determinista: entradas ordenadas por nombre, en profundidad
+        
+        Args:
+            on_dir_done: Función llamada con la ruta relativa de cada directorio
+                cuyo contenido ya se entregó y procesó
+        
+        Yields:
+            Path de cada archivo encontrado
+        """
+        if self.base_path.is_file():
+            if self.shard is None or self.shard[0] == 1:
+                yield self.base_path
+            return
+        
+        yield from self._walk_directory(self.base_path, '', on_dir_done)
+    
+    def _walk_directory(self, directory: Path, rel_dir: str, on_dir_done: Optional[Callable[[str], None]]):
+        """
+        Recorre un directorio de forma recursiva, sin seguir enlaces simbólicos
+        a directorios ni entrar en los excluidos o ya terminados según el checkpoint
+        
+        Args:
+            directory: Directorio a recorrer
+            rel_dir: Su ruta relativa (POSIX) a la ruta base
+            on_dir_done: Ver _walk_files
+        
+        Yields:
+            Path de cada archivo encontrado
+        """
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            entries = []
+        
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if self.checkpoint is not None and self.checkpoint.is_done(rel_path):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.exclude_dirs:
+                        yield from self._walk_directory(Path(entry.path), rel_path, on_dir_done)
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if self.shard is not None and shard_of(rel_path, self.shard[1]) != self.shard[0]:
+                continue
+            yield Path(entry.path)
+        
+        if on_dir_done is not None:
+            on_dir_done(rel_dir)
+    
+    def _resume_from_checkpoint(self):
+        """Entrega a los consumidores los hallazgos restaurados del checkpoint"""
+        checkpoint = self.checkpoint
+        restored = sum(len(self.results[category]) for category in FINDING_CATEGORIES)
+        self.logger.info(
+            f"Resuming scan from checkpoint saved at {checkpoint.saved_at} "
+            f"({self.results['stats']['files_scanned']} files scanned, {restored} findings)"
+        )
+        for category in FINDING_CATEGORIES:
+            for finding in self.results[category]:
+                self._notify_listeners(category, finding)
+        checkpoint.results = None
+    
+    def _checkpoint_file(self, file_path: Path):
+        """Registra un archivo procesado y guarda el checkpoint si toca"""
+        if self.checkpoint is None:
+            return
+        self.checkpoint.mark_done(file_path.relative_to(self.base_path).as_posix())
+        self.checkpoint.maybe_save(self.results)
+    
+    def _checkpoint_dir_done(self) -> Optional[Callable[[str], None]]:
+        """Función para _walk_files que marca directorios terminados (si hay checkpoint)"""
+        return self.checkpoint.complete_dir if self.checkpoint is not None else None
+    
+    def _is_cancelled(self) -> bool:
+        """Indica si se solicitó detener el escaneo (evento, --fail-fast o presupuesto de tiempo)"""
+        if self._stop_reason is not None:
+            return True
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            self._stop('time_budget')
+            return True
+        return self.cancel_event is not None and self.cancel_event.is_set()
+    
+    def _stop(self, reason: str):
+        """
+        Detiene el escaneo antes de recorrer todos los archivos
+        
+        Args:
+            reason: 'fail_fast' o 'time_budget' (se guarda en stats['stopped_early'])
+        """
+        if self._stop_reason is None:
+            self._stop_reason = reason
+            self.results['stats']['stopped_early'] = reason
+            self.logger.warning(f"Stopping scan early ({reason.replace('_', ' ')})")
+    
+    def _schedule_files(self) -> List[Path]:
+        """
+        Ordena los archivos por riesgo (nombres sensibles, configuración, código,
+        documentación), conservando el orden del recorrido dentro de cada nivel
+        
+        Returns:
+            Lista de rutas en orden de escaneo
+        """
+        risk_rank = self.pattern_manager.get_risk_rank
+        return sorted(self._walk_files(), key=lambda file_path: risk_rank(file_path.name))
+    
     def _scan_sensitive_files(self):
         """Busca archivos sensibles por nombre"""
         self.logger.info("Scanning for sensitive files by name...")
-        spinner = Spinner("Searching sensitive files", self.colors)
-        spinner.start()
+        progress = self.logger.start_progress("Searching sensitive files")
         
         sensitive_count = 0
         
         try:
-            for file_path in self.base_path.rglob('*'):
-                if not file_path.is_file():
-                    continue
+            for file_path in self._walk_files(self._checkpoint_dir_done()):
+                if self._is_cancelled():
+                    break
                 
                 # Verificar exclusiones
-                if FileHelper.should_skip_path(file_path, self.exclude_dirs):
-                    continue
-                
-                filename = file_path.name.lower()
-                
-                # Verificar patrones de archivos sensibles
-                for pattern in self.sensitive_file_patterns:
-                    if re.match(pattern, filename, re.IGNORECASE):
-                        file_info = {
-                            'type': 'sensitive_file',
-                            'file': str(file_path),
-                            'size': file_path.stat().st_size,
-                            'size_formatted': FileHelper.format_file_size(file_path.stat().st_size),
-                            'pattern_matched': pattern
-                        }
-                        self.results['sensitive_files'].append(file_info)
+                if not FileHelper.should_skip_path(file_path, self.exclude_dirs):
+                    progress.advance()
+                    if self._check_sensitive_file(file_path):
                         sensitive_count += 1
-                        
-                        if self.verbose:
-                            self.logger.warning(f"Sensitive file: {file_path.name}")
-                        
-                        break
+                
+                self._checkpoint_file(file_path)
         finally:
-            spinner.stop()
+            self.logger.stop_progress()
         
         self.logger.success(f"Found {sensitive_count} sensitive files")
     
+    def _check_sensitive_file(self, file_path: Path) -> bool:
+        """
+        Registra un archivo si su nombre coincide con un patrón sensible
+        
+        Args:
+            file_path: Ruta al archivo
+            
+        Returns:
+            bool: True si el archivo es sensible y se reportó
+        """
+        pattern = self._match_sensitive_name(file_path.name)
+        if pattern is None:
+            return False
+        
+        file_info = self._sensitive_file_info(str(file_path), file_path.stat().st_size, pattern)
+        if self._in_baseline(file_info):
+            return False
+        with self._lock:
+            self.results['sensitive_files'].append(file_info)
+            record_statistics(self.results['statistics'], 'sensitive_files', file_info)
+        self._notify_listeners('sensitive_files', file_info)
+        
+        if self.verbose:
+            self.logger.warning(f"Sensitive file: {file_path.name}")
+        
+        return True
+    
+    def _match_sensitive_name(self, filename: str) -> Optional[str]:
+        """
+        Busca el patrón de archivo sensible que coincide con un nombre
+        
+        Args:
+            filename: Nombre del archivo
+        
+        Returns:
+            El patrón que coincide o None
+        """
+        filename = filename.lower()
+        for pattern in self.sensitive_file_patterns:
+            if re.match(pattern, filename, re.IGNORECASE):
+                return pattern
+        return None
+    
+    @staticmethod
+    def _sensitive_file_info(file_label: str, file_size: int, pattern: str) -> Dict[str, Any]:
+        """Hallazgo de un archivo sensible por nombre"""
+        return {
+            'type': 'sensitive_file',
+            'file': file_label,
+            'size': file_size,
+            'size_formatted': FileHelper.format_file_size(file_size),
+            'pattern_matched': pattern
+        }
+    
     def _scan_file_contents(self):
         """Escanea el contenido de los archivos"""
         self.logger.info("Scanning file contents for secrets...")
         
-        # Contar archivos totales
-        total_files = sum(
-            1 for f in self.base_path.rglob('*')
-            if f.is_file() 
-            and f.suffix.lower() in self.target_extensions
-            and not FileHelper.should_skip_path(f, self.exclude_dirs)
-        )
+        if self.workers > 1:
+            self._scan_parallel()
+        else:
+            self._scan_sequential()
+        
+        self.logger.success(f"Scanned {self.results['stats']['files_scanned']} files")
+        self.logger.info(f"Found {self.results['stats']['matches_found']} potential secrets")
+        self.logger.info(f"Filtered {self.results['stats']['false_positives_filtered']} false positives")
+        
+        if self.results['stats']['duplicate_files']:
+            self.logger.info(
+                f"Skipped {self.results['stats']['duplicate_files']} duplicate files "
+                f"({FileHelper.format_file_size(self.results['stats']['bytes_deduplicated'])} saved)"
+            )
+    
+    def _scan_sequential(self):
+        """Escanea el contenido archivo por archivo, en el orden del recorrido (o de riesgo)"""
+        # Contar archivos totales (y ordenarlos por riesgo si se pidió)
+        with self.metrics.time('walk'):
+            if self.prioritize:
+                files = self._schedule_files()
+            else:
+                files = self._walk_files()
+            total_files = sum(
+                1 for f in files
+                if f.suffix.lower() in self.target_extensions
+                and not FileHelper.should_skip_path(f, self.exclude_dirs)
+            )
         
         self.logger.info(f"Estimated {total_files} files to scan")
         
-        spinner = Spinner("Scanning files", self.colors)
-        spinner.start()
+        # Con planificación por riesgo el orden no sigue el recorrido: solo se
+        # marcan archivos en el checkpoint, no directorios terminados
+        if self.prioritize:
+            file_iterator = iter(files)
+        else:
+            file_iterator = self._walk_files(self._checkpoint_dir_done())
+        
+        self._progress = self.logger.start_progress("Scanning files", total_files)
         
         try:
-            for file_path in self.base_path.rglob('*'):
-                if not file_path.is_file():
-                    continue
-                
-                # Verificar exclusiones
-                if FileHelper.should_skip_path(file_path, self.exclude_dirs):
-                    if self.verbose:
-                        self.logger.debug(f"Skipping excluded: {file_path}")
-                    continue
+            for file_path in file_iterator:
+                if self._is_cancelled():
+                    self.logger.warning("Scan cancelled")
+                    break
                 
-                # Verificar extensión
-                if file_path.suffix.lower() not in self.target_extensions:
-                    continue
+                # Escanear archivo
+                if self._is_target_file(file_path):
+                    self._scan_single_file(file_path)
                 
-                # Verificar si es binario
-                if FileHelper.is_binary(file_path):
-                    if self.verbose:
-                        self.logger.debug(f"Skipping binary: {file_path}")
+                self._checkpoint_file(file_path)
+        finally:
+            self._progress = None
+            self.logger.stop_progress()
+        
+    def _scan_parallel(self):
+        """
+        Escanea el contenido con varios workers. El recorrido recoge los
+        tamaños de los archivos objetivo; las tareas se despachan de mayor a
+        menor y los archivos mayores que PARALLEL_CHUNK_SIZE se dividen en
+        tramos que escanean varios workers a la vez. Las latencias por tarea
+        y la cola final quedan en stats['scheduling'].
+        """
+        # Recorrido: tamaños de los archivos objetivo (los demás quedan hechos)
+        planned: List[Tuple[Path, int]] = []
+        with self.metrics.time('walk'):
+            for file_path in self._walk_files():
+                if self._is_cancelled():
+                    break
+                if not self._is_target_file(file_path):
+                    self._checkpoint_file(file_path)
                     continue
-                
-                # Escanear archivo
-                self._scan_single_file(file_path)
+                try:
+                    planned.append((file_path, file_path.stat().st_size))
+                except OSError:
+                    planned.append((file_path, 0))
+    
+        rank = self.pattern_manager.get_risk_rank if self.prioritize else None
+        tasks = plan_tasks(
+            planned,
+            self.PARALLEL_CHUNK_SIZE,
+            rank,
+            # Ni un flujo comprimido ni una base de datos se leen por offsets
+            can_split=lambda file_path: not (self._is_compressed(file_path) or self._is_database(file_path))
+        )
+        latencies = TaskLatencies(self.workers)
+        chunked: Dict[Path, ChunkedFile] = {}
+        for task in tasks:
+            if task.chunks > 1 and task.chunk == 0:
+                chunked[task.file_path] = ChunkedFile(task.chunks)
+                latencies.chunked_files += 1
+                latencies.chunks += task.chunks
+        
+        self.logger.info(
+            f"Estimated {len(planned)} files to scan "
+            f"({len(tasks)} tasks on {self.workers} workers)"
+        )
+        
+        pending = iter(tasks)
+        pending_lock = threading.Lock()
+        
+        def worker():
+            try:
+                while not self._is_cancelled():
+                    with pending_lock:
+                        task = next(pending, None)
+                    if task is None:
+                        return
+                    started = time.perf_counter()
+                    if task.chunks == 1:
+                        self._scan_single_file(task.file_path)
+                        with self._lock:
+                            self._checkpoint_file(task.file_path)
+                    else:
+                        self._scan_chunk(task, chunked[task.file_path])
+                    latencies.observe(task, time.perf_counter() - started)
+            finally:
+                latencies.worker_done()
+        
+        self._progress = self.logger.start_progress("Scanning files", len(planned))
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='ocelotl-scan') as pool:
+                futures = [pool.submit(worker) for _ in range(self.workers)]
+                for future in futures:
+                    future.result()
         finally:
-            spinner.stop()
+            self._progress = None
+            self.logger.stop_progress()
         
-        self.logger.success(f"Scanned {self.results['stats']['files_scanned']} files")
-        self.logger.info(f"Found {self.results['stats']['matches_found']} potential secrets")
-        self.logger.info(f"Filtered {self.results['stats']['false_positives_filtered']} false positives")
+        if self._is_cancelled():
+            self.logger.warning("Scan cancelled")
+        self.results['stats']['scheduling'] = latencies.to_dict()
     
-    def _scan_single_file(self, file_path: Path):
+    def _scan_chunk(self, task: ScanTask, chunked: ChunkedFile):
+        """
+        Escanea un tramo de un archivo dividido; el worker que termina el
+        último tramo valida y registra los matches de todo el archivo
+        
+        Args:
+            task: Tarea del tramo
+            chunked: Estado compartido por los tramos del archivo
+        """
+        file_path = task.file_path
+        prepared = chunked.prepare(lambda: self._prepare_file(file_path))
+        if prepared is None:
+            with self._lock:
+                self._checkpoint_file(file_path)
+            return
+        
+        matches: List[Dict[str, Any]] = []
+        line_count = 0
+        failed = False
+        try:
+            with self.metrics.time('match'):
+                matches, line_count = self._scan_byte_range(file_path, task.start, task.end)
+        except Exception as e:
+            failed = True
+            if self.verbose:
+                self.logger.error(f"Error scanning {task.label}: {e}")
+        
+        combined = chunked.add(task.chunk, matches, line_count, failed)
+        if combined is None:
+            return
+        
+        if chunked.failed:
+            self._file_error(file_path, None)
+        else:
+            file_stat, digest = prepared
+            try:
+                self._finish_file(file_path, file_stat, digest, combined)
+            except Exception as e:
+                self._file_error(file_path, e)
+        with self._lock:
+            self._checkpoint_file(file_path)
+    
+    def _is_target_file(self, file_path: Path) -> bool:
         """
-        Escanea un archivo individual
+        Verifica si el contenido de un archivo debe escanearse
         
         Args:
             file_path: Ruta al archivo
+            
+        Returns:
+            bool: True si no está excluido, tiene extensión objetivo y no es binario
         """
-        self.results['stats']['files_scanned'] += 1
+        reason = self._skip_reason(file_path)
+        if reason is None:
+            return True
+        
+        self.metrics.skip(reason)
+        if self.verbose and reason != 'extension':
+            self.logger.debug(f"Skipping {reason}: {file_path}")
+        return False
+    
+    def _skip_reason(self, file_path: Path) -> Optional[str]:
+        """
+        Motivo por el que no se escanea el contenido de un archivo
+        
+        Args:
+            file_path: Ruta al archivo
+        
+        Returns:
+            'excluded', 'extension', 'binary' o None si debe escanearse
+        """
+        if FileHelper.should_skip_path(file_path, self.exclude_dirs):
+            return 'excluded'
+        if self._is_compressed(file_path):
+            # Cuenta la extensión del contenido ('app.log.gz' -> '.log')
+            if Path(inner_name(file_path.name)).suffix.lower() not in self.target_extensions:
+                return 'extension'
+            return None
+        if file_path.suffix.lower() not in self.target_extensions:
+            return 'extension'
+        if self._is_database(file_path):
+            return None
+        if FileHelper.is_binary(file_path):
+            return 'binary'
+        return None
+    
+    def _is_compressed(self, file_path: Path) -> bool:
+        """Indica si un archivo se escanea descomprimiéndolo"""
+        return self.decompress and compressed_format(file_path.name) is not None
+    
+    def _is_database(self, file_path: Path) -> bool:
+        """Indica si un archivo se escanea como base de datos SQLite"""
+        return (
+            self.scan_databases
+            and file_path.suffix.lower() in SQLITE_EXTENSIONS
+            and is_sqlite_database(file_path)
+        )
+    
+    def rescan_files(self, paths) -> List[Dict[str, Any]]:
+        """
+        Vuelve a escanear archivos creados, modificados o eliminados,
+        reemplazando sus hallazgos previos en los resultados
+        
+        Args:
+            paths: Rutas de archivos que cambiaron
+            
+        Returns:
+            Lista de hallazgos nuevos de esos archivos
+        """
+        changed = {str(path) for path in paths}
+        
+        # Descartar hallazgos previos de los archivos cambiados
+        for category in FINDING_CATEGORIES:
+            kept = []
+            for item in self.results[category]:
+                if item.get('file') in changed:
+                    record_statistics(self.results['statistics'], category, item, -1)
+                else:
+                    kept.append(item)
+            if category != 'sensitive_files':
+                self.results['stats']['matches_found'] -= len(self.results[category]) - len(kept)
+            self.results[category] = kept
         
+        # El índice de contenido puede apuntar a versiones antiguas de los archivos
+        self._content_index.clear()
+        self._pending_by_size.clear()
+        
+        before = {category: len(self.results[category]) for category in FINDING_CATEGORIES}
+        
+        for file_path in sorted(Path(path) for path in changed):
+            if not file_path.is_file() or FileHelper.should_skip_path(file_path, self.exclude_dirs):
+                continue
+            self.scan_path(file_path)
+        
+        return [
+            item
+            for category in FINDING_CATEGORIES
+            for item in self.results[category][before[category]:]
+        ]
+    
+    def scan_path(self, file_path: Path):
+        """
+        Escanea un archivo concreto: nombre sensible y, si aplica, contenido.
+        Puede llamarse desde varios hilos sobre el mismo scanner.
+        
+        Args:
+            file_path: Ruta al archivo (ya filtrada por exclusiones)
+        """
+        with self._lock:
+            try:
+                self._check_sensitive_file(file_path)
+            except OSError:
+                self.results['stats']['errors'] += 1
+        if self._is_target_file(file_path):
+            self._scan_single_file(file_path)
+    
+    def _scan_single_file(self, file_path: Path):
+        """
+        Escanea un archivo individual. La lectura, el matching y la validación
+        se hacen fuera del lock; solo el registro de resultados lo toma.
+        
+        Args:
+            file_path: Ruta al archivo
+        """
         try:
-            file_size = file_path.stat().st_size
+            prepared = self._prepare_file(file_path)
+            if prepared is None:
+                return
+            file_stat, digest = prepared
             
-            # Elegir método de lectura según tamaño
-            if file_size > self.MAX_FILE_SIZE_FULL_READ:
-                matches = self._scan_file_streaming(file_path)
+            # Elegir método de lectura según formato y tamaño
+            # (la lectura por líneas intercala E/S y matching: cuenta como 'match')
+            if self._is_compressed(file_path):
+                with self.metrics.time('match'):
+                    matches, problem = self._scan_compressed(file_path, file_stat.st_size)
+                self._record_decompression(file_path, problem)
+            elif self._is_database(file_path):
+                with self.metrics.time('match'):
+                    matches, limited = self._scan_database(file_path)
+                self._record_database(file_path, limited)
+            elif file_stat.st_size > self.MAX_FILE_SIZE_FULL_READ:
+                with self.metrics.time('match'):
+                    matches = self._scan_file_streaming(file_path)
             else:
                 matches = self._scan_file_full(file_path)
             
-            # Procesar matches
+            self._finish_file(file_path, file_stat, digest, matches)
+        except Exception as e:
+            self._file_error(file_path, e)
+    
+    def _record_decompression(self, file_path: Path, problem: Optional[str]):
+        """Cuenta un archivo descomprimido y, si lo hubo, su problema de descompresión"""
+        with self._lock:
+            stats = self.results['stats']
+            stats['compressed_files'] += 1
+            if problem == 'ratio_limit':
+                stats['decompression_limited'] += 1
+            elif problem == 'corrupt':
+                stats['errors'] += 1
+        if problem == 'ratio_limit':
+            self.logger.warning(f"Decompression ratio limit reached, partial scan: {file_path}")
+        elif problem == 'corrupt' and self.verbose:
+            self.logger.error(f"Error decompressing {file_path}: truncated or corrupt stream")
+    
+    def _record_database(self, file_path: Path, limited: bool):
+        """Cuenta una base de datos escaneada y si se alcanzaron sus límites"""
+        with self._lock:
+            self.results['stats']['databases_scanned'] += 1
+            if limited:
+                self.results['stats']['databases_limited'] += 1
+        if limited:
+            self.logger.warning(f"Database row/size limit reached, partial scan: {file_path}")
+    
+    def _prepare_file(self, file_path: Path) -> Optional[Tuple[os.stat_result, Optional[str]]]:
+        """
+        Cuenta un archivo y reutiliza resultados previos si los hay (caché de
+        archivos sin cambios o archivo con contenido idéntico)
+        
+        Args:
+            file_path: Ruta al archivo
+        
+        Returns:
+            Tupla (stat, hash de contenido) si hay que escanearlo, None si sus
+            hallazgos ya se registraron o no se pudo acceder al archivo
+        """
+        with self._lock:
+            self.results['stats']['files_scanned'] += 1
+        
+        try:
+            file_stat = file_path.stat()
+            file_size = file_stat.st_size
+            if self._progress is not None:
+                self._progress.advance(1, file_size)
+            
+            # Reutilizar resultados de un escaneo anterior si el archivo no cambió
+            if self.file_cache is not None:
+                cached = self.file_cache.get(file_path, file_stat)
+                if cached is not None:
+                    self.metrics.skip('unchanged')
+                    with self._lock:
+                        self.results['stats']['file_cache_hits'] += 1
+                        self._replay_matches(cached, file_path)
+                    return None
+            
+            # Reutilizar resultados de un archivo con contenido idéntico
+            digest = None
+            if self.deduplicate:
+                cached, digest = self._find_duplicate(file_path, file_size)
+                if cached is not None:
+                    self.metrics.skip('duplicate')
+                    with self._lock:
+                        self._fan_out_duplicate(cached, file_path, file_size)
+                    return None
+        except Exception as e:
+            self._file_error(file_path, e)
+            return None
+        
+        return file_stat, digest
+    
+    def _finish_file(
+        self,
+        file_path: Path,
+        file_stat: os.stat_result,
+        digest: Optional[str],
+        matches: List[Dict[str, Any]]
+    ):
+        """
+        Valida y registra los matches de un archivo ya escaneado
+        
+        Args:
+            file_path: Ruta al archivo
+            file_stat: stat del archivo al prepararlo
+            digest: Hash de contenido calculado al buscar duplicados (o None)
+            matches: Matches del archivo
+        """
+        file_size = file_stat.st_size
+        self.metrics.add_bytes(file_size)
+        
+        # Colapsar matches solapados antes de validarlos
+        matches = self._merge_overlapping_matches(matches)
+        
+        # Validar fuera del lock (el validador es thread-safe)
+        with self.metrics.time('validate'):
+            for match_data in matches:
+                self._validate(match_data)
+        
+        # Procesar matches
+        with self._lock:
             for match_data in matches:
                 self._process_match(match_data)
-                
-        except Exception as e:
+            
+            if self.deduplicate:
+                self._remember_content(file_path, file_size, digest, matches)
+        
+        if self.file_cache is not None:
+            self.file_cache.put(file_path, file_stat, matches)
+    
+    def _file_error(self, file_path: Path, error: Optional[Exception]):
+        """Cuenta un archivo que no se pudo escanear"""
+        self.metrics.skip('error')
+        with self._lock:
             self.results['stats']['errors'] += 1
-            if self.verbose:
-                self.logger.error(f"Error scanning {file_path}: {e}")
+        if self.verbose and error is not None:
+            self.logger.error(f"Error scanning {file_path}: {error}")
+    
+    def _hash_file(self, file_path: Path) -> str:
+        """
+        Calcula un hash rápido del contenido de un archivo
+        
+        Args:
+            file_path: Ruta al archivo
+            
+        Returns:
+            str: Digest hexadecimal del contenido
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
+    
+    def _content_key(self, file_path: Path) -> str:
+        """
+        Clave del índice de contenido: hash más lo que decide el análisis según
+        el nombre, porque dos archivos idénticos con distinta extensión pueden
+        recibir patrones distintos (tipo de archivo), pasar o no por la
+        extracción clave/valor (formato: .yaml y .env comparten tipo pero no
+        extractor) o marcar como comentario texto distinto (lenguaje: '#'
+        comenta en .py pero no en .js)
+        
+        Args:
+            file_path: Ruta al archivo
+        
+        Returns:
+            str: Clave '<tipo>:<formato>:<lenguaje>:<hash>'
+        """
+        name = file_path.name
+        route = (self.pattern_manager.get_file_type(name), structured_format(name), detect_language(name))
+        return ':'.join(map(str, route)) + f":{self._hash_file(file_path)}"
+    
+    def _find_duplicate(
+        self,
+        file_path: Path,
+        file_size: int
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        Busca un archivo ya escaneado con el mismo contenido.
+        Solo se calculan hashes cuando dos archivos comparten tamaño, y se
+        calculan fuera del lock: el lock solo protege las consultas e
+        inserciones en los índices, así los workers no se esperan mientras
+        otro lee un archivo entero.
+        
+        Args:
+            file_path: Ruta al archivo
+            file_size: Tamaño del archivo en bytes
+            
+        Returns:
+            Tupla (matches validados del duplicado o None, clave de contenido o None)
+        """
+        with self._lock:
+            if file_size not in self._pending_by_size:
+                return None, None
+            # El primer archivo del tamaño se hashea ahora que hay otro candidato
+            pending = self._pending_by_size[file_size]
+            self._pending_by_size[file_size] = None
+        
+        pending_key = None
+        if pending is not None:
+            try:
+                pending_key = self._content_key(pending[0])
+            except OSError:
+                pass
+        digest = self._content_key(file_path)
+        
+        # Consulta tras hashear: otro worker pudo registrar el contenido mientras tanto
+        with self._lock:
+            bucket = self._content_index.setdefault(file_size, {})
+            if pending_key is not None:
+                bucket.setdefault(pending_key, pending[1])
+            return bucket.get(digest), digest
+    
+    def _remember_content(
+        self,
+        file_path: Path,
+        file_size: int,
+        digest: Optional[str],
+        matches: List[Dict[str, Any]]
+    ):
+        """
+        Registra los matches validados de un archivo en el índice de contenido
+        
+        Args:
+            file_path: Ruta al archivo
+            file_size: Tamaño del archivo en bytes
+            digest: Hash del contenido (None si aún no se calculó)
+            matches: Matches validados del archivo
+        """
+        if digest is None:
+            self._pending_by_size[file_size] = (file_path, matches)
+        else:
+            self._content_index.setdefault(file_size, {}).setdefault(digest, matches)
+    
+    def _fan_out_duplicate(
+        self,
+        matches: List[Dict[str, Any]],
+        file_path: Path,
+        file_size: int
+    ):
+        """
+        Replica los hallazgos de un contenido ya escaneado en otra ruta
+        
+        Args:
+            matches: Matches validados del contenido original
+            file_path: Ruta del archivo duplicado
+            file_size: Tamaño del archivo en bytes
+        """
+        self.results['stats']['duplicate_files'] += 1
+        self.results['stats']['bytes_deduplicated'] += file_size
+        
+        if self.verbose:
+            self.logger.debug(f"Duplicate content, reusing results: {file_path}")
+        
+        self._replay_matches(matches, file_path)
+    
+    def _replay_matches(self, matches: List[Dict[str, Any]], file_path: Path):
+        """
+        Procesa copias de matches ya validados como si fueran de otro archivo
+        
+        Args:
+            matches: Matches validados previamente
+            file_path: Ruta a la que se atribuyen los hallazgos
+        """
+        for match_data in matches:
+            duplicate = dict(match_data)
+            duplicate['file'] = str(file_path)
+            duplicate['validation'] = dict(match_data['validation'])
+            self._process_match(duplicate)
     
     def _scan_file_full(self, file_path: Path) -> List[Dict[str, Any]]:
         """
@@ -231,34 +1231,170 @@ class OcelotlScanner:
         Returns:
             Lista de matches encontrados
         """
-        matches = []
-        
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                lines = content.split('\n')
-                
-                # Buscar patrones
-                for pattern_type, compiled_patterns in self.compiled_patterns.items():
-                    for compiled_pattern in compiled_patterns:
-                        for match in compiled_pattern.finditer(content):
-                            line_number = content[:match.start()].count('\n') + 1
-                            line_content = lines[line_number - 1] if line_number <= len(lines) else ""
-                            
-                            match_data = {
-                                'type': pattern_type,
-                                'match': match.group(),
-                                'file': str(file_path),
-                                'line': line_number,
-                                'context': line_content.strip()[:300],
-                                'full_match': match.groups()
-                            }
-                            
-                            matches.append(match_data)
+            with self.metrics.time('read'):
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
         except Exception as e:
             if self.verbose:
                 self.logger.error(f"Error reading {file_path}: {e}")
+            return []
+        
+        with self.metrics.time('match'):
+            return self._match_file_content(content, str(file_path))
+    
+    def _match_file_content(self, content: str, file_label: str) -> List[Dict[str, Any]]:
+        """
+        Aplica a un contenido completo los patrones enrutados para su archivo y,
+        en formatos clave/valor, la extracción estructurada
+        
+        Args:
+            content: Texto a analizar
+            file_label: Nombre con el que se reportan los matches
+        
+        Returns:
+            Lista de matches encontrados
+        """
+        filename = Path(file_label).name
+        file_format = structured_format(filename)
+        patterns = self._patterns_for(filename, content[:self.SHEBANG_PEEK], file_format is not None)
+        matches = self._match_content(content, file_label, patterns)
+        if file_format is not None:
+            matches.extend(self._match_structured(content, file_label, file_format))
+        return matches
+    
+    def _patterns_for(
+        self,
+        filename: str,
+        head: Optional[str] = None,
+        structured: bool = False
+    ) -> Dict[str, List[Any]]:
+        """
+        Patrones a aplicar a un archivo: los enrutados por PatternManager para
+        su tipo más el detector de entropía si está activo (salvo en claves)
+        
+        Args:
+            filename: Nombre del archivo
+            head: Comienzo del contenido (para detectar el shebang)
+            structured: Si el archivo pasa por la extracción estructurada, que
+                sustituye a los patrones de asignación (SUPERSEDED_CATEGORIES)
+        
+        Returns:
+            Dict categoría -> patrones compilados
+        """
+        file_type = self.pattern_manager.get_file_type(filename, head)
+        patterns = self._routes.get((file_type, structured))
+        if patterns is None:
+            patterns = dict(self.pattern_manager.routing_table[file_type])
+            if structured:
+                for category in SUPERSEDED_CATEGORIES:
+                    patterns.pop(category, None)
+            if self.entropy_detector is not None and file_type != 'key':
+                patterns['high_entropy'] = [self.entropy_detector]
+            self._routes[(file_type, structured)] = patterns
+        return patterns
+    
+    def _match_structured(self, content: str, file_label: str, file_format: str) -> List[Dict[str, Any]]:
+        """
+        Convierte en matches los pares clave/valor con clave sensible de un
+        archivo de configuración (una pasada por archivo)
+        
+        Args:
+            content: Contenido del archivo
+            file_label: Nombre con el que se reportan los matches
+            file_format: Formato devuelto por structured_format()
         
+        Returns:
+            Lista de matches; el texto del match es el valor, que es lo que
+            evalúa el validador (entropía, keywords)
+        """
+        matches = []
+        for category, entry in find_sensitive_entries(content, file_format):
+            line_start = content.rfind('\n', 0, entry.start) + 1
+            line_end = content.find('\n', entry.start)
+            line_content = content[line_start:line_end if line_end >= 0 else len(content)]
+            matches.append({
+                'type': category,
+                'match': entry.value,
+                'file': file_label,
+                'line': entry.line,
+                'context': line_content.strip()[:300],
+                'full_match': (entry.key, entry.value),
+                'span': (entry.start, entry.start + len(entry.value)),
+                'key': entry.key,
+                # Los extractores ya saltan los comentarios de cada formato
+                'in_comment': False
+            })
+        return matches
+    
+    def _match_content(
+        self,
+        content: str,
+        file_label: str,
+        patterns: Optional[Dict[str, List[Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aplica los patrones sobre un texto completo
+        
+        Args:
+            content: Texto a analizar
+            file_label: Nombre con el que se reportan los matches
+            patterns: Patrones enrutados para el tipo de archivo (todos si es None)
+            
+        Returns:
+            Lista de matches encontrados
+        """
+        if patterns is None:
+            patterns = self.compiled_patterns
+        
+        matches = []
+        lines = content.split('\n')
+        
+        # Offsets de inicio de cada línea para resolver números de línea con bisect
+        line_starts = [0]
+        for line in lines[:-1]:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+        
+        # Comentarios del archivo (una pasada léxica; None si no se reconoce el lenguaje)
+        comments = file_comment_spans(Path(file_label).name, content)
+        
+        for pattern_type, compiled_patterns in patterns.items():
+            for compiled_pattern in compiled_patterns:
+                for match in compiled_pattern.finditer(content):
+                    line_number = bisect.bisect_right(line_starts, match.start())
+                    line_content = lines[line_number - 1]
+                    
+                    match_data = {
+                        'type': pattern_type,
+                        'match': match.group(),
+                        'file': file_label,
+                        'line': line_number,
+                        'context': line_content.strip()[:300],
+                        'full_match': match.groups(),
+                        'span': match.span()
+                    }
+                    if comments is not None:
+                        match_data['in_comment'] = comments.contains(match.start())
+                    
+                    matches.append(match_data)
+        
+        return matches
+    
+    def scan_text(self, name: str, content: str) -> List[Dict[str, Any]]:
+        """
+        Escanea un texto en memoria y agrega sus hallazgos a los resultados
+        
+        Args:
+            name: Nombre con el que se reportan los hallazgos
+            content: Texto a analizar
+            
+        Returns:
+            Lista de matches validados del texto
+        """
+        self.results['stats']['files_scanned'] += 1
+        matches = self._merge_overlapping_matches(self._match_file_content(content, name))
+        for match_data in matches:
+            self._process_match(match_data)
         return matches
     
     def _scan_file_streaming(self, file_path: Path) -> List[Dict[str, Any]]:
@@ -271,33 +1407,367 @@ class OcelotlScanner:
         Returns:
             Lista de matches encontrados
         """
-        matches = []
-        
         if self.verbose:
             self.logger.debug(f"Streaming large file: {file_path}")
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_number, line in enumerate(f, 1):
-                    # Buscar patrones en esta línea
-                    for pattern_type, compiled_patterns in self.compiled_patterns.items():
-                        for compiled_pattern in compiled_patterns:
-                            for match in compiled_pattern.finditer(line):
-                                match_data = {
-                                    'type': pattern_type,
-                                    'match': match.group(),
-                                    'file': str(file_path),
-                                    'line': line_number,
-                                    'context': line.strip()[:300],
-                                    'full_match': match.groups()
-                                }
-                                
-                                matches.append(match_data)
+            return self._scan_byte_range(file_path)[0]
         except Exception as e:
             if self.verbose:
                 self.logger.error(f"Error streaming {file_path}: {e}")
+            return []
         
-        return matches
+    def _scan_byte_range(
+        self,
+        file_path: Path,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Escanea línea por línea las líneas que empiezan en [start, end).
+        La última se lee entera aunque pase de end: ese solape con el tramo
+        siguiente garantiza que ningún match queda partido entre tramos, y
+        como cada línea pertenece a un solo tramo tampoco se duplica.
+        
+        Args:
+            file_path: Ruta al archivo
+            start: Offset (en bytes) de inicio del tramo
+            end: Offset de fin del tramo (None: hasta el final del archivo)
+        
+        Returns:
+            Tupla (matches con números de línea relativos al tramo, líneas leídas)
+        """
+        matches: List[Dict[str, Any]] = []
+        
+        with open(file_path, 'rb') as f:
+            head = f.read(self.SHEBANG_PEEK).split(b'\n', 1)[0]
+            patterns = self._patterns_for(file_path.name, head.decode('utf-8', errors='ignore'))
+            
+            # La línea que cruza el inicio del tramo pertenece al anterior
+            f.seek(max(start - 1, 0))
+            offset = start
+            if start:
+                offset += len(f.readline()) - 1
+            
+            line_count = self._match_lines(f, str(file_path), patterns, matches, offset, end)
+        
+        return matches, line_count
+    
+    def _match_lines(
+        self,
+        lines: Iterable[bytes],
+        file_label: str,
+        patterns: Dict[str, List[Any]],
+        matches: List[Dict[str, Any]],
+        offset: int = 0,
+        end: Optional[int] = None
+    ) -> int:
+        """
+        Aplica los patrones línea por línea a un flujo de líneas en bytes.
+        Los matches se agregan a la lista según se encuentran, así que se
+        conservan aunque el flujo falle a mitad.
+        
+        Args:
+            lines: Líneas en bytes (una línea puede llegar en varias partes)
+            file_label: Nombre con el que se reportan los matches
+            patterns: Patrones enrutados para el archivo
+            matches: Lista donde agregar los matches
+            offset: Offset en bytes de la primera línea
+            end: Offset a partir del cual ya no se procesan líneas (None: todas)
+        
+        Returns:
+            int: Líneas procesadas
+        """
+        line_number = 0
+        line_complete = True
+        
+        for raw in lines:
+            if end is not None and offset >= end:
+                break
+            if line_complete:
+                line_number += 1
+            line_complete = raw.endswith(b'\n')
+            line = raw.decode('utf-8', errors='ignore')
+            if line.endswith('\r\n'):
+                line = line[:-2] + '\n'
+                
+            # Buscar patrones en esta línea
+            for pattern_type, compiled_patterns in patterns.items():
+                for compiled_pattern in compiled_patterns:
+                    for match in compiled_pattern.finditer(line):
+                        match_data = {
+                            'type': pattern_type,
+                            'match': match.group(),
+                            'file': file_label,
+                            'line': line_number,
+                            'context': line.strip()[:300],
+                            'full_match': match.groups(),
+                            'span': (offset + match.start(), offset + match.end())
+                        }
+                        
+                        matches.append(match_data)
+                
+            offset += len(raw)
+        
+        return line_number
+    
+    def _scan_compressed(self, file_path: Path, file_size: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Escanea un archivo comprimido descomprimiéndolo en streaming
+        
+        Args:
+            file_path: Ruta al archivo comprimido
+            file_size: Tamaño comprimido
+        
+        Returns:
+            Tupla (matches, problema) (ver _match_compressed)
+        """
+        if self.verbose:
+            self.logger.debug(f"Decompressing: {file_path}")
+        
+        with open(file_path, 'rb') as f:
+            return self._match_compressed(f, str(file_path), file_size)
+    
+    def _match_compressed(
+        self,
+        source: BinaryIO,
+        file_label: str,
+        compressed_size: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Aplica los patrones a un flujo comprimido: las líneas descomprimidas
+        pasan por el matcher de líneas sin cargar el contenido entero, con los
+        patrones enrutados para el nombre descomprimido ('app.log.gz' -> 'app.log')
+        y números de línea del contenido descomprimido
+        
+        Args:
+            source: Flujo comprimido en modo binario
+            file_label: Nombre con el que se reportan los matches
+            compressed_size: Tamaño comprimido (base del límite de ratio)
+        
+        Returns:
+            Tupla (matches, problema): el problema es 'ratio_limit' si se superó
+            el límite de ratio o 'corrupt' si el flujo está truncado o dañado
+            (en ambos casos se conservan los matches hasta ese punto), None si no
+        """
+        matches: List[Dict[str, Any]] = []
+        filename = Path(file_label).name
+        
+        try:
+            lines = iter_decompressed_lines(
+                source, compressed_format(filename), compressed_size, self.max_decompression_ratio
+            )
+            first = next(lines, b'')
+            if not first:
+                return matches, None
+            head = first[:self.SHEBANG_PEEK].decode('utf-8', errors='ignore')
+            patterns = self._patterns_for(inner_name(filename), head)
+            self._match_lines(itertools.chain((first,), lines), file_label, patterns, matches)
+        except DecompressionLimitError:
+            return matches, 'ratio_limit'
+        except DECOMPRESSION_ERRORS:
+            return matches, 'corrupt'
+        
+        return matches, None
+    
+    def _scan_database(self, file_path: Path) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Escanea una base de datos SQLite (ver _match_database)
+        
+        Args:
+            file_path: Ruta a la base de datos
+        
+        Returns:
+            Tupla (matches, límites alcanzados)
+        """
+        if self.verbose:
+            self.logger.debug(f"Reading database: {file_path}")
+        
+        return self._match_database(file_path)
+    
+    def _match_database(self, file_path: Path) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Aplica los patrones al contenido de una base de datos SQLite abierta
+        en solo lectura. Los valores de texto se leen tabla a tabla por lotes;
+        a cada lote se le aplican los patrones y, si el nombre 'tabla.columna'
+        es una clave sensible (users.password, settings.api_key), el valor de
+        la celda se evalúa como el de un archivo de configuración.
+        
+        Args:
+            file_path: Ruta a la base de datos
+        
+        Returns:
+            Tupla (matches, límites alcanzados). Cada match indica 'table',
+            'column' y 'rowid'; su 'line' es el rowid
+        
+        Raises:
+            sqlite3.Error: Si la base no se puede abrir o leer
+        """
+        reader = SqliteReader(file_path, self.max_database_rows, self.max_database_bytes)
+        patterns = self._patterns_for(file_path.name)
+        file_label = str(file_path)
+        matches: List[Dict[str, Any]] = []
+        offset = 0
+        
+        for cells in reader.iter_batches():
+            # Un texto por lote: los patrones se aplican una vez por lote
+            content = '\n'.join(cell.value for cell in cells)
+            starts = []
+            position = 0
+            for cell in cells:
+                starts.append(position)
+                position += len(cell.value) + 1
+            
+            for pattern_type, compiled_patterns in patterns.items():
+                for compiled_pattern in compiled_patterns:
+                    for match in compiled_pattern.finditer(content):
+                        index = bisect.bisect_right(starts, match.start()) - 1
+                        cell = cells[index]
+                        if match.end() > starts[index] + len(cell.value):
+                            continue  # el match cruza a la celda siguiente
+                        # Contexto: la línea del valor donde está el match
+                        relative = match.start() - starts[index]
+                        line_start = cell.value.rfind('\n', 0, relative) + 1
+                        line_end = cell.value.find('\n', relative)
+                        context = cell.value[line_start:line_end if line_end >= 0 else len(cell.value)]
+                        matches.append(self._cell_match(
+                            pattern_type, match.group(), match.groups(), cell, file_label,
+                            (offset + match.start(), offset + match.end()), context
+                        ))
+            
+            for index, cell in enumerate(cells):
+                category = reader.categories.get((cell.table, cell.column))
+                value = cell.value.strip()
+                if category is None or '\n' in value or len(value) > 1024 or not is_candidate_value(value):
+                    continue
+                match_data = self._cell_match(
+                    category, value, (cell.column, value), cell, file_label,
+                    (offset + starts[index], offset + starts[index] + len(cell.value)), value
+                )
+                match_data['key'] = f"{cell.table}.{cell.column}"
+                matches.append(match_data)
+            
+            offset += position
+        
+        return matches, reader.limited
+    
+    @staticmethod
+    def _cell_match(
+        pattern_type: str,
+        text: str,
+        groups: Tuple,
+        cell: DatabaseCell,
+        file_label: str,
+        span: Tuple[int, int],
+        context: str
+    ) -> Dict[str, Any]:
+        """
+        Match de una celda de base de datos. El contexto es solo el valor: con
+        el nombre de la tabla o la columna ('users.password') el validador lo
+        tomaría por keyword de falso positivo
+        """
+        return {
+            'type': pattern_type,
+            'match': text,
+            'file': file_label,
+            'line': cell.rowid,
+            'context': context.strip()[:300],
+            'full_match': groups,
+            'span': span,
+            'in_comment': False,
+            'table': cell.table,
+            'column': cell.column,
+            'rowid': cell.rowid
+        }
+    
+    def _merge_overlapping_matches(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Colapsa matches cuyos rangos se solapan, conservando el más específico.
+        Los candidatos se recorren por especificidad de categoría (y longitud)
+        y solo se aceptan si no se solapan con uno ya aceptado.
+        
+        Args:
+            matches: Matches encontrados en un archivo
+            
+        Returns:
+            Lista de matches sin solapamientos, en orden de aparición
+        """
+        kept = self._collapse_overlaps(matches)
+        if len(kept) != len(matches):
+            with self._lock:
+                self.results['stats']['overlapping_matches_merged'] += len(matches) - len(kept)
+        return kept
+    
+    def _collapse_overlaps(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Núcleo de _merge_overlapping_matches, sin tocar las estadísticas"""
+        if len(matches) < 2:
+            return matches
+        
+        lowest = len(self.category_priority)
+        ranked = sorted(
+            matches,
+            key=lambda m: (
+                self.category_priority.get(m['type'], lowest),
+                m['span'][0] - m['span'][1],
+                m['span'][0]
+            )
+        )
+        
+        # Intervalos aceptados, disjuntos y ordenados por inicio
+        kept_starts: List[int] = []
+        kept_ends: List[int] = []
+        kept: List[Dict[str, Any]] = []
+        
+        for match_data in ranked:
+            start, end = match_data['span']
+            index = bisect.bisect_right(kept_starts, start)
+            
+            if index > 0 and kept_ends[index - 1] > start:
+                continue
+            if index < len(kept_starts) and kept_starts[index] < end:
+                continue
+            
+            kept_starts.insert(index, start)
+            kept_ends.insert(index, end)
+            kept.insert(index, match_data)
+        
+        return kept
+    
+    def _in_baseline(self, finding: Dict[str, Any]) -> bool:
+        """
+        Comprueba si un hallazgo está en el baseline y cuenta la supresión
+        
+        Args:
+            finding: Hallazgo a comprobar
+            
+        Returns:
+            bool: True si el hallazgo debe suprimirse
+        """
+        if self.baseline is None or not self.baseline.contains(finding):
+            return False
+        self.results['stats']['baseline_suppressed'] += 1
+        return True
+    
+    def _validate(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Valida un match y lo escala a CRITICAL si su secreto está en el corpus
+        de filtraciones conocidas (filtro de Bloom y confirmación exacta)
+        
+        Args:
+            match_data: Datos del match
+        
+        Returns:
+            El mismo match con la validación agregada
+        """
+        self.validator.validate_match(match_data)
+        if self.known_secrets is None or not self.known_secrets.contains(extract_secret(match_data)):
+            return match_data
+        
+        validation = match_data['validation']
+        validation['known_leaked'] = True
+        validation['confidence'] = 'CRITICAL'
+        validation['is_likely_false_positive'] = False
+        return match_data
     
     def _process_match(self, match_data: Dict[str, Any]):
         """
@@ -306,14 +1776,16 @@ class OcelotlScanner:
         Args:
             match_data: Datos del match
         """
-        # Validar match
-        match_data = self.validator.validate_match(match_data)
+        # Validar match (los duplicados ya llegan validados)
+        if 'validation' not in match_data:
+            match_data = self._validate(match_data)
         
-        validation = match_data['validation']
+        verdict = self._evaluate_match(match_data)
         
         # Filtrar falsos positivos
-        if validation['is_likely_false_positive']:
+        if verdict == 'false_positive':
             self.results['stats']['false_positives_filtered'] += 1
+            self.results['statistics']['false_positives_filtered'] += 1
             if self.verbose:
                 self.logger.debug(
                     f"Filtered false positive in {match_data['file']}:{match_data['line']}"
@@ -321,15 +1793,49 @@ class OcelotlScanner:
             return
         
         # Verificar nivel de confianza mínimo
-        if not self.validator.should_report(match_data, self.min_confidence):
+        if verdict == 'low_confidence':
             if self.verbose:
                 self.logger.debug(
-                    f"Confidence too low ({validation['confidence']}) in {match_data['file']}:{match_data['line']}"
+                    f"Confidence too low ({match_data['validation']['confidence']}) "
+                    f"in {match_data['file']}:{match_data['line']}"
                 )
             return
         
-        # Incrementar contador
+        # Suprimir hallazgos ya triados en el baseline
+        if self._in_baseline(match_data):
+            return
+        
+        self._record_match(match_data)
+    
+    def _evaluate_match(self, match_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Decide si un match validado se reporta, sin modificar los resultados
+        
+        Args:
+            match_data: Match con validación
+        
+        Returns:
+            None si se reporta, o el motivo: 'false_positive' o 'low_confidence'
+        """
+        if match_data['validation']['is_likely_false_positive']:
+            return 'false_positive'
+        if not self.validator.should_report(match_data, self.min_confidence):
+            return 'low_confidence'
+        return None
+    
+    def _record_match(self, match_data: Dict[str, Any]):
+        """
+        Registra un match que se reporta: estadísticas, categoría, log y listeners
+        
+        Args:
+            match_data: Match validado que superó _evaluate_match y el baseline
+        """
+        validation = match_data['validation']
+        
+        # Incrementar contadores
         self.results['stats']['matches_found'] += 1
+        if validation.get('known_leaked'):
+            self.results['stats']['known_leaked'] += 1
         
         # Categorizar y agregar a resultados
         match_type = match_data['type']
@@ -363,6 +1869,12 @@ class OcelotlScanner:
             self.logger.critical(
                 f"[KEY] Private Key in {match_data['file']}:{match_data['line']}"
             )
+        elif match_type == 'high_entropy':
+            self.results['api_keys'].append(match_data)
+            self.logger.found(
+                f"High-entropy string in {match_data['file']}:{match_data['line']} "
+                f"[{validation['confidence']}]"
+            )
         elif match_type == 'jwt_tokens':
             self.results['jwt_tokens'].append(match_data)
             self.logger.found(
@@ -375,3 +1887,11 @@ class OcelotlScanner:
                 self.logger.info(
                     f"Config pattern in {match_data['file']}:{match_data['line']}"
                 )
+
+        category = result_category(match_type)
+        record_statistics(self.results['statistics'], category, match_data)
+        self._notify_listeners(category, match_data)
+
+        # Detener el escaneo en el primer hallazgo del nivel indicado
+        if self.fail_fast is not None and self.validator.should_report(match_data, self.fail_fast):
+            self._stop('fail_fast')
@@ -0,0 +1,206 @@
+"""
+Ocelotl v3.0 - Planificación
+Reparto por tamaño del escaneo de contenido entre workers: archivos grandes
+primero y archivos enormes divididos en tramos de bytes
+"""
+
+import math
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class ScanTask(NamedTuple):
+    """Unidad de trabajo de un worker: un archivo completo o un tramo de bytes"""
+    file_path: Path
+    size: int                   # Bytes del archivo o del tramo (peso en el reparto)
+    start: int                  # Offset de inicio del tramo (0 en archivos completos)
+    end: Optional[int]          # Offset de fin del tramo (None: archivo completo)
+    chunk: int                  # Índice del tramo (0 en archivos completos)
+    chunks: int                 # Tramos del archivo (1 en archivos completos)
+    
+    @property
+    def label(self) -> str:
+        """Nombre legible de la tarea (ruta y tramo)"""
+        if self.chunks == 1:
+            return str(self.file_path)
+        return f"{self.file_path} [chunk {self.chunk + 1}/{self.chunks}]"
+
+
+def plan_tasks(
+    files: Iterable[Tuple[Path, int]],
+    chunk_size: int,
+    rank: Optional[Callable[[str], int]] = None,
+    can_split: Optional[Callable[[Path], bool]] = None
+) -> List[ScanTask]:
+    """
+    Planifica el escaneo de contenido: los archivos mayores que chunk_size se
+    dividen en tramos y las tareas se ordenan de mayor a menor (LPT), así el
+    último trabajo que queda en la cola es pequeño y ningún worker espera a
+    un único archivo enorme al final del escaneo
+    
+    Args:
+        files: Pares (ruta, tamaño en bytes) recogidos en el recorrido
+        chunk_size: Tamaño máximo de una tarea en bytes
+        rank: Prioridad por nombre de archivo (menor primero), antes que el tamaño
+        can_split: Indica si un archivo admite dividirse en tramos (todos si es None)
+    
+    Returns:
+        Lista de tareas en orden de despacho (los tramos de un archivo, en orden)
+    """
+    tasks = []
+    for file_path, size in files:
+        if size <= chunk_size or (can_split is not None and not can_split(file_path)):
+            tasks.append(ScanTask(file_path, size, 0, None, 0, 1))
+            continue
+        chunks = -(-size // chunk_size)
+        for index in range(chunks):
+            start = index * chunk_size
+            end = min(start + chunk_size, size)
+            tasks.append(ScanTask(file_path, end - start, start, end, index, chunks))
+    
+    if rank is None:
+        tasks.sort(key=lambda task: -task.size)
+    else:
+        tasks.sort(key=lambda task: (rank(task.file_path.name), -task.size))
+    return tasks
+
+
+class ChunkedFile:
+    """
+    Estado de un archivo dividido en tramos: la preparación (cachés y
+    deduplicación) se hace una vez y los matches se unen al terminar el
+    último tramo, con los números de línea ya relativos al archivo. Thread-safe.
+    """
+    
+    def __init__(self, chunks: int):
+        self.chunks = chunks
+        self.prepared = False
+        self.state: Any = None
+        self.failed = False
+        self._results: List[Optional[Tuple[List[Dict[str, Any]], int]]] = [None] * chunks
+        self._remaining = chunks
+        self._prepare_lock = threading.Lock()
+        self._lock = threading.Lock()
+    
+    def prepare(self, prepare: Callable[[], Any]) -> Any:
+        """
+        Ejecuta la preparación del archivo una sola vez (el primer tramo que
+        llega la hace; el resto espera su resultado)
+        
+        Args:
+            prepare: Función de preparación
+        
+        Returns:
+            Lo que devolvió la preparación
+        """
+        with self._prepare_lock:
+            if not self.prepared:
+                self.state = prepare()
+                self.prepared = True
+            return self.state
+    
+    def add(
+        self,
+        chunk: int,
+        matches: List[Dict[str, Any]],
+        line_count: int,
+        failed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Registra el resultado de un tramo
+        
+        Args:
+            chunk: Índice del tramo
+            matches: Matches del tramo con números de línea relativos al tramo
+            line_count: Líneas que empiezan en el tramo
+            failed: Si el tramo no se pudo leer
+        
+        Returns:
+            Matches de todo el archivo al terminar el último tramo, None antes
+        """
+        with self._lock:
+            self._results[chunk] = (matches, line_count)
+            self.failed = self.failed or failed
+            self._remaining -= 1
+            if self._remaining:
+                return None
+        
+        combined = []
+        lines_before = 0
+        for chunk_matches, chunk_lines in self._results:
+            for match_data in chunk_matches:
+                match_data['line'] += lines_before
+                combined.append(match_data)
+            lines_before += chunk_lines
+        self._results = []
+        return combined
+
+
+class TaskLatencies:
+    """
+    Latencias por tarea y cola del escaneo paralelo: percentiles de duración
+    de las tareas y tiempo entre que el primer worker se queda sin trabajo y
+    termina el último (lo que dura la cola con workers ociosos). Thread-safe.
+    """
+    
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.durations = array('d')
+        self.chunked_files = 0
+        self.chunks = 0
+        self.slowest: Optional[Tuple[float, str]] = None
+        self._first_idle: Optional[float] = None
+        self._last_done: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def observe(self, task: ScanTask, seconds: float):
+        """Registra la duración de una tarea"""
+        with self._lock:
+            self.durations.append(seconds)
+            if self.slowest is None or seconds > self.slowest[0]:
+                self.slowest = (seconds, task.label)
+    
+    def worker_done(self):
+        """Registra que un worker ya no tiene más tareas"""
+        now = time.monotonic()
+        with self._lock:
+            if self._first_idle is None:
+                self._first_idle = now
+            self._last_done = now
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Exporta las estadísticas de planificación (results['stats']['scheduling'])
+        
+        Returns:
+            Dict con workers, tareas, tramos, percentiles p50/p95/p99/máximo de
+            duración por tarea (segundos), tarea más lenta y duración de la cola
+        """
+        with self._lock:
+            durations = sorted(self.durations)
+            data: Dict[str, Any] = {
+                'workers': self.workers,
+                'tasks': len(durations),
+                'chunked_files': self.chunked_files,
+                'chunks': self.chunks,
+            }
+            for name, quantile in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+                data[f'task_{name}_seconds'] = round(_percentile(durations, quantile), 6)
+            data['task_max_seconds'] = round(durations[-1], 6) if durations else 0.0
+            data['slowest_task'] = self.slowest[1] if self.slowest else None
+            tail = 0.0
+            if self._first_idle is not None:
+                tail = self._last_done - self._first_idle
+            data['tail_seconds'] = round(tail, 6)
+        return data
+
+
+def _percentile(values: List[float], quantile: float) -> float:
+    """Percentil por el método del rango más cercano (valores ya ordenados)"""
+    if not values:
+        return 0.0
+    index = math.ceil(quantile * len(values) - 1e-9) - 1
+    return values[min(max(index, 0), len(values) - 1)]
@@ -0,0 +1,421 @@
+"""
+Ocelotl v3.0 - Servidor de Escaneo
+Daemon que mantiene patrones, cachés y resultados por archivo en memoria
+y atiende peticiones de escaneo por HTTP local o socket Unix
+"""
+
+import json
+import queue
+import re
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from typing import Dict, Any, List, Optional, Tuple
+
+from .cache import FileResultCache
+from .patterns import PatternManager
+from .scanner import OcelotlScanner, FINDING_CATEGORIES
+from .validators import SecretValidator
+
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+
+
+def parse_unified_diff(diff_text: str) -> Dict[str, List[Tuple[int, str]]]:
+    """
+    Extrae las líneas añadidas de un diff unificado
+    
+    Args:
+        diff_text: Diff en formato unificado (git diff)
+    
+    Returns:
+        Dict de archivo -> lista de (número de línea en el archivo nuevo, texto)
+    """
+    added: Dict[str, List[Tuple[int, str]]] = {}
+    current_file = None
+    line_number = 0
+    
+    for raw_line in diff_text.splitlines():
+        if raw_line.startswith('+++ '):
+            target = raw_line[4:].split('\t')[0].strip()
+            if target == '/dev/null':
+                current_file = None
+            else:
+                current_file = target[2:] if target.startswith('b/') else target
+                added.setdefault(current_file, [])
+            continue
+        
+        if raw_line.startswith('--- '):
+            continue
+        
+        hunk = _HUNK_HEADER.match(raw_line)
+        if hunk:
+            line_number = int(hunk.group(1))
+            continue
+        
+        if current_file is None:
+            continue
+        
+        if raw_line.startswith('+'):
+            added[current_file].append((line_number, raw_line[1:]))
+            line_number += 1
+        elif raw_line.startswith(' '):
+            line_number += 1
+    
+    return added
+
+
+class ScanJob:
+    """Petición de escaneo encolada, ordenada por prioridad y llegada"""
+    
+    def __init__(self, priority: int, sequence: int, request: Dict[str, Any], timeout: float):
+        self.priority = priority
+        self.sequence = sequence
+        self.request = request
+        self.deadline = time.monotonic() + timeout
+        self.cancel_event = threading.Event()
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+    
+    def __lt__(self, other: 'ScanJob') -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class ScanService:
+    """
+    Servicio de escaneo con estado caliente: un único PatternManager
+    compilado, un SecretValidator con sus cachés y una caché de resultados
+    por archivo compartidos por todas las peticiones.
+    """
+    
+    def __init__(
+        self,
+        workers: int = 2,
+        queue_size: int = 64,
+        default_timeout: float = 60.0,
+        min_confidence: str = 'LOW',
+        exclude_dirs: Optional[set] = None
+    ):
+        """
+        Inicializa el servicio
+        
+        Args:
+            workers: Número de hilos que ejecutan escaneos
+            queue_size: Peticiones máximas en espera
+            default_timeout: Timeout por petición en segundos
+            min_confidence: Nivel mínimo de confianza por defecto
+            exclude_dirs: Directorios a excluir al escanear rutas
+        """
+        self.workers = max(1, workers)
+        self.default_timeout = default_timeout
+        self.min_confidence = min_confidence
+        self.exclude_dirs = exclude_dirs
+        
+        self.pattern_manager = PatternManager()
+        self.validator = SecretValidator()
+        self.file_cache = FileResultCache()
+        
+        self.queue: 'queue.PriorityQueue[ScanJob]' = queue.PriorityQueue(maxsize=queue_size)
+        self._sequence = count()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self.stats = {
+            'requests': 0,
+            'completed': 0,
+            'timeouts': 0,
+            'rejected': 0,
+            'errors': 0
+        }
+        self._stats_lock = threading.Lock()
+    
+    def start(self):
+        """Arranca los hilos de trabajo"""
+        self._running = True
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"ocelotl-worker-{index}")
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+    
+    def stop(self):
+        """Detiene los hilos de trabajo"""
+        self._running = False
+        for _ in self._threads:
+            self.queue.put(ScanJob(-1, next(self._sequence), {}, 0))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+    
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+    
+    def submit(self, request: Dict[str, Any]) -> ScanJob:
+        """
+        Encola una petición de escaneo
+        
+        Args:
+            request: Petición con 'paths', 'blobs' y/o 'diff'
+        
+        Returns:
+            ScanJob encolado
+        
+        Raises:
+            ValueError: Si la petición no tiene nada que escanear o su
+                timeout/priority no son válidos
+            queue.Full: Si la cola está llena
+        """
+        if not any(request.get(key) for key in ('paths', 'blobs', 'diff')):
+            raise ValueError("Request needs 'paths', 'blobs' or 'diff'")
+        try:
+            timeout = float(request.get('timeout', self.default_timeout))
+            priority = int(request.get('priority', 10))
+        except (TypeError, ValueError):
+            raise ValueError("'timeout' and 'priority' must be numbers") from None
+        if not timeout > 0:
+            raise ValueError("'timeout' must be positive")
+        job = ScanJob(priority, next(self._sequence), request, timeout)
+        self._count('requests')
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            self._count('rejected')
+            raise
+        return job
+    
+    def run(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encola una petición y espera su resultado
+        
+        Args:
+            request: Petición de escaneo
+        
+        Returns:
+            Dict con hallazgos y estadísticas
+        
+        Raises:
+            ValueError: Si la petición no es válida
+            queue.Full: Si la cola está llena
+            TimeoutError: Si la petición excede su timeout
+            RuntimeError: Si el escaneo falló
+        """
+        job = self.submit(request)
+        finished = job.done.wait(max(0.0, job.deadline - time.monotonic()))
+        if not finished or job.cancel_event.is_set():
+            job.cancel_event.set()
+            self._count('timeouts')
+            raise TimeoutError('Scan request timed out')
+        if job.error is not None:
+            raise RuntimeError(job.error)
+        return job.result
+    
+    def _worker(self):
+        """Bucle de un hilo de trabajo"""
+        while self._running:
+            job = self.queue.get()
+            try:
+                if not job.request or job.cancel_event.is_set():
+                    continue
+                if time.monotonic() >= job.deadline:
+                    job.cancel_event.set()
+                    continue
+                job.result = self._execute(job)
+                self._count('completed')
+            except Exception as e:
+                job.error = str(e)
+                self._count('errors')
+            finally:
+                job.done.set()
+                self.queue.task_done()
+    
+    def _new_scanner(self, base_path: str, job: ScanJob) -> OcelotlScanner:
+        """Crea un scanner silencioso que reutiliza el estado compilado"""
+        return OcelotlScanner(
+            base_path=base_path,
+            use_colors=False,
+            exclude_dirs=self.exclude_dirs,
+            min_confidence=job.request.get('min_confidence', self.min_confidence),
+            silent=True,
+            pattern_manager=self.pattern_manager,
+            validator=self.validator,
+            file_cache=self.file_cache,
+            cancel_event=job.cancel_event
+        )
+    
+    def _execute(self, job: ScanJob) -> Dict[str, Any]:
+        """
+        Ejecuta una petición de escaneo
+        
+        Args:
+            job: Petición a ejecutar
+        
+        Returns:
+            Dict con hallazgos y estadísticas
+        """
+        request = job.request
+        findings: List[Dict[str, Any]] = []
+        stats = {'files_scanned': 0, 'matches_found': 0, 'false_positives_filtered': 0, 'errors': 0}
+        
+        def collect(scanner: OcelotlScanner):
+            for category in FINDING_CATEGORIES:
+                for item in scanner.results.get(category, []):
+                    findings.append(dict(item, category=category))
+            for key in stats:
+                stats[key] += scanner.results['stats'].get(key, 0)
+        
+        for path in request.get('paths', []):
+            scanner = self._new_scanner(path, job)
+            scanner.scan()
+            collect(scanner)
+        
+        if request.get('blobs') or request.get('diff'):
+            scanner = self._new_scanner('.', job)
+            
+            for blob in request.get('blobs', []):
+                scanner.scan_text(blob.get('name', '<blob>'), blob.get('content', ''))
+            
+            for file_name, added_lines in parse_unified_diff(request.get('diff', '')).items():
+                if not added_lines:
+                    continue
+                content = '\n'.join(text for _, text in added_lines)
+                line_map = [line_number for line_number, _ in added_lines]
+                for match_data in scanner.scan_text(file_name, content):
+                    match_data['line'] = line_map[match_data['line'] - 1]
+            
+            collect(scanner)
+        
+        return {
+            'findings': findings,
+            'stats': stats,
+            'cancelled': job.cancel_event.is_set()
+        }
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Obtiene el estado del servicio
+        
+        Returns:
+            Dict con contadores de peticiones y estado de las cachés
+        """
+        with self._stats_lock:
+            requests = dict(self.stats)
+        return {
+            'requests': requests,
+            'queued': self.queue.qsize(),
+            'workers': self.workers,
+            'validation_cache': self.validator.get_cache_stats(),
+            'file_cache': self.file_cache.get_stats()
+        }
+
+
+class ScanRequestHandler(BaseHTTPRequestHandler):
+    """Manejador HTTP de la API del daemon"""
+    
+    server_version = 'Ocelotl/3.0'
+    
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._send_json(200, self.server.service.get_status())
+        else:
+            self._send_json(404, {'error': 'Not found'})
+    
+    def do_POST(self):
+        if self.path != '/scan':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError('Request body must be a JSON object')
+        except ValueError as e:
+            self._send_json(400, {'error': f'Invalid request: {e}'})
+            return
+        
+        try:
+            result = self.server.service.run(request)
+        except ValueError as e:
+            self._send_json(400, {'error': f'Invalid request: {e}'})
+        except queue.Full:
+            self._send_json(503, {'error': 'Scan queue is full'})
+        except TimeoutError as e:
+            self._send_json(504, {'error': str(e)})
+        except RuntimeError as e:
+            self._send_json(500, {'error': str(e)})
+        else:
+            self._send_json(200, result)
+    
+    def address_string(self) -> str:
+        # Los sockets Unix no tienen dirección de cliente
+        return self.client_address[0] if self.client_address else 'unix'
+    
+    def log_message(self, format: str, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _LocalHTTPServer(ThreadingHTTPServer):
+    """Servidor HTTP en localhost"""
+    daemon_threads = True
+
+
+class _LocalHTTPServer6(_LocalHTTPServer):
+    """Servidor HTTP en localhost IPv6 (::1)"""
+    address_family = socket.AF_INET6
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Servidor HTTP sobre socket Unix"""
+        daemon_threads = True
+else:
+    _UnixHTTPServer = None
+
+
+def create_server(
+    service: ScanService,
+    host: str = '127.0.0.1',
+    port: int = 8765,
+    unix_socket: Optional[str] = None,
+    verbose: bool = False
+):
+    """
+    Crea el servidor HTTP de la API
+    
+    Args:
+        service: Servicio de escaneo (ya arrancado o por arrancar)
+        host: Host de escucha (solo se admite localhost)
+        port: Puerto TCP
+        unix_socket: Ruta del socket Unix (tiene prioridad sobre host/puerto)
+        verbose: Registrar cada petición en stderr
+    
+    Returns:
+        Servidor listo para serve_forever()
+    """
+    if unix_socket:
+        if _UnixHTTPServer is None:
+            raise RuntimeError('Unix sockets are not supported on this platform')
+        server = _UnixHTTPServer(unix_socket, ScanRequestHandler)
+    else:
+        if host not in ('127.0.0.1', 'localhost', '::1'):
+            raise ValueError('The scan API only listens on localhost')
+        server_class = _LocalHTTPServer6 if host == '::1' else _LocalHTTPServer
+        server = server_class((host, port), ScanRequestHandler)
+    
+    server.service = service
+    server.verbose = verbose
+    return server
@@ -0,0 +1,207 @@
+"""
+Ocelotl v3.0 - Sharding
+Partición determinista del árbol entre máquinas y fusión de reportes
+"""
+
+import hashlib
+import json
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
+
+from .reporters import JSON_CATEGORIES, count_statistics, empty_statistics
+
+
+# Cubetas fijas del hash de ruta (reparto estable aunque cambien los tamaños)
+BUCKETS = 4096
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Interpreta una especificación de shard 'i/N' (i empieza en 1)
+    
+    Args:
+        spec: Texto como '2/8'
+    
+    Returns:
+        Tupla (i, N)
+    
+    Raises:
+        ValueError: Si el formato o los valores no son válidos
+    """
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}' (expected i/N, e.g. 1/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}' (i must be between 1 and N)")
+    return index, count
+
+
+def shard_of(relative: str, count: int) -> int:
+    """
+    Shard de un archivo: la ruta relativa se lleva por hash a uno de BUCKETS
+    cubetas fijas y cada shard recibe un rango contiguo de cubetas. Solo
+    depende de la ruta, así que dos máquinas que recorren el volumen en
+    momentos distintos (con archivos que crecen o aparecen) no se reparten
+    de forma distinta el resto de archivos; los bytes quedan equilibrados
+    en promedio porque cada archivo cae en una cubeta uniforme.
+    
+    Args:
+        relative: Ruta relativa (POSIX) a la ruta base
+        count: Número de shards
+    
+    Returns:
+        Shard (1..N)
+    """
+    digest = hashlib.blake2b(relative.encode('utf-8', errors='surrogateescape'), digest_size=8).digest()
+    bucket = int.from_bytes(digest, 'big') % BUCKETS
+    return bucket * count // BUCKETS + 1
+
+
+def _merge_stats(total: Dict[str, Any], stats: Dict[str, Any]):
+    """Acumula las estadísticas de un reporte en el total"""
+    for key, value in stats.items():
+        if key == 'start_time':
+            total[key] = min(filter(None, (total.get(key), value)), default=None)
+        elif key == 'end_time':
+            total[key] = max(filter(None, (total.get(key), value)), default=None)
+        elif key == 'shard':
+            total.setdefault('shards', []).append(value)
+        elif key == 'scheduling':
+            _merge_scheduling(total.setdefault(key, {}), value)
+        elif isinstance(value, bool):
+            continue
+        elif isinstance(value, (int, float)):
+            total[key] = total.get(key, 0) + value
+        elif isinstance(value, dict):
+            _merge_stats(total.setdefault(key, {}), value)
+    
+    # Las tasas no se suman: se recalculan a partir de los contadores
+    if 'hits' in total and 'misses' in total:
+        lookups = total['hits'] + total['misses']
+        total['hit_rate'] = round(total['hits'] / lookups, 4) if lookups else 0.0
+
+
+def _merge_scheduling(total: Dict[str, Any], scheduling: Dict[str, Any]):
+    """
+    Acumula la planificación de un shard: tareas y tramos se suman; workers,
+    latencias y cola toman el valor del shard más lento
+    """
+    if scheduling.get('task_max_seconds', 0) >= total.get('task_max_seconds', 0):
+        total['slowest_task'] = scheduling.get('slowest_task')
+    for key, value in scheduling.items():
+        if key in ('tasks', 'chunked_files', 'chunks'):
+            total[key] = total.get(key, 0) + value
+        elif isinstance(value, (int, float)):
+            total[key] = max(total.get(key, 0), value)
+
+
+def missing_shards(shards: List[str]) -> List[str]:
+    """
+    Detecta shards ausentes o repetidos en un conjunto de reportes
+    
+    Args:
+        shards: Especificaciones 'i/N' de los reportes fusionados
+    
+    Returns:
+        Lista de problemas encontrados (vacía si el conjunto está completo)
+    """
+    problems = []
+    parsed = [parse_shard(spec) for spec in shards]
+    for count in sorted({count for _, count in parsed}):
+        indexes = [index for index, total in parsed if total == count]
+        for index in range(1, count + 1):
+            if index not in indexes:
+                problems.append(f"missing shard {index}/{count}")
+            elif indexes.count(index) > 1:
+                problems.append(f"duplicate shard {index}/{count}")
+    return problems
+
+
+def merge_reports(report_files: List[str], output_file: str) -> Dict[str, Any]:
+    """
+    Fusiona reportes JSON de shards en un único reporte.
+    Solo hay un reporte de entrada en memoria a la vez: los hallazgos se
+    vuelcan a archivos temporales por categoría y el reporte final se
+    escribe en streaming.
+    
+    Args:
+        report_files: Reportes generados con generate_json_report
+        output_file: Ruta del reporte fusionado
+    
+    Returns:
+        Dict con el resumen fusionado ('summary') y las estadísticas ('statistics')
+    """
+    summary: Dict[str, Any] = {}
+    statistics = empty_statistics()
+    spill = {category: tempfile.TemporaryFile('w+', encoding='utf-8') for category in JSON_CATEGORIES}
+    
+    try:
+        for report_file in report_files:
+            with open(report_file, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            
+            _merge_stats(summary, report.get('summary', {}))
+            for category in JSON_CATEGORIES:
+                items = report.get('findings', {}).get(category, [])
+                count_statistics(statistics, category, items)
+                for item in items:
+                    spill[category].write(json.dumps(item, ensure_ascii=False))
+                    spill[category].write('\n')
+            del report
+        
+        # Los falsos positivos no están en los hallazgos: se suman de los resúmenes
+        statistics['false_positives_filtered'] = summary.get('false_positives_filtered', 0)
+        
+        metadata = {
+            'tool': 'Ocelotl',
+            'version': '3.0',
+            'scan_time': summary.get('start_time'),
+            'end_time': summary.get('end_time'),
+            'duration': _duration(summary),
+            'merged_reports': len(report_files)
+        }
+        
+        with open(output_file, 'w', encoding='utf-8') as out:
+            out.write('{\n  "metadata": ')
+            out.write(_indent(json.dumps(metadata, indent=2, ensure_ascii=False)))
+            out.write(',\n  "summary": ')
+            out.write(_indent(json.dumps(summary, indent=2, ensure_ascii=False)))
+            out.write(',\n  "findings": {')
+            
+            for position, category in enumerate(JSON_CATEGORIES):
+                out.write(',' if position else '')
+                out.write(f'\n    {json.dumps(category)}: [')
+                spill[category].seek(0)
+                first = True
+                for line in spill[category]:
+                    item = json.loads(line)
+                    out.write('\n      ' if first else ',\n      ')
+                    out.write(_indent(json.dumps(item, indent=2, ensure_ascii=False), 6))
+                    first = False
+                out.write(']' if first else '\n    ]')
+            
+            out.write('\n  },\n  "statistics": ')
+            out.write(_indent(json.dumps(statistics, indent=2, ensure_ascii=False)))
+            out.write('\n}\n')
+    finally:
+        for handle in spill.values():
+            handle.close()
+    
+    return {'summary': summary, 'statistics': statistics}
+
+
+def _indent(text: str, spaces: int = 2) -> str:
+    """Sangra las líneas siguientes a la primera de un bloque JSON"""
+    return text.replace('\n', '\n' + ' ' * spaces)
+
+
+def _duration(summary: Dict[str, Any]) -> str:
+    """Duración de reloj desde el primer inicio hasta el último fin"""
+    try:
+        start = datetime.fromisoformat(summary['start_time'])
+        end = datetime.fromisoformat(summary['end_time'])
+        return str(end - start).split('.')[0]
+    except (KeyError, TypeError, ValueError):
+        return "Unknown"
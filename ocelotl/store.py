@@ -0,0 +1,327 @@
+"""
+Ocelotl v3.0 - Almacén de Hallazgos
+Persistencia en SQLite para consultar hallazgos entre escaneos
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+
+from .fingerprints import extract_secret, finding_fingerprint, relative_path
+
+# Niveles de confianza de mayor a menor
+CONFIDENCE_LEVELS = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'VERY_LOW']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    base_path TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    files_scanned INTEGER DEFAULT 0,
+    matches_found INTEGER DEFAULT 0,
+    errors INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    rule_id INTEGER NOT NULL REFERENCES rules(id),
+    category TEXT NOT NULL,
+    line INTEGER,
+    confidence TEXT,
+    entropy REAL,
+    fingerprint TEXT NOT NULL,
+    secret_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_findings_fingerprint ON findings(fingerprint);
+CREATE INDEX IF NOT EXISTS idx_findings_secret_hash ON findings(secret_hash);
+CREATE INDEX IF NOT EXISTS idx_findings_file ON findings(file_id);
+CREATE INDEX IF NOT EXISTS idx_findings_rule ON findings(rule_id);
+CREATE INDEX IF NOT EXISTS idx_findings_confidence ON findings(confidence);
+CREATE INDEX IF NOT EXISTS idx_findings_scan ON findings(scan_id);
+"""
+
+
+def secret_hash(secret: str) -> str:
+    """
+    Hash del valor secreto normalizado, para buscar un secreto en cualquier
+    ruta sin guardarlo en claro
+    
+    Args:
+        secret: Valor secreto
+    
+    Returns:
+        str: SHA-256 hexadecimal
+    """
+    return hashlib.sha256(secret.encode('utf-8', errors='surrogateescape')).hexdigest()
+
+
+class FindingsStore:
+    """
+    Almacén de hallazgos en SQLite con esquema normalizado
+    (scans, files, rules, findings).
+    
+    Los hallazgos se acumulan y se insertan por lotes dentro de una única
+    transacción por escaneo. Solo se guardan hashes del secreto, nunca el valor.
+    """
+    
+    BATCH_SIZE = 1000
+    
+    def __init__(self, db_path: str):
+        """
+        Abre (o crea) la base de datos
+        
+        Args:
+            db_path: Ruta del archivo SQLite
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        
+        self.scan_id: Optional[int] = None
+        self.base_path = Path('.')
+        self._pending: List[tuple] = []
+        self._file_ids: Dict[str, int] = {}
+        self._rule_ids: Dict[str, int] = {}
+    
+    def __enter__(self) -> 'FindingsStore':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort_scan()
+        self.close()
+    
+    def begin_scan(self, base_path: str, rules: List[Dict[str, Any]], started_at: Optional[str] = None) -> int:
+        """
+        Registra un escaneo nuevo y abre su transacción
+        
+        Args:
+            base_path: Ruta base del escaneo
+            rules: Metadatos de reglas (PatternManager.get_rule_metadata())
+            started_at: Fecha de inicio en ISO 8601
+        
+        Returns:
+            int: Identificador del escaneo
+        """
+        self.base_path = Path(base_path)
+        self.conn.execute('BEGIN')
+        self.conn.executemany(
+            'INSERT INTO rules (name, description) VALUES (?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET description = excluded.description',
+            [(rule['id'], rule['description']) for rule in rules]
+        )
+        cursor = self.conn.execute(
+            'INSERT INTO scans (base_path, started_at) VALUES (?, ?)',
+            (str(self.base_path.resolve()), started_at)
+        )
+        self.scan_id = cursor.lastrowid
+        return self.scan_id
+    
+    def _rule_id(self, name: str) -> int:
+        rule_id = self._rule_ids.get(name)
+        if rule_id is None:
+            self.conn.execute('INSERT OR IGNORE INTO rules (name, description) VALUES (?, ?)', (name, name))
+            rule_id = self.conn.execute('SELECT id FROM rules WHERE name = ?', (name,)).fetchone()[0]
+            self._rule_ids[name] = rule_id
+        return rule_id
+    
+    def _file_id(self, path: str) -> int:
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            self.conn.execute('INSERT OR IGNORE INTO files (path) VALUES (?)', (path,))
+            file_id = self.conn.execute('SELECT id FROM files WHERE path = ?', (path,)).fetchone()[0]
+            self._file_ids[path] = file_id
+        return file_id
+    
+    def add_finding(self, category: str, finding: Dict[str, Any]):
+        """
+        Encola un hallazgo para inserción (compatible con add_listener)
+        
+        Args:
+            category: Categoría de resultados del hallazgo
+            finding: Hallazgo reportado por el scanner
+        """
+        if self.scan_id is None:
+            return
+        
+        rule = finding.get('type', category)
+        validation = finding.get('validation', {})
+        path = relative_path(finding.get('file', ''), self.base_path)
+        secret = extract_secret(finding) if rule != 'sensitive_file' else ''
+        
+        self._pending.append((
+            self.scan_id,
+            self._file_id(path),
+            self._rule_id(rule),
+            category,
+            finding.get('line'),
+            validation.get('confidence'),
+            validation.get('entropy'),
+            finding_fingerprint(finding, self.base_path),
+            secret_hash(secret) if secret else None
+        ))
+        if len(self._pending) >= self.BATCH_SIZE:
+            self.flush()
+    
+    def flush(self):
+        """Inserta los hallazgos pendientes en un solo executemany"""
+        if not self._pending:
+            return
+        self.conn.executemany(
+            'INSERT INTO findings (scan_id, file_id, rule_id, category, line, confidence, '
+            'entropy, fingerprint, secret_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            self._pending
+        )
+        self._pending = []
+    
+    def finish_scan(self, stats: Dict[str, Any]):
+        """
+        Inserta lo pendiente, guarda las estadísticas y confirma la transacción
+        
+        Args:
+            stats: Estadísticas del escaneo (results['stats'])
+        """
+        if self.scan_id is None:
+            return
+        self.flush()
+        self.conn.execute(
+            'UPDATE scans SET started_at = COALESCE(?, started_at), finished_at = ?, '
+            'files_scanned = ?, matches_found = ?, errors = ? WHERE id = ?',
+            (
+                stats.get('start_time'),
+                stats.get('end_time'),
+                stats.get('files_scanned', 0),
+                stats.get('matches_found', 0),
+                stats.get('errors', 0),
+                self.scan_id
+            )
+        )
+        self.conn.commit()
+        self.scan_id = None
+    
+    def abort_scan(self):
+        """Descarta el escaneo en curso y todos sus hallazgos"""
+        if self.scan_id is None:
+            return
+        self.conn.rollback()
+        self.scan_id = None
+        self._pending = []
+        self._file_ids.clear()
+        self._rule_ids.clear()
+    
+    def close(self):
+        """Cierra la conexión"""
+        self.conn.close()
+    
+    def list_scans(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Lista los escaneos más recientes
+        
+        Args:
+            limit: Número máximo de escaneos
+        
+        Returns:
+            Lista de escaneos con su número de hallazgos
+        """
+        rows = self.conn.execute(
+            'SELECT s.*, (SELECT COUNT(*) FROM findings f WHERE f.scan_id = s.id) AS findings '
+            'FROM scans s ORDER BY s.id DESC LIMIT ?',
+            (limit,)
+        )
+        return [dict(row) for row in rows]
+    
+    def query(
+        self,
+        scan_id: Optional[int] = None,
+        rule: Optional[str] = None,
+        min_confidence: Optional[str] = None,
+        path: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        secret: Optional[str] = None,
+        since: Optional[str] = None,
+        new_only: bool = False,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Consulta hallazgos combinando filtros
+        
+        Args:
+            scan_id: Solo hallazgos de este escaneo
+            rule: Nombre de la regla (tipo de match)
+            min_confidence: Nivel mínimo de confianza
+            path: Subcadena o patrón GLOB de la ruta relativa
+            fingerprint: Fingerprint exacto
+            secret: Valor secreto a buscar en cualquier ruta (se compara su hash)
+            since: Solo escaneos iniciados desde esta fecha (ISO 8601)
+            new_only: Solo hallazgos cuyo fingerprint no aparece en escaneos anteriores
+            limit: Número máximo de filas
+        
+        Yields:
+            Dict por hallazgo con escaneo, ruta, regla, línea y confianza
+        """
+        sql = [
+            'SELECT f.id, f.scan_id, s.started_at, fi.path, r.name AS rule, f.category, '
+            'f.line, f.confidence, f.entropy, f.fingerprint '
+            'FROM findings f '
+            'JOIN scans s ON s.id = f.scan_id '
+            'JOIN files fi ON fi.id = f.file_id '
+            'JOIN rules r ON r.id = f.rule_id '
+            'WHERE 1 = 1'
+        ]
+        params: List[Any] = []
+        
+        if scan_id is not None:
+            sql.append('AND f.scan_id = ?')
+            params.append(scan_id)
+        if rule:
+            sql.append('AND r.name = ?')
+            params.append(rule)
+        if min_confidence:
+            levels = CONFIDENCE_LEVELS[:CONFIDENCE_LEVELS.index(min_confidence) + 1]
+            sql.append(f"AND f.confidence IN ({', '.join('?' * len(levels))})")
+            params.extend(levels)
+        if path:
+            if any(char in path for char in '*?['):
+                sql.append('AND fi.path GLOB ?')
+                params.append(path)
+            else:
+                sql.append("AND instr(fi.path, ?) > 0")
+                params.append(path)
+        if fingerprint:
+            sql.append('AND f.fingerprint = ?')
+            params.append(fingerprint)
+        if secret:
+            sql.append('AND f.secret_hash = ?')
+            params.append(secret_hash(secret.strip().strip('\'"').strip()))
+        if since:
+            sql.append('AND s.started_at >= ?')
+            params.append(since)
+        if new_only:
+            sql.append(
+                'AND NOT EXISTS (SELECT 1 FROM findings prev '
+                'WHERE prev.fingerprint = f.fingerprint AND prev.scan_id < f.scan_id)'
+            )
+        
+        sql.append('ORDER BY f.scan_id DESC, fi.path, f.line')
+        if limit:
+            sql.append('LIMIT ?')
+            params.append(limit)
+        
+        for row in self.conn.execute(' '.join(sql), params):
+            yield dict(row)
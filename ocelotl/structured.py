@@ -0,0 +1,334 @@
+"""
+Ocelotl v3.0 - Extracción Estructurada
+Extracción de pares clave/valor de archivos de configuración en una pasada
+"""
+
+import bisect
+import json
+import os
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+
+class ConfigEntry(NamedTuple):
+    """Par clave/valor extraído de un archivo de configuración"""
+    key: str        # Ruta completa de la clave ('database.password')
+    value: str      # Valor sin comillas
+    line: int       # Línea (1-based) donde está el valor
+    start: int      # Offset del valor en el contenido
+
+
+# Formatos soportados por extensión (los '.env*' se detectan por nombre)
+STRUCTURED_FORMATS = {
+    '.env': 'env',
+    '.properties': 'properties',
+    '.ini': 'ini',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.json': 'json',
+    '.toml': 'toml',
+}
+
+# Categorías de patrones de asignación que el extractor sustituye en estos
+# archivos (el resto de patrones, como tokens de proveedores o connection
+# strings, se siguen aplicando sobre el texto)
+SUPERSEDED_CATEGORIES = ('db_credentials', 'passwords', 'config_patterns')
+
+# Diccionario de claves sensibles: un prefiltro con todas las palabras y,
+# para las claves que lo pasan, reglas en orden de prioridad sobre la ruta
+# normalizada (minúsculas, '-' -> '_', segmentos separados por '.')
+_SECRET_WORDS = (
+    r'pass|passwd|password|pwd|passphrase|secret|token|api_?key|access_?key|'
+    r'private_?key|signing_?key|client_?secret|url|dsn|uri|user|username|host|'
+    r'client_?id|app_?id|app_?secret|encryption_?key|secret_?key_?base'
+)
+SENSITIVE_KEY_PREFILTER = re.compile(rf'(?:^|[._])(?:{_SECRET_WORDS})$')
+
+_DB = r'(?:db|database|mysql|postgres|postgresql|mongo|mongodb|redis|datasource)'
+SENSITIVE_KEY_RULES = [
+    ('admin_credentials', re.compile(
+        r'(?:^|[._])(?:admin|administrator|root|superuser)[._]?(?:pass|password|passwd|pwd|secret)$'
+    )),
+    ('db_credentials', re.compile(
+        rf'(?:^|[._]){_DB}(?:[._][a-z0-9_]*)?[._]?(?:user|username|password|passwd|pwd|url|dsn|uri)$'
+    )),
+    ('passwords', re.compile(r'(?:^|[._])(?:pass|passwd|password|pwd|passphrase)$')),
+    ('config_patterns', re.compile(
+        r'(?:^|[._])(?:(?:ftp|smtp)[._]?(?:user|username|host)|client_?id|app_?id|app_?secret|'
+        r'encryption_?key|secret_?key_?base)$'
+    )),
+    ('api_keys', re.compile(
+        r'(?:^|[._])(?:api_?key|secret|secret_?key|access_?key|access_?token|auth_?token|'
+        r'token|client_?secret|private_?key|signing_?key|webhook_?secret)$'
+    )),
+]
+
+# Valores que no son secretos: referencias a variables y plantillas
+PLACEHOLDER_VALUE = re.compile(
+    r'^(?:\$\{[^}]*\}|\$[A-Za-z_]\w*|%\([^)]*\)s|\{\{.*\}\}|<[^>]*>|null|none|true|false|~)$',
+    re.IGNORECASE
+)
+MIN_VALUE_LENGTH = 4
+
+
+def structured_format(filename: str) -> Optional[str]:
+    """
+    Determina si un archivo tiene un formato clave/valor soportado
+    
+    Args:
+        filename: Nombre del archivo
+    
+    Returns:
+        Formato ('env', 'properties', 'ini', 'yaml', 'json', 'toml') o None
+    """
+    name = filename.lower()
+    if name.startswith('.env'):
+        return 'env'
+    return STRUCTURED_FORMATS.get(os.path.splitext(name)[1])
+
+
+def classify_key(key: str) -> Optional[str]:
+    """
+    Clasifica una ruta de clave según el diccionario de claves sensibles
+    
+    Args:
+        key: Ruta de la clave ('spring.datasource.password')
+    
+    Returns:
+        Categoría de patrón o None si la clave no es sensible
+    """
+    normalized = key.lower().replace('-', '_')
+    if not SENSITIVE_KEY_PREFILTER.search(normalized):
+        return None
+    for category, rule in SENSITIVE_KEY_RULES:
+        if rule.search(normalized):
+            return category
+    return None
+
+
+def is_candidate_value(value: str) -> bool:
+    """Indica si un valor puede ser un secreto (no vacío, no referencia)"""
+    return len(value) >= MIN_VALUE_LENGTH and not PLACEHOLDER_VALUE.match(value)
+
+
+def _unquote(raw: str, start: int, strip_comment: str = '') -> Tuple[str, int]:
+    """
+    Quita comillas (o el comentario final si no hay comillas) de un valor
+    
+    Args:
+        raw: Valor tal como aparece en la línea
+        start: Offset de raw en el contenido
+        strip_comment: Marcadores de comentario final para valores sin comillas
+    
+    Returns:
+        Tupla (valor, offset del valor)
+    """
+    stripped = raw.lstrip()
+    start += len(raw) - len(stripped)
+    if stripped[:1] in ('"', "'"):
+        end = stripped.find(stripped[0], 1)
+        if end > 0:
+            return stripped[1:end], start + 1
+    for marker in strip_comment:
+        index = stripped.find(' ' + marker)
+        if index >= 0:
+            stripped = stripped[:index]
+    return stripped.rstrip(), start
+
+
+def _iter_lines(content: str) -> Iterator[Tuple[int, int, str]]:
+    """Recorre (número de línea, offset, línea) sin copiar el contenido entero"""
+    offset = 0
+    for number, line in enumerate(content.split('\n'), 1):
+        yield number, offset, line
+        offset += len(line) + 1
+
+
+def _extract_assignments(content: str, file_format: str) -> Iterator[ConfigEntry]:
+    """Formatos de línea 'clave = valor' con secciones opcionales (env, properties, ini, toml)"""
+    comments = {'env': '#', 'properties': '#!', 'ini': '#;', 'toml': '#'}[file_format]
+    separators = ':=' if file_format == 'properties' else '='
+    if file_format == 'ini':
+        separators = '=:'
+    section = ''
+    
+    for number, offset, line in _iter_lines(content):
+        stripped = line.strip()
+        if not stripped or stripped[0] in comments:
+            continue
+        
+        if stripped[0] == '[' and file_format in ('ini', 'toml'):
+            section = stripped.strip('[]').strip().replace('"', '') + '.'
+            continue
+        
+        positions = [index for index in map(line.find, separators) if index >= 0]
+        if not positions:
+            continue
+        split = min(positions)
+        
+        key = line[:split].strip()
+        if file_format == 'env' and key.startswith('export '):
+            key = key[7:].strip()
+        key = key.strip('"\'')
+        if not key:
+            continue
+        
+        strip_comment = '#' if file_format in ('env', 'toml') else ''
+        value, start = _unquote(line[split + 1:], offset + split + 1, strip_comment)
+        yield ConfigEntry(section + key, value, number, start)
+
+
+def _extract_yaml(content: str) -> Iterator[ConfigEntry]:
+    """YAML por indentación: mapeos anidados, listas y escalares de bloque (omitidos)"""
+    stack: List[Tuple[int, str]] = []
+    block_indent: Optional[int] = None
+    
+    for number, offset, line in _iter_lines(content):
+        stripped = line.strip()
+        indent = len(line) - len(line.lstrip())
+        
+        if block_indent is not None:
+            if not stripped or indent > block_indent:
+                continue
+            block_indent = None
+        
+        if not stripped or stripped[0] == '#' or stripped in ('---', '...'):
+            continue
+        
+        # Elementos de lista: '- clave: valor' o '- valor'
+        body_start = indent
+        while line.startswith('- ', body_start) or line[body_start:].rstrip() == '-':
+            body_start += 2
+            while body_start < len(line) and line[body_start] == ' ':
+                body_start += 1
+        
+        body = line[body_start:]
+        separator = body.find(': ')
+        if separator < 0 and body.rstrip().endswith(':'):
+            separator = len(body.rstrip()) - 1
+        
+        while stack and stack[-1][0] >= (indent if body_start == indent else body_start):
+            stack.pop()
+        parent = '.'.join(key for _, key in stack)
+        
+        if separator < 0:
+            # Escalar de una lista: se atribuye a la clave padre
+            if body_start > indent and parent:
+                value, start = _unquote(body, offset + body_start, '#')
+                yield ConfigEntry(parent, value, number, start)
+            continue
+        
+        key = body[:separator].strip().strip('"\'')
+        raw = body[separator + 1:]
+        path = f"{parent}.{key}" if parent else key
+        if not raw.strip() or raw.strip().startswith('#'):
+            stack.append((body_start, key))
+            continue
+        if raw.strip()[0] in '|>':
+            block_indent = body_start
+            continue
+        
+        value, start = _unquote(raw, offset + body_start + separator + 1, '#')
+        yield ConfigEntry(path, value, number, start)
+
+
+# JSON: pares "clave": "valor" con clave sensible (prefiltro en el regex) y
+# seguimiento perezoso de la ruta con un tokenizador de estructura
+_JSON_PAIR = re.compile(
+    rf'"((?:[^"\\]|\\.)*?(?:{_SECRET_WORDS}))"\s*:\s*"((?:[^"\\]|\\.)*)"',
+    re.IGNORECASE
+)
+_JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]:,]')
+
+
+class _JsonPath:
+    """Ruta de claves en un offset del JSON; avanza de forma incremental"""
+    
+    def __init__(self, content: str):
+        self.tokens = _JSON_TOKEN.finditer(content)
+        self.position = 0
+        self.stack: List[Optional[str]] = []   # clave de cada contenedor abierto
+        self.last_string: Optional[str] = None
+        self.pending_key: Optional[str] = None
+    
+    def at(self, offset: int) -> List[str]:
+        """Claves de los contenedores abiertos en el offset (crecientes entre llamadas)"""
+        while self.position < offset:
+            token = next(self.tokens, None)
+            if token is None:
+                self.position = offset
+                break
+            self.position = token.end()
+            text = token.group()
+            if text[0] == '"':
+                self.last_string = text
+            elif text == ':':
+                self.pending_key = self.last_string
+            elif text in '{[':
+                self.stack.append(_json_string(self.pending_key) if self.pending_key else None)
+                self.pending_key = None
+            elif text in '}]':
+                if self.stack:
+                    self.stack.pop()
+                self.pending_key = None
+            elif text == ',':
+                self.pending_key = None
+        return [key for key in self.stack if key]
+
+
+def _json_string(token: str) -> str:
+    """Decodifica un literal de string JSON (tolerante a escapes inválidos)"""
+    try:
+        return json.loads(token)
+    except ValueError:
+        return token[1:-1]
+
+
+def _extract_json(content: str) -> Iterator[ConfigEntry]:
+    """JSON: solo los pares con clave candidata, con su ruta completa"""
+    line_starts = [0]
+    line_starts.extend(match.end() for match in re.finditer('\n', content))
+    tracker = _JsonPath(content)
+    
+    for pair in _JSON_PAIR.finditer(content):
+        parents = tracker.at(pair.start())
+        key = _json_string(f'"{pair.group(1)}"')
+        value = _json_string(f'"{pair.group(2)}"')
+        line = bisect.bisect_right(line_starts, pair.start(2))
+        yield ConfigEntry('.'.join(parents + [key]), value, line, pair.start(2))
+
+
+def extract_entries(content: str, file_format: str) -> Iterator[ConfigEntry]:
+    """
+    Extrae los pares clave/valor de un archivo de configuración en una pasada.
+    Los extractores son tolerantes: un archivo roto no detiene la extracción.
+    
+    Args:
+        content: Contenido del archivo
+        file_format: Formato devuelto por structured_format()
+    
+    Yields:
+        ConfigEntry por cada par (en JSON solo los de clave candidata)
+    """
+    if file_format == 'json':
+        return _extract_json(content)
+    if file_format == 'yaml':
+        return _extract_yaml(content)
+    return _extract_assignments(content, file_format)
+
+
+def find_sensitive_entries(content: str, file_format: str) -> Iterator[Tuple[str, ConfigEntry]]:
+    """
+    Pares clave/valor cuya clave es sensible y cuyo valor puede ser un secreto
+    
+    Args:
+        content: Contenido del archivo
+        file_format: Formato devuelto por structured_format()
+    
+    Yields:
+        Tuplas (categoría de patrón, ConfigEntry)
+    """
+    for entry in extract_entries(content, file_format):
+        category = classify_key(entry.key)
+        if category is not None and is_candidate_value(entry.value):
+            yield category, entry
@@ -5,11 +5,13 @@ Funciones auxiliares para UI, logging y manejo de archivos
 
 import sys
 import time
+import atexit
 import itertools
+import queue
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 
 class Colors:
@@ -64,11 +66,12 @@ class Colors:
 class Spinner:
     """Spinner animado para indicar progreso"""
     
-    def __init__(self, message: str = "Procesando", colors: Optional[Colors] = None):
+    def __init__(self, message: str = "Procesando", colors: Optional[Colors] = None, enabled: bool = True):
         self.message = message
         self.running = False
         self.thread = None
         self.colors = colors or Colors()
+        self.enabled = enabled
     
     def _spin(self):
         """Función interna del spinner"""
@@ -89,6 +92,8 @@ class Spinner:
     
     def start(self):
         """Inicia el spinner"""
+        if not self.enabled:
+            return
         self.running = True
         self.thread = threading.Thread(target=self._spin)
         self.thread.daemon = True
@@ -101,34 +106,114 @@ class Spinner:
             self.thread.join()
 
 
+class Progress:
+    """
+    Contadores de progreso de una fase del escaneo.
+    advance() solo suma contadores; el texto se genera cuando el Logger
+    decide refrescar la línea de estado.
+    """
+    
+    def __init__(self, label: str, total: Optional[int] = None):
+        """
+        Inicializa el progreso
+        
+        Args:
+            label: Descripción de la fase
+            total: Número de archivos esperados (None si se desconoce)
+        """
+        self.label = label
+        self.total = total
+        self.files = 0
+        self.bytes = 0
+        self.start = time.monotonic()
+    
+    def advance(self, files: int = 1, nbytes: int = 0):
+        """Registra archivos y bytes procesados"""
+        self.files += files
+        self.bytes += nbytes
+    
+    def render(self) -> str:
+        """
+        Genera la línea de estado
+        
+        Returns:
+            str: Archivos, archivos/s, MB/s y ETA (si se conoce el total)
+        """
+        elapsed = max(time.monotonic() - self.start, 1e-6)
+        rate = self.files / elapsed
+        throughput = self.bytes / elapsed / (1024 * 1024)
+        
+        if self.total:
+            percent = min(100.0, self.files * 100.0 / self.total)
+            text = f"{self.label}: {self.files:,}/{self.total:,} ({percent:.1f}%)"
+        else:
+            text = f"{self.label}: {self.files:,}"
+        text += f" | {rate:,.0f} files/s | {throughput:.1f} MB/s"
+        
+        if self.total and rate > 0:
+            remaining = max(0, self.total - self.files) / rate
+            text += f" | ETA {int(remaining // 3600)}:{int(remaining % 3600 // 60):02d}:{int(remaining % 60):02d}"
+        return text
+
+
 class Logger:
-    """Sistema de logging mejorado"""
+    """
+    Sistema de logging con escritura en segundo plano.
+    
+    log() solo encola el mensaje; un hilo escritor agrupa los mensajes
+    pendientes y los vuelca con una única escritura. El mismo hilo dibuja la
+    línea de progreso a una frecuencia limitada, así que nunca compiten dos
+    escritores por la consola.
+    """
+    
+    # Refresco de la línea de progreso en terminal y fuera de ella (segundos)
+    TTY_REFRESH_INTERVAL = 0.2
+    PIPE_REFRESH_INTERVAL = 10.0
+    
+    _STOP = object()
+    
+    level_map = {
+        'error': ('X', 'RED'),
+        'warning': ('!', 'YELLOW'),
+        'success': ('+', 'GREEN'),
+        'info': ('i', 'BLUE'),
+        'found': ('*', 'MAGENTA'),
+        'critical': ('!', 'RED'),
+        'debug': ('>', 'CYAN')
+    }
     
-    def __init__(self, verbose: bool = False, colors: Optional[Colors] = None):
+    def __init__(self, verbose: bool = False, colors: Optional[Colors] = None, silent: bool = False, stream=None):
         self.verbose = verbose
         self.colors = colors or Colors()
+        self.silent = silent
+        self.stream = stream
         self.start_time = datetime.now()
     
-    def _get_timestamp(self) -> str:
-        """Obtiene timestamp formateado"""
-        return datetime.now().strftime("%H:%M:%S")
+        self._queue: 'queue.SimpleQueue' = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._progress: Optional[Progress] = None
+        self._status_shown = False
+        self._last_status = ''
+        self._timestamp_second = -1
+        self._timestamp_text = ''
     
-    def _format_message(self, level: str, message: str, color: Optional[str] = None) -> str:
+    def _get_stream(self):
+        return self.stream or sys.stdout
+    
+    def _get_timestamp(self, when: Optional[float] = None) -> str:
+        """Obtiene timestamp formateado (se formatea una vez por segundo)"""
+        second = int(time.time() if when is None else when)
+        if second != self._timestamp_second:
+            self._timestamp_second = second
+            self._timestamp_text = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._timestamp_text
+    
+    def _format_message(self, level: str, message: str, color: Optional[str] = None, when: Optional[float] = None) -> str:
         """Formatea un mensaje de log"""
-        timestamp = self._get_timestamp()
-        
-        # Mapeo de niveles a símbolos y colores
-        level_map = {
-            'error': ('X', 'RED'),
-            'warning': ('!', 'YELLOW'),
-            'success': ('+', 'GREEN'),
-            'info': ('i', 'BLUE'),
-            'found': ('*', 'MAGENTA'),
-            'critical': ('!', 'RED'),
-            'debug': ('>', 'CYAN')
-        }
+        timestamp = self._get_timestamp(when)
         
-        symbol, default_color = level_map.get(level.lower(), ('.', 'WHITE'))
+        symbol, default_color = self.level_map.get(level.lower(), ('.', 'WHITE'))
         use_color = color or default_color
         
         level_tag = self.colors.colorize(f"[{level.upper()}]", use_color)
@@ -136,11 +221,134 @@ class Logger:
         
         return f"{symbol_colored} {level_tag} [{timestamp}] {message}"
     
+    def _ensure_writer(self):
+        """Arranca el hilo escritor la primera vez que se necesita"""
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name='ocelotl-logger', daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+    
+    def _run_writer(self):
+        """Bucle del hilo escritor: agrupa mensajes y refresca el progreso"""
+        stream = self._get_stream()
+        is_tty = hasattr(stream, 'isatty') and stream.isatty()
+        interval = self.TTY_REFRESH_INTERVAL if is_tty else self.PIPE_REFRESH_INTERVAL
+        next_refresh = time.monotonic() + interval
+        
+        while True:
+            timeout = None
+            if self._progress is not None:
+                timeout = max(0.0, next_refresh - time.monotonic())
+            
+            try:
+                records = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                records = []
+            while True:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            lines = []
+            waiters = []
+            stop = False
+            for record in records:
+                if record is self._STOP:
+                    stop = True
+                elif isinstance(record, threading.Event):
+                    waiters.append(record)
+                elif isinstance(record, tuple):
+                    when, level, message, color = record
+                    lines.append(self._format_message(level, message, color, when))
+            
+            status = None
+            progress = self._progress
+            if progress is not None and time.monotonic() >= next_refresh:
+                status = progress.render()
+                next_refresh = time.monotonic() + interval
+            
+            self._write(stream, is_tty, lines, status)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+    
+    def _write(self, stream, is_tty: bool, lines: List[str], status: Optional[str]):
+        """Escribe un lote de líneas y la línea de estado con una sola escritura"""
+        parts = []
+        if is_tty:
+            if status is not None:
+                self._last_status = self.colors.colorize(status, 'CYAN')
+            if self._status_shown and (lines or status is not None or self._progress is None):
+                parts.append('\r\033[K')
+                self._status_shown = False
+            parts.extend(line + '\n' for line in lines)
+            if self._progress is not None and self._last_status and (lines or status is not None):
+                parts.append(self._last_status)
+                self._status_shown = True
+        else:
+            parts.extend(line + '\n' for line in lines)
+            if status is not None:
+                parts.append(f"[~] {status}\n")
+        
+        if parts:
+            try:
+                stream.write(''.join(parts))
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+    
     def log(self, message: str, level: str = 'info', color: Optional[str] = None):
-        """Registra un mensaje"""
-        formatted = self._format_message(level, message, color)
-        print(formatted)
-        sys.stdout.flush()
+        """Encola un mensaje (no bloquea por E/S de consola)"""
+        if self.silent:
+            return
+        self._ensure_writer()
+        self._queue.put((time.time(), level, message, color))
+    
+    def flush(self):
+        """Espera a que se escriban todos los mensajes encolados"""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+    
+    def close(self):
+        """Escribe lo pendiente y detiene el hilo escritor"""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        self._progress = None
+        self._queue.put(self._STOP)
+        self._writer.join()
+    
+    def start_progress(self, label: str, total: Optional[int] = None) -> Progress:
+        """
+        Activa la línea de progreso de una fase
+        
+        Args:
+            label: Descripción de la fase
+            total: Número de archivos esperados
+        
+        Returns:
+            Progress a actualizar con advance()
+        """
+        progress = Progress(label, total)
+        if not self.silent:
+            self._progress = progress
+            self._ensure_writer()
+            self._queue.put(None)
+        return progress
+    
+    def stop_progress(self):
+        """Desactiva y borra la línea de progreso"""
+        if self._progress is None:
+            return
+        self._progress = None
+        self.flush()
     
     def error(self, message: str):
         """Log de error"""
@@ -284,11 +492,35 @@ def show_help(colors: Colors):
     {colors.GREEN}--no-color{colors.RESET}             Disable colored output
     {colors.GREEN}--min-confidence{colors.RESET} LEVEL Set minimum confidence level (VERY_LOW, LOW, MEDIUM, HIGH, CRITICAL)
                                Default: LOW
+    {colors.GREEN}--no-dedup{colors.RESET}             Scan files with identical content separately
+    {colors.GREEN}--workers{colors.RESET} N            Scan contents with N threads, largest files first
+    {colors.GREEN}--no-decompress{colors.RESET}        Do not scan inside .gz, .bz2 and .xz files
+    {colors.GREEN}--max-decompression-ratio{colors.RESET} N  Stop decompressing past N times the compressed size (default: 100)
+    {colors.GREEN}--no-sqlite{colors.RESET}            Do not scan the contents of SQLite databases
+    {colors.GREEN}--sqlite-max-rows{colors.RESET} N    Rows read from each database (default: 100000)
+    {colors.GREEN}--sqlite-max-mb{colors.RESET} MB     Text read from each database in MB (default: 64)
+    {colors.GREEN}--baseline{colors.RESET} FILE        Only report findings that are not in the baseline
+    {colors.GREEN}--update-baseline{colors.RESET}      Write all findings of this scan to the baseline file
+    {colors.GREEN}--entropy{colors.RESET}              Also report generic high-entropy strings
+    {colors.GREEN}--known-secrets{colors.RESET} PREFIX Escalate known leaked secrets to CRITICAL (see: build-known-secrets)
+    {colors.GREEN}--fail-fast{colors.RESET} LEVEL      Stop at the first finding at or above LEVEL
+    {colors.GREEN}--time-budget{colors.RESET} SECONDS  Stop after SECONDS and report partial results
+    {colors.GREEN}--shard{colors.RESET} I/N            Scan only the I-th of N deterministic slices (see: merge)
+    {colors.GREEN}--checkpoint{colors.RESET} FILE      Save progress and findings periodically to FILE
+    {colors.GREEN}--checkpoint-interval{colors.RESET} SECONDS  Seconds between checkpoint writes (default: 30)
+    {colors.GREEN}--resume{colors.RESET}               Continue the scan saved in the --checkpoint file
+    {colors.GREEN}--watch{colors.RESET}                Keep running and rescan changed files incrementally
+    {colors.GREEN}--debounce{colors.RESET} SECONDS     Quiet period before rescanning in watch mode (default: 0.5)
+    {colors.GREEN}--poll{colors.RESET}                 Use directory polling instead of inotify
     {colors.GREEN}--exclude-dirs{colors.RESET} DIRS   Comma-separated directories to exclude
                                Example: node_modules,.git,vendor
     {colors.GREEN}--exclude-ext{colors.RESET} EXTS    Comma-separated extensions to exclude
                                Example: .log,.tmp
     {colors.GREEN}--html{colors.RESET}                 Generate HTML report
+    {colors.GREEN}--html-compress{colors.RESET}        Embed findings compressed in the HTML report
+    {colors.GREEN}--sarif{colors.RESET} FILE           Write findings as SARIF 2.1.0 while scanning
+    {colors.GREEN}--db{colors.RESET} FILE              Store findings in SQLite (see: ocelotl.py query FILE)
+    {colors.GREEN}--metrics{colors.RESET} FILE         Write performance metrics in OpenMetrics text format
     {colors.GREEN}-h, --help{colors.RESET}             Show this help message
 
 {colors.CYAN}{colors.BOLD}EXAMPLES:{colors.RESET}
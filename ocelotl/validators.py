@@ -3,16 +3,23 @@ Ocelotl v3.0 - Validadores
 Sistema de validación para filtrar falsos positivos y evaluar confiabilidad
 """
 
-import math
 import re
-from collections import Counter
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+from .cache import LRUCache
+from .entropy import shannon_entropy
 
 
 class SecretValidator:
     """Validador para filtrar falsos positivos y evaluar confiabilidad de secretos"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 65536):
+        """
+        Inicializa el validador
+        
+        Args:
+            cache_size: Entradas máximas de cada caché de memoización (0 = sin caché)
+        """
         # Palabras que indican falsos positivos
         self.false_positive_keywords = {
             'example', 'sample', 'test', 'demo', 'placeholder', 'your_password',
@@ -39,6 +46,19 @@ class SecretValidator:
         self.compiled_comment_patterns = [
             re.compile(pattern) for pattern in self.comment_patterns
         ]
+        
+        # Patrones de declaraciones comunes
+        self.declaration_patterns = [
+            re.compile(r'(const|let|var)\s+\w+\s*;'),                    # JS sin valor
+            re.compile(r'(String|int|boolean)\s+\w+\s*;'),               # Java sin valor
+            re.compile(r'^\s*\w+\s*:\s*str\s*$'),                        # Python type hint
+            re.compile(r'^\s*(public|private|protected)?\s*\w+\s+\w+\s*;'),  # Java/C# declaration
+        ]
+        
+        # Memoización de las partes puras de la validación:
+        # por texto del match y por línea de contexto
+        self.text_cache = LRUCache(cache_size)
+        self.context_cache = LRUCache(cache_size)
     
     def calculate_entropy(self, text: str) -> float:
         """
@@ -51,20 +71,8 @@ class SecretValidator:
         Returns:
             float: Entropía calculada (0.0 - ~8.0)
         """
-        if not text:
-            return 0.0
-        
-        # Contar frecuencia de caracteres
-        counter = Counter(text)
-        length = float(len(text))
-        
-        # Calcular entropía
-        entropy = -sum(
-            (count / length) * math.log2(count / length)
-            for count in counter.values()
-        )
-        
-        return entropy
+        # Histograma por carácter y tablas de logaritmos precalculadas
+        return shannon_entropy(text)
     
     def is_comment(self, context: str) -> bool:
         """
@@ -112,16 +120,8 @@ class SecretValidator:
         Returns:
             bool: True si parece ser solo una declaración
         """
-        # Patrones de declaraciones comunes
-        declaration_patterns = [
-            r'(const|let|var)\s+\w+\s*;',                    # JS sin valor
-            r'(String|int|boolean)\s+\w+\s*;',               # Java sin valor
-            r'^\s*\w+\s*:\s*str\s*$',                        # Python type hint
-            r'^\s*(public|private|protected)?\s*\w+\s+\w+\s*;',  # Java/C# declaration
-        ]
-        
-        for pattern in declaration_patterns:
-            if re.search(pattern, context):
+        for pattern in self.declaration_patterns:
+            if pattern.search(context):
                 return True
         
         return False
@@ -167,56 +167,117 @@ class SecretValidator:
         Valida un match y agrega información de confiabilidad
         
         Args:
-            match_data: Diccionario con información del match
+            match_data: Diccionario con información del match. Si trae 'in_comment'
+                (pre-pasada léxica del archivo) se usa en lugar de is_comment(). Si
+                trae 'key' (clave sensible de un archivo de configuración o columna
+                de una base de datos), el nombre de la clave no cuenta como keyword
             
         Returns:
             Dict con información de validación agregada
         """
         match_text = match_data.get('match', '')
         context = match_data.get('context', '')
+        lexed_comment = match_data.pop('in_comment', None)
         
-        # Calcular entropía
-        entropy = self.calculate_entropy(match_text)
+        entropy, text_has_keyword, sufficient_length, variety, base_confidence = (
+            self.text_cache.get_or_compute(match_text, lambda: self._analyze_text(match_text))
+        )
+        in_comment, context_has_keyword, is_declaration = (
+            self.context_cache.get_or_compute(context, lambda: self._analyze_context(context))
+        )
+        if lexed_comment is not None:
+            in_comment = lexed_comment
+        if context_has_keyword and match_data.get('key'):
+            # 'database.password' es sensible por su nombre: solo cuenta una
+            # keyword del contexto que no forme parte de la clave
+            context_has_keyword = self.contains_false_positive_keyword(
+                self._strip_key(context, match_data['key'])
+            )
         
         # Verificar falsos positivos
-        is_false_positive = False
         false_positive_reasons = []
         
-        if self.is_comment(context):
-            is_false_positive = True
+        if in_comment:
             false_positive_reasons.append('in_comment')
         
-        if self.contains_false_positive_keyword(match_text):
-            is_false_positive = True
+        if text_has_keyword:
             false_positive_reasons.append('contains_test_keyword')
         
-        if self.contains_false_positive_keyword(context):
-            is_false_positive = True
+        if context_has_keyword:
             false_positive_reasons.append('context_has_test_keyword')
         
-        if self.is_variable_declaration(context):
-            is_false_positive = True
+        if is_declaration:
             false_positive_reasons.append('variable_declaration')
         
-        # Determinar nivel de confianza
-        confidence = self._calculate_confidence(
-            entropy, 
-            match_text, 
-            is_false_positive
-        )
+        is_false_positive = bool(false_positive_reasons)
         
         # Agregar información de validación
         match_data['validation'] = {
             'entropy': round(entropy, 2),
-            'confidence': confidence,
+            'confidence': 'VERY_LOW' if is_false_positive else base_confidence,
             'is_likely_false_positive': is_false_positive,
             'false_positive_reasons': false_positive_reasons,
-            'has_sufficient_length': self.has_sufficient_length(match_text),
-            'has_character_variety': self.has_character_variety(match_text)
+            'has_sufficient_length': sufficient_length,
+            'has_character_variety': variety
         }
         
         return match_data
     
+    def _analyze_text(self, match_text: str) -> Tuple[float, bool, bool, bool, str]:
+        """
+        Calcula las propiedades del match que solo dependen de su texto
+        
+        Args:
+            match_text: Texto del match
+            
+        Returns:
+            Tupla (entropía, contiene keyword, longitud suficiente, variedad, confianza base)
+        """
+        entropy = self.calculate_entropy(match_text)
+        return (
+            entropy,
+            self.contains_false_positive_keyword(match_text),
+            self.has_sufficient_length(match_text),
+            self.has_character_variety(match_text),
+            self._calculate_confidence(entropy, match_text, False)
+        )
+    
+    @staticmethod
+    def _strip_key(context: str, key: str) -> str:
+        """Quita del contexto los segmentos de una clave ('database.password' -> 'database', 'password')"""
+        for segment in re.split(r'[.\[\]]+', key):
+            if segment:
+                context = re.sub(re.escape(segment), '', context, flags=re.IGNORECASE)
+        return context
+    
+    def _analyze_context(self, context: str) -> Tuple[bool, bool, bool]:
+        """
+        Calcula las propiedades del match que solo dependen de su contexto
+        
+        Args:
+            context: Línea de contexto del match
+            
+        Returns:
+            Tupla (es comentario, contiene keyword, es declaración)
+        """
+        return (
+            self.is_comment(context),
+            self.contains_false_positive_keyword(context),
+            self.is_variable_declaration(context)
+        )
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene las estadísticas de las cachés de memoización
+        
+        Returns:
+            Dict con estadísticas de la caché por texto y por contexto
+        """
+        return {
+            'text': self.text_cache.get_stats(),
+            'context': self.context_cache.get_stats()
+        }
+    
     def _calculate_confidence(
         self, 
         entropy: float, 
@@ -0,0 +1,310 @@
+"""
+Ocelotl v3.0 - Modo Watch
+Vigilancia del sistema de archivos con reescaneo incremental
+"""
+
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
+
+from .utils import FileHelper
+
+
+class PollingWatcher:
+    """
+    Detecta cambios comparando instantáneas periódicas.
+    Solo se vuelven a listar los directorios cuyo mtime cambió; los
+    archivos conocidos se comprueban con stat().
+    """
+    
+    def __init__(self, root: Path, exclude_dirs: Optional[set] = None, interval: float = 1.0):
+        """
+        Inicializa el watcher
+        
+        Args:
+            root: Directorio a vigilar
+            exclude_dirs: Directorios a ignorar
+            interval: Segundos entre sondeos
+        """
+        self.root = Path(root)
+        self.exclude_dirs = exclude_dirs or set()
+        self.interval = interval
+        self._dirs: Dict[str, int] = {}
+        self._files: Dict[str, Tuple[int, int]] = {}
+        self._index_directory(self.root)
+    
+    def _index_directory(self, directory: Path) -> Set[Path]:
+        """
+        Registra un directorio y su contenido de forma recursiva
+        
+        Args:
+            directory: Directorio a registrar
+        
+        Returns:
+            Set de archivos nuevos encontrados
+        """
+        found: Set[Path] = set()
+        stack = [directory]
+        
+        while stack:
+            current = stack.pop()
+            try:
+                self._dirs[str(current)] = current.stat().st_mtime_ns
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+            
+            for entry in entries:
+                path = Path(entry.path)
+                if FileHelper.should_skip_path(path, self.exclude_dirs):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if str(path) not in self._dirs:
+                            stack.append(path)
+                    elif entry.is_file():
+                        if str(path) not in self._files:
+                            file_stat = entry.stat()
+                            self._files[str(path)] = (file_stat.st_mtime_ns, file_stat.st_size)
+                            found.add(path)
+                except OSError:
+                    continue
+        
+        return found
+    
+    def poll(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Espera el intervalo de sondeo y retorna los archivos cambiados
+        
+        Args:
+            timeout: Espera máxima en segundos (por defecto el intervalo)
+        
+        Returns:
+            Set de archivos creados, modificados o eliminados
+        """
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        changed: Set[Path] = set()
+        
+        # Directorios eliminados o con entradas nuevas
+        for directory, mtime in list(self._dirs.items()):
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                del self._dirs[directory]
+                continue
+            if current != mtime:
+                changed |= self._index_directory(Path(directory))
+        
+        # Archivos modificados o eliminados
+        for file_path, signature in list(self._files.items()):
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                del self._files[file_path]
+                changed.add(Path(file_path))
+                continue
+            current = (file_stat.st_mtime_ns, file_stat.st_size)
+            if current != signature:
+                self._files[file_path] = current
+                changed.add(Path(file_path))
+        
+        return changed
+    
+    def close(self):
+        """Libera recursos (sin efecto en modo sondeo)"""
+
+
+class InotifyWatcher:
+    """Detecta cambios con inotify (Linux) mediante ctypes"""
+    
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    
+    WATCH_MASK = (
+        IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+        | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    )
+    
+    _EVENT_HEADER = struct.Struct('iIII')
+    
+    def __init__(self, root: Path, exclude_dirs: Optional[set] = None):
+        """
+        Inicializa el watcher
+        
+        Args:
+            root: Directorio a vigilar
+            exclude_dirs: Directorios a ignorar
+        
+        Raises:
+            OSError: Si inotify no está disponible
+        """
+        import ctypes
+        import ctypes.util
+        
+        self.root = Path(root)
+        self.exclude_dirs = exclude_dirs or set()
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._watches: Dict[int, Path] = {}
+        self._add_tree(self.root)
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        """Indica si inotify puede usarse en esta plataforma"""
+        return sys.platform.startswith('linux')
+    
+    def _add_watch(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), self.WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = directory
+    
+    def _add_tree(self, directory: Path) -> Set[Path]:
+        """
+        Añade watches a un directorio y sus subdirectorios
+        
+        Args:
+            directory: Directorio raíz del árbol
+        
+        Returns:
+            Set de archivos existentes en el árbol
+        """
+        files: Set[Path] = set()
+        for current, dirnames, filenames in os.walk(directory):
+            current_path = Path(current)
+            dirnames[:] = [
+                d for d in dirnames
+                if not FileHelper.should_skip_path(current_path / d, self.exclude_dirs)
+            ]
+            self._add_watch(current_path)
+            files.update(current_path / name for name in filenames)
+        return files
+    
+    def poll(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Espera eventos y retorna los archivos cambiados
+        
+        Args:
+            timeout: Espera máxima en segundos
+        
+        Returns:
+            Set de archivos creados, modificados o eliminados
+        """
+        changed: Set[Path] = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed
+        
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        
+        offset = 0
+        header_size = self._EVENT_HEADER.size
+        while offset + header_size <= len(data):
+            wd, mask, _, name_length = self._EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + header_size:offset + header_size + name_length]
+            offset += header_size + name_length
+            
+            if mask & self.IN_Q_OVERFLOW:
+                # Se perdieron eventos: tratar todo el árbol como cambiado
+                changed |= self._add_tree(self.root)
+                continue
+            
+            directory = self._watches.get(wd)
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if directory is None or not raw_name:
+                continue
+            
+            path = directory / os.fsdecode(raw_name.rstrip(b'\0'))
+            if FileHelper.should_skip_path(path, self.exclude_dirs):
+                continue
+            
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    changed |= self._add_tree(path)
+            else:
+                changed.add(path)
+        
+        return changed
+    
+    def close(self):
+        """Cierra el descriptor de inotify"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root: Path, exclude_dirs: Optional[set] = None, interval: float = 1.0, polling: bool = False):
+    """
+    Crea el mejor watcher disponible
+    
+    Args:
+        root: Directorio a vigilar
+        exclude_dirs: Directorios a ignorar
+        interval: Segundos entre sondeos (modo polling)
+        polling: Forzar el modo polling
+    
+    Returns:
+        InotifyWatcher si está disponible, PollingWatcher en otro caso
+    """
+    if not polling and InotifyWatcher.is_available():
+        try:
+            return InotifyWatcher(root, exclude_dirs)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, exclude_dirs, interval)
+
+
+def watch(
+    scanner,
+    watcher,
+    debounce: float = 0.5,
+    on_change: Optional[Callable[[List[Dict[str, Any]], Set[Path]], None]] = None,
+    stop_event: Optional[threading.Event] = None
+):
+    """
+    Bucle de vigilancia: agrupa cambios y reescanea solo los archivos afectados
+    cuando no llegan eventos nuevos durante el periodo de debounce
+    
+    Args:
+        scanner: OcelotlScanner con un escaneo inicial ya ejecutado
+        watcher: PollingWatcher o InotifyWatcher
+        debounce: Segundos de calma antes de reescanear
+        on_change: Callback con (hallazgos nuevos, archivos cambiados)
+        stop_event: Evento que detiene el bucle
+    """
+    pending: Set[Path] = set()
+    last_event = 0.0
+    
+    while stop_event is None or not stop_event.is_set():
+        changed = watcher.poll(timeout=debounce)
+        if changed:
+            pending |= changed
+            last_event = time.monotonic()
+            continue
+        
+        if pending and time.monotonic() - last_event >= debounce:
+            batch, pending = pending, set()
+            findings = scanner.rescan_files(batch)
+            if on_change is not None:
+                on_change(findings, batch)